@@ -4,6 +4,7 @@ from ._broadcaster import *
 from ._circuit import *
 from ._constants import *
 from ._commands import *
+from ._shared_memory import *
 from ._dbr import *
 from ._status import *
 from ._data import *
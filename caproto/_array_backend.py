@@ -84,7 +84,7 @@ def epics_to_python(value, native_type, data_count, *, auto_byteswap=True):
 def python_to_epics(dtype, values, *, byteswap=True, convert_from=None):
     'Convert values from_dtype -> to_dtype'
     if dtype == ChannelType.STRING:
-        return DbrStringArray(values).tobytes()
+        return DbrStringArray.pack(values)
 
     typecode = type_map[dtype]
     endian = getattr(values, 'endian', default_endian)
@@ -20,19 +20,20 @@ from ._commands import (AccessRightsResponse, ClearChannelRequest,
                         EventAddResponse, EventCancelRequest,
                         EventCancelResponse, HostNameRequest,
                         ReadNotifyRequest, ReadNotifyResponse, ReadRequest,
-                        ReadResponse, SearchResponse, ServerDisconnResponse,
-                        VersionRequest, VersionResponse, WriteNotifyRequest,
-                        WriteNotifyResponse, WriteRequest,
-                        read_from_bytestream)
+                        ReadResponse, ReceiveBuffer, SearchResponse,
+                        ServerDisconnResponse, VersionRequest, VersionResponse,
+                        WriteNotifyRequest, WriteNotifyResponse, WriteRequest)
 from ._constants import DEFAULT_PROTOCOL_VERSION
 from ._dbr import ChannelType, SubscriptionType, field_types, native_type
 from ._log import ComposableLogAdapter
+from ._shared_memory import (EventAddFlag, is_shared_memory_reference,
+                             read_shared_memory_reference)
 from ._state import ChannelState, CircuitState, get_exception
 from ._status import CAStatus
 from ._utils import (CLIENT, DISCONNECTED, NEED_DATA, SERVER, CaprotoError,
                      CaprotoKeyError, CaprotoRuntimeError, CaprotoTypeError,
                      CaprotoValueError, ChannelFilter, ThreadsafeCounter,
-                     parse_channel_filter, parse_record_field)
+                     is_same_host, parse_channel_filter, parse_record_field)
 
 __all__ = ('VirtualCircuit', 'ClientChannel', 'ServerChannel',
            'extract_address')
@@ -81,7 +82,7 @@ class VirtualCircuit:
         self.channels = {}  # map cid to Channel
         self.channels_sid = {}  # map sid to Channel
         self.states = CircuitState(self.channels)
-        self._data = bytearray()
+        self._data = ReceiveBuffer()
         self._ioids = {}  # map ioid to Channel
         self.event_add_commands = {}  # map subscriptionid to EventAdd command
         # map subscriptionid to EventAdd command as we wait for them to die
@@ -197,17 +198,60 @@ class VirtualCircuit:
         ``(commands, num_bytes_needed)``
         """
         total_received = sum(_safe_len(byteslike) for byteslike in buffers)
-        commands = deque()
         if total_received == 0:
-            self.log.debug('Circuit disconnected')
-            commands.append(DISCONNECTED)
-            return commands, 0
-        self._data += b''.join(buffers)
+            return self._disconnected()
+        for byteslike in buffers:
+            self._data.extend(byteslike)
+        return self._parse_commands()
+
+    def get_recv_buffer(self, sizehint=0):
+        """
+        Get a writable buffer to receive bytes into, avoiding a copy.
+
+        This may be passed to ``socket.recv_into``, after which the number of
+        bytes received must be passed to :meth:`recv_buffer_updated`.
+
+        Parameters
+        ----------
+        sizehint : int, optional
+            The minimum size of the buffer to return.
+
+        Returns
+        -------
+        buffer : memoryview
+        """
+        return self._data.get_buffer(sizehint)
+
+    def recv_buffer_updated(self, nbytes):
+        """
+        Parse commands after receiving ``nbytes`` into :meth:`get_recv_buffer`.
+
+        This is the counterpart of :meth:`recv` for use with
+        ``socket.recv_into``.
+
+        Parameters
+        ----------
+        nbytes : int
+            The number of bytes received. Zero indicates disconnection.
+
+        Returns
+        -------
+        ``(commands, num_bytes_needed)``
+        """
+        if nbytes == 0:
+            return self._disconnected()
+        self._data.buffer_updated(nbytes)
+        return self._parse_commands()
+
+    def _disconnected(self):
+        self.log.debug('Circuit disconnected')
+        return deque([DISCONNECTED]), 0
+
+    def _parse_commands(self):
+        commands = deque()
         while True:
-            (self._data,
-             command,
-             num_bytes_needed) = read_from_bytestream(self._data,
-                                                      self.their_role)
+            command, num_bytes_needed = self._data.next_command(
+                self.their_role)
             if command is not NEED_DATA:
                 commands.append(command)
             else:
@@ -225,6 +269,31 @@ class VirtualCircuit:
         """
         self._process_command(self.their_role, command)
 
+    def _read_shared_memory(self, chan, event_add, command):
+        """
+        Copy the values of an EventAddResponse out of shared memory, if they
+        were passed that way.
+
+        Only subscriptions which requested shared memory from a server on
+        this host may have their values passed that way; see
+        :class:`EventAddFlag`.
+        """
+        if (len(command.buffers) != 2 or
+                EventAddFlag.SHARED_MEMORY not in event_add.flags or
+                not is_same_host(self.address, self.our_address)):
+            return
+        metadata, buffer = command.buffers
+        if not is_shared_memory_reference(buffer, command.data_type,
+                                          command.data_count):
+            return
+        try:
+            values = read_shared_memory_reference(buffer)
+        except CaprotoRuntimeError as ex:
+            # The update is lost, but the channel is still usable.
+            ex.channel = chan
+            raise
+        command.buffers = (metadata, values)
+
     def _process_command(self, role, command):
         """
         All commands go through here.
@@ -359,6 +428,8 @@ class VirtualCircuit:
                               "data_count in the original EventAddRequest "
                               "for this subscriptionid, {!r}."
                               "".format(command, event_add.data_count))
+                if self.our_role is CLIENT:
+                    self._read_shared_memory(chan, event_add, command)
             if isinstance(command, (EventCancelRequest, EventCancelResponse)):
                 # Verify sid matches the one in the original request.
                 event_add = self.event_add_commands[command.subscriptionid]
@@ -739,7 +810,7 @@ class ClientChannel(_BaseChannel):
 
     def subscribe(self, data_type=None, data_count=None,
                   subscriptionid=None,
-                  low=0.0, high=0.0, to=0.0, mask=None):
+                  low=0.0, high=0.0, to=0.0, mask=None, shared_memory=False):
         """
         Generate a valid :class:`EventAddRequest`.
 
@@ -765,6 +836,10 @@ class ClientChannel(_BaseChannel):
             ``(SubscriptionType.DBE_VALUE | ``
             `` SubscriptionType.DBE_ALARM | ``
             `` SubscriptionType.DBE_PROPERTY)``
+        shared_memory : bool, optional
+            Request that large array values be passed by way of shared memory
+            if the server is on this host. Servers which do not support this
+            send values as usual. Default is False.
 
         Returns
         -------
@@ -777,8 +852,13 @@ class ClientChannel(_BaseChannel):
                     SubscriptionType.DBE_PROPERTY)
         if subscriptionid is None:
             subscriptionid = self.circuit.new_subscriptionid()
+        flags = EventAddFlag(0)
+        if shared_memory and is_same_host(self.circuit.address,
+                                          self.circuit.our_address):
+            flags |= EventAddFlag.SHARED_MEMORY
         command = EventAddRequest(data_type, data_count, self.sid,
-                                  subscriptionid, low, high, to, mask)
+                                  subscriptionid, low, high, to, mask,
+                                  flags=flags)
         return command
 
     def unsubscribe(self, subscriptionid):
@@ -33,8 +33,7 @@ from . import _dbr as dbr
 from ._backend import backend
 from ._constants import DO_REPLY, MAX_RECORD_LENGTH, NO_REPLY
 from ._dbr import (DBR_INT, DBR_TYPES, MAX_STRING_SIZE, AccessRights,
-                   ChannelType, float_t, native_type, short_t, special_types,
-                   ushort_t)
+                   ChannelType, float_t, native_type, special_types, ushort_t)
 from ._headers import (AccessRightsResponseHeader, BeaconHeader,
                        ClearChannelRequestHeader, ClearChannelResponseHeader,
                        ClientNameRequestHeader, CreateChanRequestHeader,
@@ -54,6 +53,7 @@ from ._headers import (AccessRightsResponseHeader, BeaconHeader,
                        VersionRequestHeader, VersionResponseHeader,
                        WriteNotifyRequestHeader, WriteNotifyResponseHeader,
                        WriteRequestHeader)
+from ._shared_memory import EventAddFlag
 from ._status import eca_value_to_status, ensure_eca_value
 from ._utils import (CLIENT, NEED_DATA, REQUEST, RESPONSE, SERVER,
                      CaprotoNotImplementedError, CaprotoTypeError,
@@ -73,7 +73,7 @@ __all__ = ('AccessRightsResponse', 'ClearChannelRequest',
            'NotFoundResponse',
            'ReadNotifyRequest', 'ReadNotifyResponse',
            'ReadRequest', 'ReadResponse',
-           'ReadSyncRequest',
+           'ReadSyncRequest', 'ReceiveBuffer',
            'RepeaterConfirmResponse',
            'RepeaterRegisterRequest', 'Beacon',
            'SearchRequest', 'SearchResponse',
@@ -392,6 +392,114 @@ def read_from_bytestream(data, role):
     return data[total_size:], command, 0
 
 
+class ReceiveBuffer:
+    '''
+    A buffer for a TCP bytestream, consumed from the front by offset.
+
+    Bytes are appended at the tail, either copied in with :meth:`extend` or
+    written directly by ``socket.recv_into`` into the memoryview returned by
+    :meth:`get_buffer` (followed by a call to :meth:`buffer_updated`).
+    Commands are parsed from the head with :meth:`next_command` as zero-copy
+    memoryview slices, advancing a read offset rather than reallocating the
+    remaining bytes.
+
+    Parsed commands (and any arrays extracted from them) may continue to
+    reference the memory they were parsed from, so consumed regions are never
+    overwritten. When the tail runs out of room, the unconsumed remainder is
+    moved into a newly allocated buffer and the old one is left to be garbage
+    collected. Each byte received is therefore copied at most once more,
+    regardless of how many commands a single read contains.
+
+    Parameters
+    ----------
+    size : int, optional
+        The minimum size of each allocated buffer, in bytes.
+    '''
+    DEFAULT_SIZE = 65536
+
+    def __init__(self, size=DEFAULT_SIZE):
+        self.size = size
+        self._buffer = bytearray(size)
+        self._view = memoryview(self._buffer)
+        self._start = 0
+        self._end = 0
+
+    def __len__(self):
+        return self._end - self._start
+
+    def __repr__(self):
+        return (f"<{self.__class__.__name__} pending={len(self)} "
+                f"capacity={len(self._buffer)}>")
+
+    @property
+    def pending(self):
+        'A memoryview of the bytes received but not yet consumed'
+        return self._view[self._start:self._end]
+
+    def _reserve(self, nbytes):
+        'Ensure that at least ``nbytes`` can be appended at the tail.'
+        if len(self._buffer) - self._end >= nbytes:
+            return
+
+        pending = len(self)
+        buffer = bytearray(max(self.size, pending + nbytes))
+        buffer[:pending] = self._view[self._start:self._end]
+        self._buffer = buffer
+        self._view = memoryview(buffer)
+        self._start = 0
+        self._end = pending
+
+    def get_buffer(self, sizehint=0):
+        '''
+        Get a writable memoryview of at least ``sizehint`` bytes.
+
+        This is intended to be passed to ``socket.recv_into``. The number of
+        bytes actually written must then be reported by way of
+        :meth:`buffer_updated`.
+        '''
+        self._reserve(max(sizehint, 1))
+        return self._view[self._end:]
+
+    def buffer_updated(self, nbytes):
+        'Mark ``nbytes`` written into :meth:`get_buffer` as received.'
+        if nbytes < 0 or self._end + nbytes > len(self._buffer):
+            raise CaprotoValueError(f"Invalid number of bytes: {nbytes}")
+        self._end += nbytes
+
+    def extend(self, data):
+        'Copy ``data`` (any bytes-like object) onto the end of the buffer.'
+        data = memoryview(data).cast('B')
+        nbytes = data.nbytes
+        self._reserve(nbytes)
+        self._buffer[self._end:self._end + nbytes] = data
+        self._end += nbytes
+
+    def next_command(self, role):
+        '''
+        Parse the next command from the head of the buffer.
+
+        Parameters
+        ----------
+        role : CLIENT or SERVER
+
+        Returns
+        -------
+        (command, num_bytes_needed)
+            if more data is required, NEED_DATA will be returned in place of
+            `command`
+        '''
+        pending = self._view[self._start:self._end]
+        remaining, command, num_bytes_needed = read_from_bytestream(
+            pending, role)
+        if command is NEED_DATA:
+            # Make room for the rest of the command up front so that it can be
+            # received in place.
+            self._reserve(num_bytes_needed)
+        else:
+            self._start = self._end - len(remaining)
+        return command, num_bytes_needed
+
+
 Commands = {}
 Commands[CLIENT] = {}
 Commands[SERVER] = {}
@@ -859,6 +967,9 @@ class EventAddRequestPayload(ctypes.BigEndianStructure):
         Period between samples (deprecated)
     mask : int
         Event selection mask
+    flags : int
+        Reserved by Channel Access (which sends zero), used by caproto to
+        request extensions. See :class:`EventAddFlag`.
 
 
     '''
@@ -866,15 +977,15 @@ class EventAddRequestPayload(ctypes.BigEndianStructure):
                 ('high', float_t),
                 ('to', float_t),
                 ('mask', ushort_t),
-                ('__padding', short_t),
+                ('flags', ushort_t),
                 ]
 
-    def __init__(self, low=0.0, high=0.0, to=0.0, mask=0):
+    def __init__(self, low=0.0, high=0.0, to=0.0, mask=0, flags=0):
         self.low = low
         self.high = high
         self.to = to
         self.mask = mask
-        self.__padding = 0
+        self.flags = flags
 
     def __len__(self):
         return ctypes.sizeof(self)
@@ -922,17 +1033,23 @@ class EventAddRequest(Message):
     .. attribute:: mask
 
         Mask indicating which changes to report.
+
+    .. attribute:: flags
+
+        Extensions requested of caproto servers, otherwise ignored. See
+        :class:`EventAddFlag`.
     """
     __slots__ = ()
     ID = 1
     HAS_PAYLOAD = True
 
     def __init__(self, data_type, data_count, sid, subscriptionid, low,
-                 high, to, mask):
+                 high, to, mask, flags=0):
         header = EventAddRequestHeader(
             ChannelType(data_type), data_count, sid, subscriptionid
         )
-        payload = EventAddRequestPayload(low=low, high=high, to=to, mask=mask)
+        payload = EventAddRequestPayload(low=low, high=high, to=to, mask=mask,
+                                         flags=flags)
         super().__init__(header, payload)
 
     @classmethod
@@ -955,7 +1072,7 @@ class EventAddRequest(Message):
     high = property(lambda self: self.payload_struct.high)
     to = property(lambda self: self.payload_struct.to)
     mask = property(lambda self: self.payload_struct.mask)
-    __padding = property(lambda self: self.payload_struct.__padding)
+    flags = property(lambda self: EventAddFlag(self.payload_struct.flags))
 
 
 class EventAddResponse(Message):
@@ -1019,6 +1136,17 @@ class EventAddResponse(Message):
     def status(self):
         return eca_value_to_status[self.header.parameter1]
 
+    def for_subscription(self, subscriptionid):
+        '''
+        Copy this response, addressed to a different subscription.
+
+        Only the header is copied; the payload buffers are shared, such that
+        one serialized update may be sent to many subscriptions.
+        '''
+        header = type(self.header).from_buffer_copy(self.header)
+        header.parameter2 = subscriptionid
+        return type(self).from_components(header, *self.buffers)
+
     @classmethod
     def from_wire(cls, header, payload_bytes, *, sender_address=None,
                   validate=False):
@@ -63,3 +63,8 @@ MIN_SUBSCRIPTION_BACKLOG = int(os.environ.get("CAPROTO_MIN_SUBSCRIPTION_BACKLOG"
 # default, per subscription
 MAX_SUBSCRIPTION_BACKLOG = int(os.environ.get("CAPROTO_MAX_SUBSCRIPTION_BACKLOG", 1000))
 MAX_COMMAND_BACKLOG = int(os.environ.get("CAPROTO_MAX_COMMAND_BACKLOG", 10000))
+# When sending over TCP, consecutive buffers smaller than this many bytes are
+# joined, while larger ones are sent without being copied.
+SEND_COALESCE_THRESHOLD = int(
+    os.environ.get("CAPROTO_SEND_COALESCE_THRESHOLD", 4096)
+)
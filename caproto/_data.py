@@ -3,7 +3,9 @@
 # metadata. They perform data type conversions in response to requests to read
 # data as a certain type, and they push updates into queues registered by a
 # higher-level server.
+import array
 import copy
+import functools
 import logging
 import time
 import weakref
@@ -28,6 +30,7 @@ __all__ = ('Forbidden',
            'ChannelByte',
            'ChannelChar',
            'ChannelData',
+           'ChannelDataSnapshot',
            'ChannelDouble',
            'ChannelEnum',
            'ChannelFloat',
@@ -36,6 +39,7 @@ __all__ = ('Forbidden',
            'ChannelShort',
            'ChannelString',
            'SkipWrite',
+           'write_many',
            )
 
 logger = logging.getLogger(__name__)
@@ -43,6 +47,8 @@ logger = logging.getLogger(__name__)
 SubscriptionUpdate = namedtuple('SubscriptionUpdate',
                                 ('sub_specs', 'metadata', 'values',
                                  'flags', 'sub'))
+# The updates of many ChannelData for one queue, from ``write_many``
+SubscriptionUpdateBatch = namedtuple('SubscriptionUpdateBatch', ('updates', ))
 
 
 class Forbidden(CaprotoError):
@@ -76,7 +82,38 @@ def _read_only_property(key, doc=None):
     return property(lambda self: self._data[key], doc=doc)
 
 
+def _is_mutable(value):
+    'Whether a value may be modified in place: a list or a writable array'
+    if isinstance(value, (list, bytearray, array.array)):
+        return True
+    return (isinstance(value, backend.array_types) and
+            not is_array_read_only(value))
+
+
+def _sub_specs_by_data_type():
+    return defaultdict(set)
+
+
+def _sub_specs_by_sync():
+    return defaultdict(_sub_specs_by_data_type)
+
+
+@functools.lru_cache(maxsize=None)
+def _slot_names(cls):
+    'The names of the attributes held in the __slots__ of cls and its bases'
+    names = []
+    for base in reversed(cls.__mro__):
+        slots = base.__dict__.get('__slots__', ())
+        if isinstance(slots, str):
+            slots = (slots, )
+        names.extend(name for name in slots
+                     if name not in ('__dict__', '__weakref__'))
+    return tuple(names)
+
+
 class ChannelAlarm:
+    __slots__ = ('_channels', 'string_encoding', '_data', '_generation')
+
     def __init__(self, *, status=0, severity=0,
                  must_acknowledge_transient=True, severity_to_acknowledge=0,
                  alarm_string='', string_encoding='latin-1'):
@@ -100,13 +137,18 @@ class ChannelAlarm:
         string_encoding : str, optional
             String encoding of the alarm string.
         """
-        self._channels = weakref.WeakSet()
+        # The channels using this alarm: None, a weak reference to the only
+        # one (as most alarms belong to a single channel), or a WeakSet.
+        self._channels = None
         self.string_encoding = string_encoding
         self._data = dict(
             status=status, severity=severity,
             must_acknowledge_transient=must_acknowledge_transient,
             severity_to_acknowledge=severity_to_acknowledge,
             alarm_string=alarm_string)
+        # Incremented on each write, invalidating the cached reads of the
+        # channels using this alarm.
+        self._generation = 0
 
     def __getnewargs_ex__(self):
         kwargs = {
@@ -119,6 +161,15 @@ class ChannelAlarm:
         }
         return ((), kwargs)
 
+    def __getstate__(self):
+        # Channels connect to the alarm again as they are restored.
+        return dict(string_encoding=self.string_encoding, _data=self._data,
+                    _generation=self._generation, _channels=None)
+
+    def __setstate__(self, state):
+        for attr, value in state.items():
+            setattr(self, attr, value)
+
     status = _read_only_property('status',
                                  doc='Current alarm status')
     severity = _read_only_property('severity',
@@ -151,11 +202,38 @@ class ChannelAlarm:
 
     def connect(self, channel_data):
         """Add a ChannelData instance to the channel set using this alarm."""
-        self._channels.add(channel_data)
+        channels = self._channels
+        if channels is None:
+            self._channels = weakref.ref(channel_data)
+        elif isinstance(channels, weakref.ref):
+            channel = channels()
+            if channel is not channel_data:
+                self._channels = weakref.WeakSet(
+                    (channel_data, ) if channel is None
+                    else (channel, channel_data))
+        else:
+            channels.add(channel_data)
 
     def disconnect(self, channel_data):
         """Remove ChannelData instance from channel set using this alarm."""
-        self._channels.remove(channel_data)
+        channels = self._channels
+        if isinstance(channels, weakref.ref):
+            if channels() is not channel_data:
+                raise KeyError(channel_data)
+            self._channels = None
+        elif channels is None:
+            raise KeyError(channel_data)
+        else:
+            channels.remove(channel_data)
+
+    @property
+    def channels(self):
+        """The ChannelData instances using this alarm."""
+        channels = self._channels
+        if isinstance(channels, weakref.ref):
+            channel = channels()
+            return () if channel is None else (channel, )
+        return channels or ()
 
     async def read(self, dbr=None):
         """Read alarm information into a DBR_STSACK_STRING instance."""
@@ -195,6 +273,7 @@ class ChannelAlarm:
             Optionally publish the alarm status after the write.
         """
         data = self._data
+        self._generation += 1
 
         if status is not None:
             data['status'] = AlarmStatus(status)
@@ -244,7 +323,7 @@ class ChannelAlarm:
             Skip publishing to these channels, mainly to avoid recursion.
         """
         except_for = except_for or ()
-        for channel in self._channels:
+        for channel in self.channels:
             if channel not in except_for:
                 await channel.publish(flags)
 
@@ -271,6 +350,12 @@ class ChannelData:
         querying the record type.  This can be set to mimic an actual
         record or be set to something arbitrary.  Defaults to 'caproto'.
     """
+    __slots__ = ('_alarm', '_status', '_severity', '_generation',
+                 '_read_cache', '_max_length', 'string_encoding',
+                 'reported_record_type', 'max_subscription_backlog', '_data',
+                 '_queues', '_snapshots', '_fill_at_next_write',
+                 '_publish_batch', '__weakref__')
+
     data_type = ChannelType.LONG
     default_value: Any = 0
     _compatible_array_types = {}
@@ -296,6 +381,14 @@ class ChannelData:
         self._status = None
         self._severity = None
 
+        # Cache results of data_type conversions for reads. This maps
+        # data_type to (generation, metadata, values), where an entry is valid
+        # only as long as the generation matches that of the data and the
+        # alarm. Any change to the data or metadata increments _generation.
+        # Created on the first read.
+        self._generation = 0
+        self._read_cache = None
+
         # now use the setter to attach the alarm correctly:
         self.alarm = alarm
         self._max_length = max_length
@@ -321,24 +414,32 @@ class ChannelData:
         # This is a dict keyed on queues that will receive subscription
         # updates.  (Each queue belongs to a Context.) Each value is itself a
         # dict, mapping data_types to the set of SubscriptionSpecs that request
-        # that data_type.
-        self._queues = defaultdict(
-            lambda: defaultdict(
-                lambda: defaultdict(set)))
-
-        # Cache results of data_type conversions. This maps data_type to
-        # (metdata, value). This is cleared each time publish() is called.
-        self._content = {}
-        self._snapshots = defaultdict(dict)
-        self._fill_at_next_write = list()
+        # that data_type. Most channels are never subscribed to, so this is
+        # created on the first subscription, as are the snapshots for sync
+        # channel filters.
+        self._queues = None
+        self._snapshots = None
+        self._fill_at_next_write = None
+        # While set by ``write_many``, a dict of queue to the list of updates
+        # collected for it, to be put there all at once.
+        self._publish_batch = None
         self.max_subscription_backlog = max_subscription_backlog
 
     def __getstate__(self):
-        state = dict(self.__dict__)
-        state.pop("_queues", None)
-        state.pop("_snapshots", None)
+        state = {attr: getattr(self, attr) for attr in _slot_names(type(self))
+                 if hasattr(self, attr)}
+        state.update(getattr(self, '__dict__', {}))
+        # Subscriptions and cached reads are not carried over.
+        state.update(_queues=None, _snapshots=None, _fill_at_next_write=None,
+                     _publish_batch=None, _read_cache=None)
         return state
 
+    def __setstate__(self, state):
+        for attr, value in state.items():
+            setattr(self, attr, value)
+        if self._alarm is not None:
+            self._alarm.connect(self)
+
     def calculate_length(self, value):
         'Calculate the number of elements given a value'
         is_array = isinstance(value, (list, tuple) + backend.array_types)
@@ -406,7 +507,21 @@ class ChannelData:
         }
         return ((), kwargs)
 
-    value = _read_only_property('value')
+    value = _read_only_property(
+        'value',
+        doc="Read-only access to value data. If the value is modified in "
+            "place, call mark_modified() afterwards."
+    )
+
+    def mark_modified(self):
+        '''
+        Note that the value was modified in place, rather than by ``write()``.
+
+        Reads are cached until the data changes, and a change to a list or a
+        writable array in place cannot be noticed otherwise. Subscribers are
+        not notified; use ``write()`` for that.
+        '''
+        self._generation += 1
 
     # "before" — only the last value received before the state changes from
     #     false to true is forwarded to the client.
@@ -420,20 +535,27 @@ class ChannelData:
     # "unless" — values are forwarded to the client as long as the state is
     #     false.
 
+    def _state_snapshots(self, state):
+        if self._snapshots is None:
+            self._snapshots = defaultdict(dict)
+        return self._snapshots[state]
+
     def pre_state_change(self, state, new_value):
         "This is called by the server when it enters its StateUpdateContext."
-        snapshots = self._snapshots[state]
+        snapshots = self._state_snapshots(state)
         snapshots.clear()
         if new_value:
             # We are changing from false to true.
-            snapshots['before'] = copy.deepcopy(self)
+            snapshots['before'] = ChannelDataSnapshot(self)
         else:
             # We are changing from true to false.
-            snapshots['last'] = copy.deepcopy(self)
+            snapshots['last'] = ChannelDataSnapshot(self)
 
     def post_state_change(self, state, new_value):
         "This is called by the server when it exits its StateUpdateContext."
-        snapshots = self._snapshots[state]
+        snapshots = self._state_snapshots(state)
+        if self._fill_at_next_write is None:
+            self._fill_at_next_write = []
         if new_value:
             # We have changed from false to true.
             snapshots['while'] = self
@@ -458,6 +580,7 @@ class ChannelData:
             old_alarm.disconnect(self)
 
         self._alarm = alarm
+        self._generation += 1
         if alarm is not None:
             alarm.connect(self)
 
@@ -474,18 +597,14 @@ class ChannelData:
         sub : Subscription
             The subscription instance.
         """
+        if self._queues is None:
+            self._queues = defaultdict(_sub_specs_by_sync)
         by_sync = self._queues[queue][sub_spec.channel_filter.sync]
         by_sync[sub_spec.data_type_name].add(sub_spec)
 
         # Always send current reading immediately upon subscription.
-        try:
-            metadata, values = self._content[sub_spec.data_type_name]
-        except KeyError:
-            # Do the expensive data type conversion and cache it in case
-            # a future subscription wants the same data type.
-            data_type = _channel_type_by_name[sub_spec.data_type_name]
-            metadata, values = await self._read(data_type)
-            self._content[sub_spec.data_type_name] = metadata, values
+        data_type = _channel_type_by_name[sub_spec.data_type_name]
+        metadata, values = await self._read(data_type)
         await queue.put(SubscriptionUpdate((sub_spec,), metadata, values, 0, sub))
 
     async def unsubscribe(self, queue, sub_spec):
@@ -499,6 +618,8 @@ class ChannelData:
         sub_spec : SubscriptionSpec
             The subscription specification.
         """
+        if self._queues is None:
+            return
         by_sync = self._queues[queue][sub_spec.channel_filter.sync]
         by_sync[sub_spec.data_type_name].discard(sub_spec)
 
@@ -528,6 +649,10 @@ class ChannelData:
         """
         Inner method to read out the ChannelData as ``data_type``.
 
+        The result is cached until the data, metadata, or alarm changes, such
+        that repeated reads between writes skip the conversion. Callers must
+        not modify the metadata or values returned.
+
         Parameters
         ----------
         data_type : ChannelType
@@ -543,7 +668,23 @@ class ChannelData:
             class_name.value = rtyp
             return class_name, b''
 
-        if data_type in _LongStringChannelType:
+        long_string = data_type in _LongStringChannelType
+        # LONG_STRING types share their values with CHAR types; keep them
+        # apart in the cache.
+        cache_key = (data_type, long_string)
+        generation = (self._generation, self.alarm._generation)
+        read_cache = self._read_cache
+        if read_cache is None:
+            read_cache = self._read_cache = {}
+        try:
+            cached_generation, metadata, values = read_cache[cache_key]
+        except KeyError:
+            ...
+        else:
+            if cached_generation == generation:
+                return metadata, values
+
+        if long_string:
             native_to = _LongStringChannelType.LONG_STRING
             data_type = ChannelType(data_type)
         else:
@@ -560,6 +701,7 @@ class ChannelData:
 
         # for native types, there is no dbr metadata - just data
         if data_type in native_types:
+            read_cache[cache_key] = (generation, b'', values)
             return b'', values
 
         dbr_metadata = DBR_TYPES[data_type]()
@@ -571,6 +713,7 @@ class ChannelData:
             if hasattr(dbr_metadata, field):
                 setattr(dbr_metadata, field, getattr(alarm_dbr, field))
 
+        read_cache[cache_key] = (generation, dbr_metadata, values)
         return dbr_metadata, values
 
     async def auth_write(self, hostname, username, data, data_type, metadata,
@@ -766,15 +909,16 @@ class ChannelData:
         metadata.setdefault('timestamp', time.time())
 
         if self._fill_at_next_write:
-            snapshot = copy.deepcopy(self)
+            snapshot = ChannelDataSnapshot(self)
             for state, mode in self._fill_at_next_write:
                 self._snapshots[state][mode] = snapshot
-            self._fill_at_next_write.clear()
+            self._fill_at_next_write = None
 
         new = modified_value if modified_value is not None else value
 
         # TODO the next 5 lines should be done in one move
         self._data['value'] = new
+        self._generation += 1
         await self.write_metadata(publish=False, **metadata)
         # Send a new event to subscribers.
         await self.publish(flags)
@@ -784,7 +928,8 @@ class ChannelData:
 
     def _is_eligible(self, ss):
         sync = ss.channel_filter.sync
-        return sync is None or sync.m in self._snapshots[sync.s]
+        return sync is None or (self._snapshots is not None and
+                                sync.m in self._snapshots[sync.s])
 
     async def update_fields(self, value):
         """This is a hook for subclasses to update field instance data."""
@@ -804,9 +949,13 @@ class ChannelData:
         """
         # Copying the data into structs with various data types is expensive,
         # so we only want to do it if it's going to be used, and we only want
-        # to do each conversion once. Clear the cache to start. This cache is
-        # instance state so that self.subscribe can also use it.
-        self._content.clear()
+        # to do each conversion once. Invalidate the read cache to start, in
+        # case the data was modified in place. The conversions done here are
+        # then cached for self.subscribe and reads until the next change.
+        self._generation += 1
+        if not self._queues:
+            return
+        batch = self._publish_batch
 
         for queue, syncs in self._queues.items():
             # queue belongs to a Context that is expecting to receive
@@ -826,22 +975,22 @@ class ChannelData:
                             channel_data = self._snapshots[sync.s][sync.m]
                         except KeyError:
                             continue
-                    try:
-                        metadata, values = self._content[data_type_name]
-                    except KeyError:
-                        # Do the expensive data type conversion and cache it in
-                        # case another queue or a future subscription wants the
-                        # same data type.
-                        data_type = _channel_type_by_name[data_type_name]
-                        metadata, values = await channel_data._read(data_type)
-                        channel_data._content[data_type] = metadata, values
+                    # The expensive data type conversion is cached in case
+                    # another queue or a future subscription wants the same
+                    # data type.
+                    data_type = _channel_type_by_name[data_type_name]
+                    metadata, values = await channel_data._read(data_type)
 
                     # We will apply the array filter and deadband on the other side
                     # of the queue, since each eligible SubscriptionSpec may
                     # want a different slice. Sending the whole array through
                     # the queue isn't any more expensive that sending a slice;
                     # this is just a reference.
-                    await queue.put(SubscriptionUpdate(eligible, metadata, values, flags, None))
+                    update = SubscriptionUpdate(eligible, metadata, values, flags, None)
+                    if batch is not None:
+                        batch.setdefault(queue, []).append(update)
+                    else:
+                        await queue.put(update)
 
     def _read_metadata(self, dbr_metadata):
         """Fill the provided metadata instance with current metadata."""
@@ -859,6 +1008,12 @@ class ChannelData:
         if hasattr(dbr_metadata, 'precision'):
             dbr_metadata.precision = data.get('precision', 0)
 
+        if hasattr(dbr_metadata, 'enum_strings'):
+            dbr_metadata.enum_strings = [
+                s.encode(self.string_encoding)
+                for s in data.get('enum_strings', ())
+            ]
+
         if to_type in time_types:
             dbr_metadata.stamp = self.epics_timestamp
 
@@ -927,6 +1082,7 @@ class ChannelData:
             Updated alarm severity.
         """
         data = self._data
+        self._generation += 1
         for kw in ('units', 'precision', 'upper_disp_limit',
                    'lower_disp_limit', 'upper_alarm_limit',
                    'upper_warning_limit', 'lower_warning_limit',
@@ -1058,6 +1214,98 @@ class ChannelData:
         )
 
 
+class ChannelDataSnapshot:
+    """
+    An immutable snapshot of the data, metadata, and alarm state of a
+    ChannelData, as held for ``sync`` channel filters.
+
+    Values which cannot be modified in place (scalars, strings, and read-only
+    arrays) are shared with the ChannelData, while lists and writable arrays
+    are copied, such that modifying the value of the ChannelData in place
+    does not change the snapshot. The snapshot can be read out as any data
+    type, just like the ChannelData it was taken of.
+
+    Parameters
+    ----------
+    channel_data : ChannelData
+        The instance to take a snapshot of.
+    """
+    __slots__ = ('data_type', 'string_encoding', 'reported_record_type',
+                 'alarm', '_data', '_generation', '_read_cache')
+
+    def __init__(self, channel_data):
+        self.data_type = channel_data.data_type
+        self.string_encoding = channel_data.string_encoding
+        self.reported_record_type = channel_data.reported_record_type
+        alarm = channel_data.alarm
+        self.alarm = ChannelAlarm(
+            status=alarm.status,
+            severity=alarm.severity,
+            must_acknowledge_transient=alarm.must_acknowledge_transient,
+            severity_to_acknowledge=alarm.severity_to_acknowledge,
+            alarm_string=alarm.alarm_string,
+            string_encoding=alarm.string_encoding,
+        )
+        self._data = dict(channel_data._data)
+        if _is_mutable(self._data['value']):
+            self._data['value'] = copy.copy(self._data['value'])
+        # Nothing changes, so reads are cached indefinitely.
+        self._generation = 0
+        self._read_cache = None
+
+    def __repr__(self):
+        return (f'<{self.__class__.__name__} value={self.value!r} '
+                f'timestamp={self.timestamp}>')
+
+    value = _read_only_property('value')
+    timestamp = ChannelData.timestamp
+    epics_timestamp = ChannelData.epics_timestamp
+    _read = ChannelData._read
+    _read_metadata = ChannelData._read_metadata
+
+
+async def write_many(values, *, timestamp=None, flags=0):
+    '''
+    Write the values of many ChannelData instances, as of one timestamp.
+
+    Each value is written as by ``ChannelData.write``, including its hooks.
+    The subscription updates of all of the values are then put on the queue of
+    each server at once, such that a server sends the updates to each client
+    together, rather than handling and sending them one at a time.
+
+    Parameters
+    ----------
+    values : dict
+        Maps ChannelData instances to their new values.
+    timestamp : float, TimeStamp, or 2-tuple, optional
+        The timestamp of all of the values. Defaults to ``time.time()``.
+    flags : SubscriptionType or int, optional
+        The flags for subscribers.
+
+    Raises
+    ------
+    Exception:
+        Any exception raised in the handlers (except SkipWrite) will be
+        propagated to the caller, once the values written before it have been
+        published.
+    '''
+    if timestamp is None:
+        timestamp = time.time()
+
+    batch = {}
+    try:
+        for channel_data, value in values.items():
+            channel_data._publish_batch = batch
+            try:
+                await channel_data.write(value, flags=flags,
+                                         timestamp=timestamp)
+            finally:
+                channel_data._publish_batch = None
+    finally:
+        for queue, updates in batch.items():
+            await queue.put(SubscriptionUpdateBatch(tuple(updates)))
+
+
 class ChannelEnum(ChannelData):
     """
     ENUM data which can be sent over a channel.
@@ -1080,6 +1328,7 @@ class ChannelEnum(ChannelData):
         Encoding to use for strings, used when serializing and deserializing
         data.
     """
+    __slots__ = ()
 
     data_type = ChannelType.ENUM
 
@@ -1129,14 +1378,6 @@ class ChannelEnum(ChannelData):
             ...
         return data
 
-    def _read_metadata(self, dbr_metadata):
-        if isinstance(dbr_metadata, (DBR_TYPES[ChannelType.GR_ENUM],
-                                     DBR_TYPES[ChannelType.CTRL_ENUM])):
-            dbr_metadata.enum_strings = [s.encode(self.string_encoding)
-                                         for s in self.enum_strings]
-
-        return super()._read_metadata(dbr_metadata)
-
     async def write(self, *args, flags=0, **kwargs):
         flags |= (SubscriptionType.DBE_LOG | SubscriptionType.DBE_VALUE)
         await super().write(*args, flags=flags, **kwargs)
@@ -1199,6 +1440,7 @@ class ChannelNumeric(ChannelData):
     log_atol : numeric, optional
         Log tolerance value.
     """
+    __slots__ = ('value_atol', 'log_atol')
 
     def __init__(self, *, value, units='',
                  upper_disp_limit=0, lower_disp_limit=0,
@@ -1277,9 +1519,11 @@ class ChannelNumeric(ChannelData):
                 sev = dflt_severity
                 limit = getattr(self, limit_attr)
 
-                sev_prop = getattr(
-                    getattr(self, 'field_inst', None),
-                    severity_attr, None)
+                # Severity fields of records which were not created yet
+                # (see RecordFieldGroup.lazy_fields) hold their default.
+                field_inst = getattr(self, 'field_inst', None)
+                sev_prop = (field_inst.attr_pvdb.get(severity_attr)
+                            if field_inst is not None else None)
                 if sev_prop is not None:
                     # TODO sort out where ints are getting through...
                     if isinstance(sev_prop.value, str):
@@ -1376,6 +1620,8 @@ class ChannelShort(ChannelNumeric):
     log_atol : int, optional
         Log tolerance value.
     """
+    __slots__ = ()
+
     data_type = ChannelType.INT
 
 
@@ -1426,6 +1672,8 @@ class ChannelInteger(ChannelNumeric):
     log_atol : int, optional
         Log tolerance value.
     """
+    __slots__ = ()
+
     data_type = ChannelType.LONG
 
 
@@ -1476,6 +1724,7 @@ class ChannelFloat(ChannelNumeric):
     log_atol : float, optional
         Log tolerance value.
     """
+    __slots__ = ()
 
     data_type = ChannelType.FLOAT
 
@@ -1538,6 +1787,8 @@ class ChannelDouble(ChannelNumeric):
     log_atol : float, optional
         Log tolerance value.
     """
+    __slots__ = ()
+
     data_type = ChannelType.DOUBLE
 
     def __init__(self, *, precision=0, **kwargs):
@@ -1600,6 +1851,7 @@ class ChannelByte(ChannelNumeric):
     log_atol : int, optional
         Log tolerance value.
     """
+    __slots__ = ('strip_null_terminator', )
 
     # 'Limits' on chars do not make much sense and are rarely used.
     data_type = ChannelType.CHAR
@@ -1679,6 +1931,9 @@ class ChannelChar(ChannelData):
         Engineering units indicator, which can be retrieved over channel
         access.
     """
+    # data_type is set per instance when reported as a string
+    __slots__ = ('__dict__', )
+
     data_type = ChannelType.CHAR
     _compatible_array_types = {'|u1', '|i1', '|b1'}
 
@@ -1786,6 +2041,8 @@ class ChannelString(ChannelData):
         querying the record type.  This can be set to mimic an actual
         record or be set to something arbitrary.  Defaults to 'caproto'.
     """
+    __slots__ = ('_long_string_max_length', )
+
     data_type = ChannelType.STRING
 
     def __init__(self, *, alarm=None, value=None, timestamp=None,
@@ -10,6 +10,7 @@ import ctypes
 import datetime
 import logging
 import numbers
+import struct
 import time
 from enum import IntEnum, IntFlag
 from typing import ClassVar, Tuple
@@ -203,6 +204,10 @@ class DbrStringArray(collections.UserList):
     '''A mockup of numpy.array, intended to hold byte strings
 
     String arrays in numpy are special and inconvenient to work with.
+
+    On the wire, each string is a fixed-width field of ``MAX_STRING_SIZE``
+    bytes, null-terminated unless it fills the field. Decoding and encoding
+    each take a single pass over the buffer.
     '''
 
     def __getitem__(self, i):
@@ -212,28 +217,36 @@ class DbrStringArray(collections.UserList):
     @classmethod
     def frombuffer(cls, buf, data_count=None):
         'Create a DbrStringArray from a buffer'
+        size = MAX_STRING_SIZE
         if data_count is None:
-            data_count = max((1, len(buf) // MAX_STRING_SIZE))
-
-        def safely_find_eos():
-            'Find null terminator, else MAX_STRING_SIZE/length of the string'
-            try:
-                return min((MAX_STRING_SIZE, buf.index(b'\00')))
-            except ValueError:
-                return min((MAX_STRING_SIZE, len(buf)))
+            data_count = max((1, len(buf) // size))
 
-        buf = bytes(buf)
+        # One copy of the strings' fields; then each string is sliced from it
+        # up to its null terminator, if any. Strings past the end of the
+        # buffer are empty.
+        buf = bytes(buf[:data_count * size])
         strings = cls()
-        for _ in range(data_count):
-            strings.append(buf[:safely_find_eos()])
-            buf = buf[MAX_STRING_SIZE:]
-
+        strings.data = [buf[offset:offset + size].partition(b'\x00')[0]
+                        for offset in range(0, data_count * size, size)]
         return strings
 
+    @staticmethod
+    def pack(strings):
+        '''
+        Pack byte strings into their fixed-width fields, for the wire.
+
+        Strings longer than ``MAX_STRING_SIZE`` are truncated.
+        '''
+        if isinstance(strings, DbrStringArray):
+            strings = strings.data
+        elif not isinstance(strings, (list, tuple)):
+            strings = list(strings)
+        # The 's' format pads with nulls, or truncates, to the field size.
+        return struct.pack(f'{MAX_STRING_SIZE}s' * len(strings), *strings)
+
     def tobytes(self):
         # numpy compat
-        return b''.join(item[:MAX_STRING_SIZE].ljust(MAX_STRING_SIZE, b'\x00')
-                        for item in self)
+        return self.pack(self.data)
 
 
 class DbrTypeBase(ctypes.BigEndianStructure):
@@ -1,4 +1,6 @@
 import ctypes
+import functools
+
 from ._backend import Backend, register_backend, convert_values
 from ._dbr import (ChannelType, DbrStringArray, native_types, DBR_TYPES)
 
@@ -28,6 +30,10 @@ if np is not None:
     type_map = {ch_type: np.dtype(dtype)
                 for ch_type, dtype in type_map.items()
                 }
+    # The same, in the byte order of this host
+    native_type_map = {ch_type: dtype.newbyteorder('=')
+                       for ch_type, dtype in type_map.items()
+                       }
 
 
 def epics_to_python(value, native_type, data_count, *, auto_byteswap=True):
@@ -53,7 +59,7 @@ def python_to_epics(dtype, values, *, byteswap=True, convert_from=None):
     'Convert python builtin values to epics CA'
     # NOTE: ignoring byteswap, storing everything as big-endian
     if dtype == ChannelType.STRING:
-        return DbrStringArray(values).tobytes()
+        return DbrStringArray.pack(values)
     elif dtype == ChannelType.CHAR:
         if isinstance(values, bytes):
             return values
@@ -64,6 +70,46 @@ def python_to_epics(dtype, values, *, byteswap=True, convert_from=None):
     return np.asarray(values).astype(type_map[dtype])
 
 
+def epics_to_python_native(value, native_type, data_count, *,
+                           auto_byteswap=True):
+    '''Convert from a native EPICS DBR type to a builtin Python type
+
+    Unlike :func:`epics_to_python`, with ``auto_byteswap`` the array is
+    returned in the byte order of this host. This is a copy if the byte order
+    differs from that of the wire.
+    '''
+    if native_type == ChannelType.STRING:
+        return DbrStringArray.frombuffer(value, data_count)
+
+    arr = np.frombuffer(value, dtype=type_map[native_type])
+    if auto_byteswap:
+        return arr.astype(native_type_map[native_type], copy=False)
+    return arr
+
+
+def python_to_epics_native(dtype, values, *, byteswap=True,
+                           convert_from=None):
+    '''Convert python builtin values to epics CA
+
+    With ``byteswap``, the values are for the wire and are big-endian; this is
+    only a copy if they are not already. Otherwise, the values are stored in
+    the byte order of this host.
+    '''
+    if dtype == ChannelType.STRING:
+        return DbrStringArray.pack(values)
+    elif dtype == ChannelType.CHAR:
+        if isinstance(values, bytes):
+            return values
+        elif len(values) and isinstance(values[0], bytes):
+            assert len(values) == 1, "expected b'...', [b'...'], or [...]"
+            return values[0]
+
+    if byteswap:
+        return np.asarray(values, dtype=type_map[dtype])
+    # Always a copy, as the values may be a view of a receive buffer.
+    return np.asarray(values).astype(native_type_map[dtype])
+
+
 def _setup():
     # Sanity check: array item size should match struct size.
     for _type in set(native_types) - set([ChannelType.STRING]):
@@ -79,5 +125,20 @@ def _setup():
                    )
 
 
+def _setup_native():
+    # Values are kept in the byte order of this host by the server and handed
+    # to clients that way, being byte-swapped only when packed for the wire
+    # (or unpacked from it).
+    return Backend(name='numpy_native',
+                   array_types=(np.ndarray, DbrStringArray),
+                   type_map=type_map,
+                   epics_to_python=epics_to_python_native,
+                   python_to_epics=python_to_epics_native,
+                   convert_values=functools.partial(convert_values,
+                                                    auto_byteswap=False),
+                   )
+
+
 if np is not None:
     register_backend(_setup())
+    register_backend(_setup_native())
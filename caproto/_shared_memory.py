@@ -0,0 +1,333 @@
+# This module implements a caproto-specific extension to Channel Access for
+# clients and servers on the same host: the values of large arrays are passed
+# by way of shared memory rather than over TCP.
+#
+# A client requests the extension for a subscription by setting
+# EventAddFlag.SHARED_MEMORY in the (otherwise reserved) flags field of its
+# EventAddRequest. Servers which do not support the extension ignore the field
+# and respond as usual, as does a caproto server if the client is not on the
+# same host.
+#
+# A caproto server which honors the request copies values into a
+# SharedMemoryRing -- one per ChannelData -- and the payload of the
+# EventAddResponse carries a SharedMemoryReference to the slot in place of the
+# values. The metadata is sent as usual. The values are stored in the slot
+# exactly as they would have been on the wire. As the client processes the
+# response, it copies them out of the slot in place of the reference, and
+# checks that the slot was not reused in the meantime.
+#
+# A response holds a reference if and only if its payload is too short to
+# hold data_count elements: references are far smaller than the minimum size
+# of values sent this way. Clients only look for references in responses to
+# subscriptions which requested them, from a server on the same host, and
+# only map segments named as a caproto server names them.
+import collections
+import ctypes
+import os
+import secrets
+import struct
+import threading
+import weakref
+from enum import IntFlag
+from multiprocessing import shared_memory
+
+from ._backend import backend
+from ._dbr import DBR_TYPES, ChannelType, native_type
+from ._utils import CaprotoRuntimeError
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+else:
+    from ._numpy_backend import type_map as _wire_dtypes
+
+
+__all__ = ('EventAddFlag', 'SharedMemoryReference', 'SharedMemoryRing',
+           'is_shared_memory_reference', 'read_shared_memory_reference')
+
+
+class EventAddFlag(IntFlag):
+    'Flags for caproto extensions, requested in an EventAddRequest'
+    SHARED_MEMORY = 1
+
+
+SHARED_MEMORY_MAGIC = b'CASHMEM1'
+SEGMENT_NAME_PREFIX = 'caproto_'
+# The generation of the slot contents precedes the values in each slot. The
+# values are aligned to a cache line.
+SLOT_HEADER_SIZE = 64
+_slot_generation = struct.Struct('=Q')
+
+
+class SharedMemoryReference(ctypes.BigEndianStructure):
+    '''
+    A reference to values in a slot of a :class:`SharedMemoryRing`.
+
+    Attributes
+    ----------
+    magic : bytes
+        Identifies the payload as a reference.
+    name : bytes
+        The name of the shared memory segment.
+    offset : int
+        The offset of the values in the segment.
+    nbytes : int
+        The size of the values.
+    generation : int
+        The generation of the slot when the values were written, used to
+        detect that the slot has since been reused.
+    '''
+    _fields_ = [('magic', ctypes.c_char * len(SHARED_MEMORY_MAGIC)),
+                ('name', ctypes.c_char * 48),
+                ('offset', ctypes.c_uint64),
+                ('nbytes', ctypes.c_uint64),
+                ('generation', ctypes.c_uint64),
+                ]
+
+
+# Names of the segments created by this process, as a server
+_created = set()
+
+
+def _release_segment(shm):
+    'Close and remove a shared memory segment created by this process'
+    _created.discard(shm.name)
+    try:
+        shm.close()
+    except BufferError:
+        # Views of the values are still around; the mapping goes away
+        # with them.
+        ...
+    try:
+        shm.unlink()
+    except FileNotFoundError:
+        ...
+
+
+class SharedMemoryRing:
+    '''
+    A ring of slots in a shared memory segment, holding the values of one
+    ChannelData for subscribers on the same host.
+
+    The segment is sized for the largest values written so far. When larger
+    values are written, it is replaced by a new segment; existing mappings of
+    the old segment by clients remain valid.
+
+    Parameters
+    ----------
+    num_slots : int
+        The number of slots. Values remain available to clients until this
+        many more values have been written.
+    '''
+
+    def __init__(self, num_slots):
+        self.num_slots = max(int(num_slots), 1)
+        self.shm = None
+        self.slot_size = 0
+        self.index = 0
+        self.generation = 0
+        self._finalizer = None
+
+    def __repr__(self):
+        name = self.shm.name if self.shm is not None else None
+        return (f'<{self.__class__.__name__} name={name!r} '
+                f'num_slots={self.num_slots} slot_size={self.slot_size}>')
+
+    def _allocate(self, nbytes):
+        self.close()
+        slot_size = SLOT_HEADER_SIZE * (
+            2 + (nbytes - 1) // SLOT_HEADER_SIZE
+        )
+        # Short names, as macOS limits them to 31 characters
+        name = f'{SEGMENT_NAME_PREFIX}{secrets.token_hex(8)}'
+        self.shm = shared_memory.SharedMemory(
+            name=name, create=True, size=slot_size * self.num_slots)
+        _created.add(self.shm.name)
+        self.slot_size = slot_size
+        self.index = 0
+        self._finalizer = weakref.finalize(self, _release_segment, self.shm)
+
+    def close(self):
+        'Remove the shared memory segment'
+        if self._finalizer is not None:
+            self._finalizer()
+            self._finalizer = None
+        self.shm = None
+        self.slot_size = 0
+
+    def write(self, values, data_type, data_count):
+        '''
+        Write values to the next slot.
+
+        Parameters
+        ----------
+        values : ``numpy.ndarray``, ``array.array``, or any iterable
+            Values of the native type of ``data_type``.
+        data_type : ChannelType
+        data_count : int
+
+        Returns
+        -------
+        reference : SharedMemoryReference
+        '''
+        native = native_type(data_type)
+        values = values[:data_count]
+        fast = (np is not None and isinstance(values, np.ndarray) and
+                native != ChannelType.STRING)
+        if fast:
+            data_count = len(values)
+            nbytes = data_count * ctypes.sizeof(DBR_TYPES[native])
+        else:
+            payload = memoryview(
+                backend.python_to_epics(native, values, byteswap=True)
+            ).cast('B')
+            nbytes = payload.nbytes
+
+        if self.shm is None or nbytes > self.slot_size - SLOT_HEADER_SIZE:
+            self._allocate(nbytes)
+
+        slot = self.index * self.slot_size
+        offset = slot + SLOT_HEADER_SIZE
+        self.index = (self.index + 1) % self.num_slots
+        self.generation += 1
+
+        buf = self.shm.buf
+        # Mark the slot as invalid while it is being written:
+        _slot_generation.pack_into(buf, slot, 0)
+        if fast:
+            # Byte-swap directly into shared memory; no intermediate copy.
+            dest = np.frombuffer(buf, dtype=_wire_dtypes[native],
+                                 count=data_count, offset=offset)
+            np.copyto(dest, values, casting='unsafe')
+            del dest
+        else:
+            buf[offset:offset + nbytes] = payload
+        _slot_generation.pack_into(buf, slot, self.generation)
+
+        return SharedMemoryReference(
+            magic=SHARED_MEMORY_MAGIC,
+            name=self.shm.name.lstrip('/').encode('ascii'),
+            offset=offset,
+            nbytes=nbytes,
+            generation=self.generation,
+        )
+
+
+# Segments mapped by this process, as clients, least recently used first.
+# Values are copied out of them, so that they may be unmapped at any time.
+MAX_ATTACHED_SEGMENTS = 64
+_attached = collections.OrderedDict()
+_attached_lock = threading.Lock()
+
+
+def _attach(name):
+    'Map a segment, or get the existing mapping. Call with _attached_lock.'
+    try:
+        _attached.move_to_end(name)
+        return _attached[name]
+    except KeyError:
+        ...
+
+    try:
+        shm = shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # Python < 3.13 registers the segment with the resource tracker
+        # even when only attaching to it, which would then remove it when
+        # this process exits.
+        shm = shared_memory.SharedMemory(name=name)
+        if os.name == 'posix' and name not in _created:
+            from multiprocessing import resource_tracker
+            resource_tracker.unregister(shm._name, 'shared_memory')
+    _attached[name] = shm
+    while len(_attached) > MAX_ATTACHED_SEGMENTS:
+        _, evicted = _attached.popitem(last=False)
+        evicted.close()
+    return shm
+
+
+def is_shared_memory_reference(buffer, data_type, data_count):
+    '''
+    Whether the data part of an EventAddResponse payload is a reference.
+
+    Parameters
+    ----------
+    buffer : bytes-like
+        The data part of the payload.
+    data_type : ChannelType
+    data_count : int
+    '''
+    buffer = memoryview(buffer)
+    if buffer.nbytes < ctypes.sizeof(SharedMemoryReference):
+        return False
+    try:
+        itemsize = ctypes.sizeof(DBR_TYPES[native_type(data_type)])
+    except (KeyError, ValueError):
+        return False
+    return (buffer.nbytes < data_count * itemsize and
+            buffer.cast('B')[:len(SHARED_MEMORY_MAGIC)] == SHARED_MEMORY_MAGIC)
+
+
+def read_shared_memory_reference(buffer):
+    '''
+    Copy the values referenced by an EventAddResponse out of shared memory.
+
+    Only references from a server on the same host, in response to a
+    subscription which requested them, should be read.
+
+    Parameters
+    ----------
+    buffer : bytes-like
+        The data part of the payload.
+
+    Returns
+    -------
+    values : bytearray
+        The values, as they would have been sent on the wire.
+
+    Raises
+    ------
+    CaprotoRuntimeError
+        If the reference is invalid, the segment is not available (e.g., the
+        server is in a separate IPC namespace), or the slot was reused before
+        or while the values were copied.
+    '''
+    ref = SharedMemoryReference.from_buffer_copy(
+        memoryview(buffer).cast('B')[:ctypes.sizeof(SharedMemoryReference)]
+    )
+    try:
+        name = ref.name.decode('ascii')
+    except UnicodeDecodeError:
+        name = None
+    if name is None or not name.startswith(SEGMENT_NAME_PREFIX):
+        raise CaprotoRuntimeError(
+            f'Invalid shared memory segment name: {ref.name!r}')
+
+    with _attached_lock:
+        try:
+            shm = _attach(name)
+        except OSError as ex:
+            raise CaprotoRuntimeError(
+                f'Unable to map shared memory segment {name!r} of the '
+                f'server: {ex}. Set CAPROTO_SERVER_SHARED_MEMORY=no on the '
+                f'server if it does not share memory with its clients.'
+            ) from ex
+
+        start, end = ref.offset, ref.offset + ref.nbytes
+        if not SLOT_HEADER_SIZE <= start <= end <= shm.size:
+            raise CaprotoRuntimeError(
+                f'Invalid reference to shared memory segment {name!r} of '
+                f'size {shm.size}: offset {ref.offset}, nbytes {ref.nbytes}'
+            )
+
+        values = bytearray(shm.buf[start:end])
+        # The server may have reused the slot while it was copied:
+        generation, = _slot_generation.unpack_from(shm.buf,
+                                                   start - SLOT_HEADER_SIZE)
+
+    if generation != ref.generation:
+        raise CaprotoRuntimeError(
+            f'Shared memory slot of segment {name!r} was reused before the '
+            f'values could be read.'
+        )
+    return values
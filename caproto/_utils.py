@@ -15,6 +15,7 @@ import json
 import logging
 import os
 import random
+import select
 import socket
 import struct
 import sys
@@ -26,6 +27,7 @@ from contextlib import contextmanager
 from typing import Iterable
 from warnings import warn
 
+from ._constants import SEND_COALESCE_THRESHOLD
 from ._dbr import SubscriptionType
 from ._version import get_versions
 
@@ -50,6 +52,12 @@ except ImportError:
     netifaces = None
 
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
 __all__ = (  # noqa F822
     'adapt_old_callback_signature',
     'apply_arr_filter',
@@ -57,6 +65,7 @@ __all__ = (  # noqa F822
     'get_environment_variables',
     'get_address_list',
     'get_local_address',
+    'is_same_host',
     'get_beacon_address_list',
     'get_client_address_list',
     'get_server_address_list',
@@ -67,6 +76,9 @@ __all__ = (  # noqa F822
     'parse_record_field',
     'parse_channel_filter',
     'batch_requests',
+    'coalesce_buffers',
+    'consume_buffers',
+    'send_buffers',
     'CaprotoError',
     'Protocol',
     'ProtocolError',
@@ -571,6 +583,33 @@ def get_local_address() -> str:
     return fallback_address
 
 
+def is_same_host(address, our_address):
+    """
+    Whether the peer of a TCP connection is on this host.
+
+    Parameters
+    ----------
+    address : (host, port)
+        The address of the peer.
+    our_address : (host, port) or None
+        The address of this end of the connection. A peer connecting to any
+        address of this host other than the loopback address will use it as
+        its own.
+
+    Returns
+    -------
+    same_host : bool
+    """
+    try:
+        host = ipaddress.ip_address(address[0])
+    except (ValueError, TypeError, IndexError):
+        return False
+
+    if host.is_loopback:
+        return True
+    return our_address is not None and address[0] == our_address[0]
+
+
 def ensure_bytes(s):
     """Encode string as bytes with null terminator. Bytes pass through."""
     if isinstance(s, bytes):
@@ -709,11 +748,15 @@ def parse_record_field(pvname):
 
 ChannelFilter = namedtuple('ChannelFilter', 'ts dbnd arr sync')
 # TimestampFilter is just True or None, no need for namedtuple.
-DeadbandFilter = namedtuple('DeadbandFilter', 'm d')
+# Deadband policy 'p' is a caproto extension for array values: either 'max'
+# (compare the largest change in the array) or 'any' (compare each element
+# against its own previous value).
+DeadbandFilter = namedtuple('DeadbandFilter', 'm d p', defaults=('max', ))
 ArrayFilter = namedtuple('ArrayFilter', 's i e')
 SyncFilter = namedtuple('SyncFilter', 'm s')
 
 sync_modes = set(['before', 'first', 'while', 'last', 'after', 'unless'])
+deadband_policies = ('max', 'any')
 
 
 def parse_channel_filter(filter_text):
@@ -791,30 +834,39 @@ def parse_ts_filter(val):
 def parse_dbnd_filter(val):
     if val is None:
         return None
+    policy = val.get('p', 'max')
+    if policy not in deadband_policies:
+        raise FilterValidationError(
+            f"Unsupported policy in 'dbnd': {policy!r}. Must be one of "
+            f"{deadband_policies}.")
     if 'rel' in val:
-        invalid_keys = set(val.keys()) - set(['rel'])
+        invalid_keys = set(val.keys()) - set(['rel', 'p'])
         if invalid_keys:
             raise FilterValidationError(
                 f"Unsupported keys in 'dbnd': {invalid_keys}. When 'rel' "
                 f"shorthand is used, no other keys may be used.")
-        return DeadbandFilter(m='rel', d=float(val['rel']))
+        return DeadbandFilter(m='rel', d=float(val['rel']), p=policy)
     if 'abs' in val:
-        invalid_keys = set(val.keys()) - set(['abs'])
+        invalid_keys = set(val.keys()) - set(['abs', 'p'])
         if invalid_keys:
             raise FilterValidationError(
                 f"Unsupported keys in 'dbnd': {invalid_keys}. When 'abs' "
                 f"shorthand is used, no other keys may be used.")
-        return DeadbandFilter(m='abs', d=float(val['abs']))
+        return DeadbandFilter(m='abs', d=float(val['abs']), p=policy)
     else:
-        invalid_keys = set(val.keys()) - set('dm')
+        invalid_keys = set(val.keys()) - set('dmp')
         if invalid_keys:
             raise FilterValidationError(
                 f"Unsupported keys in 'dbnd': {invalid_keys}")
-        if set('md') != set(val.keys()):
+        if not set('md') <= set(val.keys()):
             raise FilterValidationError(
                 f"'dbnd' must include 'rel' or 'abs' or both 'd' and 'm'. "
                 f"Found keys {set(val.keys())}.")
-        return DeadbandFilter(m=float(val['m']), d=float(val['d']))
+        if val['m'] not in ('abs', 'rel'):
+            raise FilterValidationError(
+                f"Unsupported mode in 'dbnd': {val['m']!r}. Must be 'abs' "
+                f"or 'rel'.")
+        return DeadbandFilter(m=val['m'], d=float(val['d']), p=policy)
 
 
 def parse_arr_filter(val):
@@ -862,6 +914,94 @@ def apply_arr_filter(arr_filter, values):
     return values[start:stop:step]
 
 
+def _deadband_native(value, host_endian):
+    """
+    Get ``value`` in native byte order, for deadband comparisons.
+
+    With numpy available, numeric values are returned as an ndarray. This is
+    only a copy if ``value`` is not already in native byte order. Other
+    scalars are wrapped in a list.
+    """
+    if hasattr(value, "endian"):
+        # An array.array from the array backend, tracking its own endianness
+        if value.endian != host_endian:
+            value = copy.copy(value)
+            value.byteswap()
+
+    if np is not None:
+        arr = np.asarray(value)
+        if arr.dtype.kind in 'biuf':
+            if not arr.dtype.isnative:
+                arr = arr.astype(arr.dtype.newbyteorder('='))
+            return np.atleast_1d(arr)
+
+    if isinstance(value, (str, bytes)) or not isinstance(value, Iterable):
+        return [value]
+    return value
+
+
+def _deadband_compare(dbnd, previous_value, new_value):
+    """
+    Compare two native-endian values against a deadband.
+
+    Returns
+    -------
+    out_of_band : bool
+        The change exceeds the deadband.
+    max_abs_diff : float
+        The largest absolute change of any element.
+    """
+    if len(previous_value) != len(new_value):
+        return True, float('inf')
+
+    if (np is not None and isinstance(previous_value, np.ndarray) and
+            isinstance(new_value, np.ndarray)):
+        if not len(new_value):
+            return False, 0.
+        diff = np.abs(np.subtract(new_value, previous_value, dtype=float))
+        max_abs_diff = float(diff.max())
+        if dbnd.m == 'abs':
+            # Both policies are equivalent for an absolute deadband
+            return dbnd.d < max_abs_diff, max_abs_diff
+        if dbnd.p == 'max':
+            scale = float(np.abs(previous_value).max())
+            if scale == 0.:
+                return max_abs_diff > 0., max_abs_diff
+            return dbnd.d < max_abs_diff / scale, max_abs_diff
+        # Element-wise relative change; elements changing from zero are
+        # always out of band (x / 0 -> inf) while unchanged zeros are not
+        # (0 / 0 -> nan).
+        with np.errstate(divide='ignore', invalid='ignore'):
+            rel_diff = diff / np.abs(previous_value)
+        return bool((rel_diff > dbnd.d).any()), max_abs_diff
+
+    # Pure Python fallback for when numpy is unavailable
+    try:
+        pairs = [(float(prev), float(new))
+                 for prev, new in zip(previous_value, new_value)]
+    except (TypeError, ValueError):
+        # Non-numeric: any change at all is out of band.
+        changed = list(previous_value) != list(new_value)
+        return changed, (float('inf') if changed else 0.)
+
+    diffs = [abs(new - prev) for prev, new in pairs]
+    max_abs_diff = max(diffs, default=0.)
+    if dbnd.m == 'abs':
+        return dbnd.d < max_abs_diff, max_abs_diff
+
+    def relative(diff, prev):
+        if prev == 0.:
+            return float('inf') if diff else 0.
+        return diff / abs(prev)
+
+    if dbnd.p == 'max':
+        scale = max((abs(prev) for prev, _ in pairs), default=0.)
+        return dbnd.d < relative(max_abs_diff, scale), max_abs_diff
+    return (any(dbnd.d < relative(diff, prev)
+                for diff, (prev, _) in zip(diffs, pairs)),
+            max_abs_diff)
+
+
 def apply_deadband_filter(
     previous_value,
     new_value,
@@ -875,48 +1015,32 @@ def apply_deadband_filter(
     Requires caller to track state between subscription updates.
     If outside of the deadband range, this will return the value to be
     tracked.
+
+    Scalars and arrays are both supported. For arrays, the deadband policy
+    ``dbnd.p`` selects whether the largest change in the array ('max') or
+    the change of any individual element ('any') is considered. Arrays of a
+    different length than the last one are always out of band.
     """
-    if hasattr(new_value, "endian"):
-        if new_value.endian != host_endian:
-            new_value = copy.copy(new_value)
-            new_value.byteswap()
+    new_value = _deadband_native(new_value, host_endian)
 
     if previous_value is None:
         # First entry:
         return new_value
 
-    old_iterable = isinstance(previous_value, Iterable)
-    new_iterable = isinstance(new_value, Iterable)
-    if (not old_iterable or (old_iterable and len(previous_value) == 1)) and (
-        not new_iterable or (new_iterable and len(new_value) == 1)
-    ):
-        if old_iterable:
-            (previous_value,) = previous_value
-        if new_iterable:
-            (new_value,) = new_value
-
-        # Cool that was fun. (git blame may say klauer but you must dig deeper
-        # to find the truth)
-        if sub.channel_filter.dbnd.m == "rel":
-            out_of_band = sub.channel_filter.dbnd.d < abs(
-                (previous_value - new_value) / previous_value
-            )
-        else:  # must be 'abs' -- was already validated
-            out_of_band = sub.channel_filter.dbnd.d < abs(previous_value - new_value)
-        # We have verified that that EPICS considers DBE_LOG
-        # etc. to be an absolute (not relative) threshold.
-        abs_diff = abs(previous_value - new_value)
-        if abs_diff > sub.db_entry.log_atol:
-            flags |= SubscriptionType.DBE_LOG
-            if abs_diff > sub.db_entry.value_atol:
-                flags |= SubscriptionType.DBE_VALUE
-
-        if not (out_of_band and (sub.mask & flags)):
-            return None
+    out_of_band, abs_diff = _deadband_compare(
+        sub.channel_filter.dbnd, previous_value, new_value)
 
-        return new_value
+    # We have verified that that EPICS considers DBE_LOG
+    # etc. to be an absolute (not relative) threshold.
+    if abs_diff > sub.db_entry.log_atol:
+        flags |= SubscriptionType.DBE_LOG
+        if abs_diff > sub.db_entry.value_atol:
+            flags |= SubscriptionType.DBE_VALUE
+
+    if not (out_of_band and (sub.mask & flags)):
+        return None
 
-    return None
+    return new_value
 
 
 def batch_requests(request_iter, max_length):
@@ -943,6 +1067,93 @@ def batch_requests(request_iter, max_length):
         yield batch
 
 
+#: Whether sockets support scatter-gather sends (not on Windows)
+SENDMSG_SUPPORTED = hasattr(socket.socket, 'sendmsg')
+#: The most buffers to pass to a single sendmsg call (well within IOV_MAX)
+SENDMSG_MAX_BUFFERS = 512
+
+
+def coalesce_buffers(buffers, threshold=SEND_COALESCE_THRESHOLD):
+    '''
+    Join runs of small buffers, leaving larger buffers as they are.
+
+    Copying small buffers (e.g., command headers and scalar payloads)
+    together is cheaper than sending each as its own segment, while larger
+    buffers (e.g., array payloads) are left to be sent without a copy.
+
+    Parameters
+    ----------
+    buffers : sequence of bytes-like objects
+    threshold : int, optional
+        Buffers of at least this many bytes are not copied.
+
+    Returns
+    -------
+    buffers : list
+    '''
+    coalesced = []
+    run = []
+    for buf in buffers:
+        buf = memoryview(buf)
+        if not buf.nbytes:
+            continue
+        if buf.nbytes < threshold:
+            run.append(buf)
+            continue
+        if run:
+            coalesced.append(b''.join(run) if len(run) > 1 else run[0])
+            run = []
+        coalesced.append(buf)
+    if run:
+        coalesced.append(b''.join(run) if len(run) > 1 else run[0])
+    return coalesced
+
+
+def consume_buffers(buffers, nbytes):
+    '''
+    Drop the first ``nbytes`` from a list of buffers, after a partial send.
+
+    Returns
+    -------
+    buffers : list
+        The remaining buffers, the first of which may be a view into a
+        partially-sent buffer.
+    '''
+    for idx, buf in enumerate(buffers):
+        buf = memoryview(buf)
+        if nbytes < buf.nbytes:
+            return [buf.cast('B')[nbytes:]] + list(buffers[idx + 1:])
+        nbytes -= buf.nbytes
+    return []
+
+
+def send_buffers(sock, buffers):
+    '''
+    Send all ``buffers`` on a TCP socket, blocking until done.
+
+    Where supported, buffers are sent with ``sendmsg`` rather than being
+    joined into a single bytes object first. Partial sends are handled, and
+    non-blocking sockets are waited on until writable.
+
+    Parameters
+    ----------
+    sock : socket.socket
+    buffers : sequence of bytes-like objects
+    '''
+    buffers = coalesce_buffers(buffers)
+    if not SENDMSG_SUPPORTED:
+        sock.sendall(b''.join(buffers))
+        return
+
+    while buffers:
+        try:
+            nbytes = sock.sendmsg(buffers[:SENDMSG_MAX_BUFFERS])
+        except BlockingIOError:
+            select.select([], [sock], [])
+            continue
+        buffers = consume_buffers(buffers, nbytes)
+
+
 class ThreadsafeCounter:
     '''A thread-safe counter with a couple features:
 
@@ -313,9 +313,7 @@ class SharedBroadcaster:
         for address, names in use_cached_search.items():
             results_queue.put((address, names))
 
-        self.results.search(
-            *needs_search, results_queue=results_queue,
-            retirement_deadline=time.monotonic() + common.SEARCH_RETIREMENT_AGE)
+        self.results.search(*needs_search, results_queue=results_queue)
         self._search_now.set()
 
     def time_since_last_heard(self):
@@ -445,83 +443,65 @@ class SharedBroadcaster:
 
     async def _broadcaster_retry_loop(self):
         self.log.debug('Broadcaster search-retry thread has started.')
-
-        interval = common.MIN_RETRY_SEARCHES_INTERVAL
-        time_to_check_on_retirees = (
-            time.monotonic() + common.RETRY_RETIRED_SEARCHES_INTERVAL)
+        scheduler = self.results.scheduler
 
         while True:
             await self._searching_enabled.wait()
+            await self._retry_unanswered_searches(time.monotonic())
 
-            last_send_time = time.monotonic()
-
-            if last_send_time >= time_to_check_on_retirees:
-                # Send everything
-                threshold = None
-            else:
-                threshold = last_send_time
-
-            await self._retry_unanswered_searches(
-                threshold, resend_deadline=last_send_time - interval)
-
-            wait_time = max(0, interval - (time.monotonic() - last_send_time))
-            # Double the interval for the next loop.
-            interval = min(2 * interval, common.MAX_RETRY_SEARCHES_INTERVAL)
+            wait_time = scheduler.time_until_due()
+            if wait_time is None or wait_time > 0.5:
+                wait_time = 0.5
 
             try:
                 await asyncio.wait_for(self._search_now.wait(),
                                        timeout=wait_time)
             except asyncio.TimeoutError:
                 ...
-            else:
-                # New searches have been requested. Reset the interval between
-                # subseqent searches and force a check on the "retirees".
-                time_to_check_on_retirees = last_send_time
-                interval = common.MIN_RETRY_SEARCHES_INTERVAL
 
             self._search_now.clear()
 
         # self.log.debug('Broadcaster search-retry thread has exited.')
 
-    async def _retry_unanswered_searches(self, threshold, resend_deadline):
+    async def _retry_unanswered_searches(self, now):
         """
-        Periodically (re-)send a SearchRequest for all unanswered searches.
+        (Re-)send a SearchRequest for the unanswered searches which are due.
 
         Notes
         -----
-        Each time new searches are added, the self._search_now Event is set,
-        and we reissue *all* unanswered searches.
-
-        We then frequently retry the unanswered searches that are younger than
-        SEARCH_RETIREMENT_AGE, backing off from an interval of
-        MIN_RETRY_SEARCHES_INTERVAL to MAX_RETRY_SEARCHES_INTERVAL. The
-        interval is reset to MIN_RETRY_SEARCHES_INTERVAL each time new searches
-        are added.
-
-        For the searches older than SEARCH_RETIREMENT_AGE, we adopt a slower
-        period to minimize network traffic. We only resend every
-        RETRY_RETIRED_SEARCHES_INTERVAL or, again, whenever new searches are
-        added.
+        Each search backs off on its own, as scheduled by
+        ``self.results.scheduler``: it is sent as soon as it is added, then
+        retried from an interval of MIN_RETRY_SEARCHES_INTERVAL, doubling up to
+        MAX_RETRY_SEARCHES_INTERVAL. Searches older than SEARCH_RETIREMENT_AGE
+        are only resent every RETRY_RETIRED_SEARCHES_INTERVAL, to minimize
+        network traffic, until a new server is found.
+
+        The datagrams are limited to SEARCH_DATAGRAM_RATE per second; the
+        searches which do not fit are sent as soon as the rate allows.
         """
-        t = time.monotonic()
-
-        def _construct_search_requests(items):
-            for search_id, it in items:
-                yield ca.SearchRequest(it.name, search_id,
-                                       ca.DEFAULT_PROTOCOL_VERSION)
-                it.last_sent = t
-
-        items = self.results.items_to_retry(
-            threshold, resend_deadline=resend_deadline)
-        requests = _construct_search_requests(items)
+        scheduler = self.results.scheduler
+        items = self.results.items_to_retry(now)
+        requests = [
+            ca.SearchRequest(it.name, search_id, ca.DEFAULT_PROTOCOL_VERSION)
+            for search_id, it in items
+        ]
 
         if items:
             self.log.debug('Sending %d SearchRequests', len(items))
 
+        unsent = []
         ver = ca.VersionRequest(0, ca.DEFAULT_PROTOCOL_VERSION)
         for batch in batch_requests(
                 requests, constants.SEARCH_MAX_DATAGRAM_BYTES - len(ver)):
+            if unsent or not scheduler.acquire_datagram(now):
+                unsent.extend(req.cid for req in batch)
+                continue
+            cids = [req.cid for req in batch]
             await self.send(ver, *batch)
+            scheduler.mark_sent(cids, now)
+
+        if unsent:
+            scheduler.requeue(unsent)
 
 
 class Context:
@@ -731,6 +711,126 @@ class Context:
                                           *names_to_search)
         return pvs
 
+    async def _request_many(self, pvs, request, timeout, return_exceptions):
+        if timeout is common.CONTEXT_DEFAULT_TIMEOUT:
+            timeout = self.timeout
+
+        results = await asyncio.gather(
+            *(pv.wait_for_connection(timeout=timeout) for pv in pvs),
+            return_exceptions=True
+        )
+        futures = {}
+        async with Batch(timeout=timeout) as batch:
+            for index, pv in enumerate(pvs):
+                if isinstance(results[index], Exception):
+                    continue
+                try:
+                    futures[index] = request(batch, index, pv)
+                except common.DisconnectedError as ex:
+                    # Disconnected since connecting
+                    results[index] = ex
+
+        responses = await asyncio.gather(
+            *(future for future in futures.values() if future is not None),
+            return_exceptions=True
+        )
+        responses = iter(responses)
+        for index, future in futures.items():
+            results[index] = next(responses) if future is not None else None
+
+        if not return_exceptions:
+            for result in results:
+                if isinstance(result, Exception):
+                    raise result
+        return results
+
+    async def read_many(self, pvs, *, data_type=None, data_count=None,
+                        notify=True, timeout=common.CONTEXT_DEFAULT_TIMEOUT,
+                        return_exceptions=False):
+        """
+        Read many PVs, sending the requests to each server together.
+
+        Parameters
+        ----------
+        pvs : list of PV
+        data_type : {'native', 'status', 'time', 'graphic', 'control'} or ChannelType or int ID, optional
+            Request specific data type or a class of data types, matched to the
+            channel's native data type. Default is Channel's native data type.
+        data_count : integer, optional
+            Requested number of values. Default is the channel's native data
+            count.
+        notify: boolean, optional
+            Send ``ReadNotifyRequest`` instead of ``ReadRequest``. True by
+            default.
+        timeout : number or None, optional
+            Seconds to wait for the PVs to connect, and then for their
+            responses. Default is the Context's timeout. The timeouts of each
+            PV apply too. If None, never timeout.
+        return_exceptions : bool, optional
+            Return exceptions (e.g., CaprotoTimeoutError) in place of the
+            responses for which they were raised. By default, the first
+            exception is raised once all responses are in.
+
+        Returns
+        -------
+        responses : list
+            The response for each PV, in order.
+        """
+        def request(batch, index, pv):
+            return batch.read(pv, data_type=data_type, data_count=data_count,
+                              notify=notify)
+
+        return await self._request_many(pvs, request, timeout,
+                                        return_exceptions)
+
+    async def write_many(self, pvs, values, *, notify=True, data_type=None,
+                         data_count=None,
+                         timeout=common.CONTEXT_DEFAULT_TIMEOUT,
+                         return_exceptions=False):
+        """
+        Write to many PVs, sending the requests to each server together.
+
+        Parameters
+        ----------
+        pvs : list of PV
+        values : list
+            The value (str, int, or float or any Iterable of these) to write to
+            each PV.
+        notify : boolean, optional
+            Request a WriteNotifyResponse from the servers, and wait for them.
+            True by default.
+        data_type : {'native', 'status', 'time', 'graphic', 'control'} or ChannelType or int ID, optional
+            Write specific data type or a class of data types, matched to the
+            channel's native data type. Default is Channel's native data type.
+        data_count : integer, optional
+            Requested number of values. Default is the channel's native data
+            count.
+        timeout : number or None, optional
+            Seconds to wait for the PVs to connect, and then for their
+            responses. Default is the Context's timeout. The timeouts of each
+            PV apply too. If None, never timeout.
+        return_exceptions : bool, optional
+            Return exceptions (e.g., CaprotoTimeoutError) in place of the
+            responses for which they were raised. By default, the first
+            exception is raised once all responses are in.
+
+        Returns
+        -------
+        responses : list
+            The WriteNotifyResponse for each PV, in order, or None for each if
+            ``notify`` is False.
+        """
+        if len(pvs) != len(values):
+            raise ca.CaprotoValueError(
+                'The number of PVs and values must be the same')
+
+        def request(batch, index, pv):
+            return batch.write(pv, values[index], notify=notify,
+                               data_type=data_type, data_count=data_count)
+
+        return await self._request_many(pvs, request, timeout,
+                                        return_exceptions)
+
     async def reconnect(self, keys):
         # We will reuse the same PV object but use a new cid.
         names = []
@@ -977,16 +1077,17 @@ class VirtualCircuitManager:
     async def _transport_receive_loop(self, transport):
         while True:
             try:
-                bytes_received = await transport.recv()
+                nbytes = await transport.recv_into(
+                    self.circuit.get_recv_buffer(4096))
             except ca.CaprotoNetworkError:
-                bytes_received = b''
+                nbytes = 0
 
             self.last_tcp_receipt = time.monotonic()
-            commands, _ = self.circuit.recv(bytes_received)
+            commands, _ = self.circuit.recv_buffer_updated(nbytes)
             for c in commands:
                 self.command_queue.put(c)
 
-            if not bytes_received:
+            if not nbytes:
                 break
 
     async def _connect(self, timeout):
@@ -1147,6 +1248,10 @@ class VirtualCircuitManager:
                 # are waiting on.
                 ioid_info['response'] = command
                 event.set()
+            future = ioid_info.get('future')
+            if future is not None and not future.done():
+                # A request of a Batch
+                future.set_result(command)
             callback = ioid_info.get('callback')
             if callback is not None:
                 self.user_callback_executor.submit(callback, command)
@@ -1252,6 +1357,9 @@ class VirtualCircuitManager:
             event = ioid_info.get('event')
             if event is not None:
                 event.set()
+            future = ioid_info.get('future')
+            if future is not None and not future.done():
+                future.set_exception(common.DeadCircuitError())
 
         # Remove server + channels marked as created from the search results:
         self._search_results.mark_server_disconnected(self.circuit.address)
@@ -1772,7 +1880,8 @@ class PV:
         return ioid_info['response']
 
     def subscribe(self, data_type=None, data_count=None, low=0.0, high=0.0,
-                  to=0.0, mask=None):
+                  to=0.0, mask=None, shared_memory=False,
+                  coalesce_interval=None):
         """
         Start a new subscription to which user callback may be added.
 
@@ -1788,6 +1897,19 @@ class PV:
             deprecated by Channel Access, not yet implemented by caproto
         mask :  SubscriptionType, optional
             Subscribe to selective updates.
+        shared_memory : bool, optional
+            If the server is on this host, request that large array values be
+            passed by way of shared memory instead of over TCP. The values
+            are copied out of shared memory as each update is received.
+            Servers which do not support this send values as usual.
+        coalesce_interval : float, optional
+            For consumers which only need the current value, such as
+            displays: seconds between updates handed to the callbacks. Only
+            the most recent update is kept, and handed over at most once per
+            interval; iterating over the subscription also waits for the
+            consumer to ask for the next one. The others are dropped, and
+            counted by :attr:`Subscription.dropped_updates`. By default, all
+            updates are handed over.
 
         Returns
         -------
@@ -1814,14 +1936,17 @@ class PV:
         """
         # A Subscription is uniquely identified by the Signature created by its
         # args and kwargs.
-        bound = common.SUBSCRIBE_SIG.bind(data_type, data_count, low, high, to, mask)
+        bound = common.SUBSCRIBE_SIG.bind(data_type, data_count, low, high, to,
+                                          mask, shared_memory,
+                                          coalesce_interval)
         key = tuple(bound.arguments.items())
         try:
             sub = self.subscriptions[key]
         except KeyError:
             sub = Subscription(self,
                                data_type, data_count,
-                               low, high, to, mask)
+                               low, high, to, mask, shared_memory,
+                               coalesce_interval)
             self.subscriptions[key] = sub
         # The actual EPICS messages will not be sent until the user adds
         # callbacks via sub.add_callback(user_func).
@@ -1933,7 +2058,8 @@ class Subscription(CallbackHandler):
     This object should never be instantiated directly by user code; rather
     it should be made by calling the ``subscribe()`` method on a ``PV`` object.
     """
-    def __init__(self, pv, data_type, data_count, low, high, to, mask):
+    def __init__(self, pv, data_type, data_count, low, high, to, mask,
+                 shared_memory=False, coalesce_interval=None):
         super().__init__(pv)
         # Stash everything, but do not send any EPICS messages until the first
         # user callback is attached.
@@ -1943,9 +2069,18 @@ class Subscription(CallbackHandler):
         self.high = high
         self.to = to
         self.mask = mask
+        self.shared_memory = shared_memory
+        self.coalesce_interval = coalesce_interval
         self.subscriptionid = None
         self.most_recent_response = None
         self.needs_reactivation = False
+        # The number of updates dropped by coalescing
+        self.dropped_updates = 0
+        # Coalescing: the most recent update not yet handed over, the handle
+        # of its delivery, and the (loop) time of the last delivery.
+        self._coalesced = None
+        self._delivery = None
+        self._last_delivery = None
         # This is related to back-compat for user callbacks that have the old
         # signature, f(response).
         self.__wrapper_weakrefs = set()
@@ -1958,6 +2093,11 @@ class Subscription(CallbackHandler):
         return f"<Subscription to {self.pv.name!r}, id={self.subscriptionid}>"
 
     async def __aiter__(self):
+        if self.coalesce_interval is not None:
+            async for item in self._iter_latest():
+                yield item
+            return
+
         queue = AsyncioQueue()
 
         async def iter_callback(sub, value):
@@ -1971,6 +2111,29 @@ class Subscription(CallbackHandler):
         finally:
             await self.remove_callback(sid)
 
+    async def _iter_latest(self):
+        # Coalescing: hold only the most recent update until the consumer
+        # asks for it.
+        latest = None
+        ready = asyncio.Event()
+
+        async def iter_callback(sub, value):
+            nonlocal latest
+            if latest is not None:
+                self.dropped_updates += 1
+            latest = value
+            ready.set()
+
+        sid = self.add_callback(iter_callback)
+        try:
+            while True:
+                await ready.wait()
+                ready.clear()
+                item, latest = latest, None
+                yield item
+        finally:
+            await self.remove_callback(sid)
+
     async def __aenter__(self):
         return self
 
@@ -2008,6 +2171,7 @@ class Subscription(CallbackHandler):
                                      data_count=self.data_count, low=self.low,
                                      high=self.high, to=self.to,
                                      mask=self.mask,
+                                     shared_memory=self.shared_memory,
                                      subscriptionid=subscriptionid)
             subscriptionid = command.subscriptionid
             self.subscriptionid = subscriptionid
@@ -2037,6 +2201,10 @@ class Subscription(CallbackHandler):
             subscriptionid = self.subscriptionid
             self.subscriptionid = None
             self.most_recent_response = None
+            self._coalesced = None
+            if self._delivery is not None:
+                self._delivery.cancel()
+                self._delivery = None
 
         self.pv.circuit_manager.subscriptions.pop(subscriptionid, None)
         chan = self.pv.channel
@@ -2057,9 +2225,34 @@ class Subscription(CallbackHandler):
         # As implemented below, updates are blocking further messages from
         # the CA servers from processing. (-> ThreadPool, etc.)
         pv = self.pv
-        super().process(self, command)
         self.log.debug("%r: %r", pv.name, command)
         self.most_recent_response = command
+        if self.coalesce_interval is None:
+            super().process(self, command)
+            return
+
+        # Keep only the most recent update, until it is due.
+        if self._coalesced is not None:
+            self.dropped_updates += 1
+        self._coalesced = command
+        if self._delivery is not None:
+            return
+
+        loop = get_running_loop()
+        delay = (self._last_delivery + self.coalesce_interval - loop.time()
+                 if self._last_delivery is not None else 0)
+        if delay > 0:
+            self._delivery = loop.call_later(delay, self._deliver)
+        else:
+            self._deliver()
+
+    def _deliver(self):
+        self._delivery = None
+        command, self._coalesced = self._coalesced, None
+        if command is None or not self.callbacks:
+            return
+        self._last_delivery = get_running_loop().time()
+        super().process(self, command)
 
     def add_callback(self, func):
         """
@@ -2124,3 +2317,159 @@ class Subscription(CallbackHandler):
                 await self._unsubscribe()
                 self.most_recent_response = None
                 self.needs_reactivation = False
+
+
+class Batch:
+    """
+    Accumulate requests and then issue them all in batch.
+
+    Requests are grouped by circuit. All of the requests to one circuit are
+    sent together upon exiting the ``async with`` block. Each request gives a
+    future for its response.
+
+    Parameters
+    ----------
+    timeout : number or None, optional
+        Overall timeout: seconds after the requests are sent, after which any
+        future still waiting for its response raises CaprotoTimeoutError.
+        Default is 2. If None, only the timeouts of each request apply.
+
+    Examples
+    --------
+    Read some PVs in batch.
+
+    >>> async with Batch() as batch:
+    ...     futures = [batch.read(pv) for pv in pvs]
+    ...     # The requests are sent upon exiting this 'async with' block.
+    ...
+    >>> responses = await asyncio.gather(*futures)
+    """
+    def __init__(self, timeout=2):
+        self.timeout = timeout
+        self._commands = collections.defaultdict(list)  # circuit -> commands
+        # (future, ioid_info, timeout) for each request expecting a response
+        self._requests = []
+        self._ioids = []  # (circuit_manager, ioid), to forget if not sent
+
+    async def __aenter__(self):
+        return self
+
+    def _add(self, pv, make_command, timeout, notify):
+        if not pv.connected:
+            raise common.DisconnectedError(f'{pv} is not connected')
+        if timeout is common.PV_DEFAULT_TIMEOUT:
+            timeout = pv.timeout
+        cm, chan = pv.circuit_manager, pv.channel
+        ioid = cm._ioid_counter()
+        command = make_command(chan, ioid)
+        self._commands[cm].append(command)
+        if not notify:
+            return None
+
+        future = get_running_loop().create_future()
+        # Stash the ioid to match the response to the request.
+        ioid_info = dict(future=future, pv=pv, request=command)
+        cm.ioids[ioid] = ioid_info
+        self._requests.append((future, ioid_info, timeout))
+        self._ioids.append((cm, ioid))
+        return future
+
+    def read(self, pv, *, data_type=None, data_count=None, notify=True,
+             timeout=common.PV_DEFAULT_TIMEOUT):
+        """Request a fresh reading as part of a batched request.
+
+        Parameters
+        ----------
+        pv : PV
+            A connected PV.
+        data_type : {'native', 'status', 'time', 'graphic', 'control'} or ChannelType or int ID, optional
+            Request specific data type or a class of data types, matched to the
+            channel's native data type. Default is Channel's native data type.
+        data_count : integer, optional
+            Requested number of values. Default is the channel's native data
+            count.
+        notify: boolean, optional
+            Send a ``ReadNotifyRequest`` instead of a ``ReadRequest``. True by
+            default.
+        timeout : number or None, optional
+            Seconds to wait for this response, once sent. Default is
+            ``PV.timeout``. If None, only the timeout of the batch applies.
+
+        Returns
+        -------
+        future : asyncio.Future
+            Resolved with the response, once received.
+        """
+        def make_command(chan, ioid):
+            return chan.read(ioid=ioid, data_type=data_type,
+                             data_count=data_count, notify=notify)
+
+        return self._add(pv, make_command, timeout, notify=True)
+
+    def write(self, pv, data, *, notify=True, data_type=None, data_count=None,
+              timeout=common.PV_DEFAULT_TIMEOUT):
+        """Write a new value as part of a batched request.
+
+        Parameters
+        ----------
+        pv : PV
+            A connected PV.
+        data : str, int, or float or any Iterable of these
+            Value(s) to write.
+        notify : boolean, optional
+            Request a WriteNotifyResponse from the server. True by default.
+        data_type : {'native', 'status', 'time', 'graphic', 'control'} or ChannelType or int ID, optional
+            Write specific data type or a class of data types, matched to the
+            channel's native data type. Default is Channel's native data type.
+        data_count : integer, optional
+            Requested number of values. Default is the channel's native data
+            count.
+        timeout : number or None, optional
+            Seconds to wait for this response, once sent. Default is
+            ``PV.timeout``. If None, only the timeout of the batch applies.
+
+        Returns
+        -------
+        future : asyncio.Future or None
+            Resolved with the WriteNotifyResponse, once received. None if
+            ``notify`` is False.
+        """
+        def make_command(chan, ioid):
+            return chan.write(data, ioid=ioid, notify=notify,
+                              data_type=data_type, data_count=data_count)
+
+        return self._add(pv, make_command, timeout, notify=notify)
+
+    @staticmethod
+    def _expire(future, ioid_info, timeout):
+        if not future.done():
+            pv = ioid_info['pv']
+            future.set_exception(ca.CaprotoTimeoutError(
+                f"No response to {ioid_info['request']!r} regarding PV "
+                f"{pv.name!r} within {float(timeout):.3}-second timeout."
+            ))
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        if exc_type is not None:
+            # Nothing has been sent; forget about the requests.
+            for cm, ioid in self._ioids:
+                cm.ioids.pop(ioid, None)
+            for future, _, _ in self._requests:
+                future.cancel()
+            return
+
+        loop = get_running_loop()
+        now = time.monotonic()
+        for future, ioid_info, timeout in self._requests:
+            if self.timeout is not None:
+                timeout = (self.timeout if timeout is None
+                           else min(timeout, self.timeout))
+            ioid_info['deadline'] = (now + timeout
+                                     if timeout is not None else None)
+            if timeout is not None:
+                handle = loop.call_later(timeout, self._expire, future,
+                                         ioid_info, timeout)
+                future.add_done_callback(lambda _, h=handle: h.cancel())
+
+        for circuit_manager, commands in self._commands.items():
+            await circuit_manager.send(*commands)
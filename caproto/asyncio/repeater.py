@@ -0,0 +1,318 @@
+# Channel Access Repeater, on asyncio
+#
+# This is the event-driven counterpart of caproto.sync.repeater. It differs
+# from it in how it does its work, not in what it does:
+#
+# - Datagrams are not decoded into Commands and encoded again. Their headers
+#   are walked in place, and the datagram is forwarded as it was received,
+#   unless a Beacon needs its address filled in or a RepeaterRegisterRequest
+#   needs to be left out.
+# - The same bytes are handed to the transport for each client; the transport
+#   sends them without blocking, buffering only if the socket is not writable.
+# - Whether clients are still alive (i.e., still bound to their port) is
+#   checked periodically for all of them at once, rather than on every
+#   registration, and stale servers are pruned at the same time.
+# - Counters of the work done may be read as JSON from a TCP port on
+#   localhost, if one is given.
+
+import asyncio
+import collections
+import json
+import logging
+import struct
+import time
+
+import caproto
+
+from ..sync.repeater import (RepeaterAlreadyRunning,
+                             check_for_running_repeater, check_ports_in_use,
+                             checkin_threshold)
+
+__all__ = ('Repeater', 'start_repeater', 'run')
+
+logger = logging.getLogger('caproto.repeater')
+
+# command, payload_size, data_type, data_count, parameter1, parameter2
+_HEADER = struct.Struct('!HHHHII')
+# payload_size, data_count of an extended header
+_EXTENDED_HEADER = struct.Struct('!II')
+_ADDRESS_OFFSET = 12
+
+_BEACON = caproto.Beacon.ID
+_REGISTER = caproto.RepeaterRegisterRequest.ID
+
+
+class _RepeaterProtocol(asyncio.DatagramProtocol):
+    def __init__(self, repeater):
+        self.repeater = repeater
+
+    def connection_made(self, transport):
+        self.repeater.transport = transport
+
+    def datagram_received(self, data, addr):
+        self.repeater.datagram_received(data, addr)
+
+    def error_received(self, ex):
+        # Win32: a previous send resulted in an ICMP Port Unreachable message.
+        logger.debug("UDP socket reported previous send failed: %s", ex)
+        self.repeater.counters['send_errors'] += 1
+
+
+class Repeater:
+    '''
+    Forward beacons to all Channel Access clients registered on this host.
+
+    Parameters
+    ----------
+    sweep_interval : float, optional
+        Seconds between checks of which clients are still alive.
+    checkin_threshold : float, optional
+        Seconds after which a server which sent no beacons is forgotten.
+
+    Attributes
+    ----------
+    clients : dict
+        Maps the port of each registered client to its host.
+    servers : dict
+        Maps the (host, port) of each server to the time of its last beacon.
+    counters : collections.Counter
+        Counts of datagrams received and forwarded, registrations, beacons,
+        and so on.
+    '''
+
+    def __init__(self, *, sweep_interval=5.0,
+                 checkin_threshold=checkin_threshold):
+        self.sweep_interval = sweep_interval
+        self.checkin_threshold = checkin_threshold
+        self.transport = None
+        self.clients = {}
+        self.servers = {}
+        self.counters = collections.Counter()
+        self._confirmations = {}
+        self._packed_hosts = {}
+
+    def __repr__(self):
+        return (f'<{self.__class__.__name__} clients={len(self.clients)} '
+                f'servers={len(self.servers)}>')
+
+    @property
+    def statistics(self):
+        return dict(self.counters, clients=len(self.clients),
+                    servers=len(self.servers))
+
+    def datagram_received(self, data, addr):
+        host, port = addr
+        self.counters['datagrams_received'] += 1
+        if self.clients.get(port, host) != host:
+            # broadcast only from one interface
+            self.counters['datagrams_ignored'] += 1
+            return
+
+        if not data:
+            # NOTE: additional valid way of registration is an empty
+            # message, according to broadcaster source
+            self._register(host, port, confirm=False)
+            return
+
+        try:
+            to_forward, registered = self._process(data, host)
+        except ValueError as ex:
+            logger.debug('Dropping malformed datagram from %s:%d: %s',
+                         host, port, ex)
+            self.counters['datagrams_malformed'] += 1
+            return
+
+        if registered:
+            self._register(host, port, confirm=True)
+        if to_forward:
+            self._forward(to_forward, port)
+
+    def _process(self, data, host):
+        '''
+        Walk the headers of a datagram, returning the bytes to forward and
+        whether it holds a registration.
+        '''
+        to_forward = data
+        registrations = []
+        offset = 0
+        size = len(data)
+        now = time.monotonic()
+        while offset < size:
+            if size - offset < _HEADER.size:
+                raise ValueError('truncated header')
+            (command, payload_size, _, data_count, _,
+             address) = _HEADER.unpack_from(data, offset)
+            header_size = _HEADER.size
+            if payload_size == 0xFFFF and data_count == 0:
+                header_size += _EXTENDED_HEADER.size
+                if size - offset < header_size:
+                    raise ValueError('truncated extended header')
+                payload_size, data_count = _EXTENDED_HEADER.unpack_from(
+                    data, offset + _HEADER.size)
+            end = offset + header_size + payload_size
+            if end > size:
+                raise ValueError('truncated payload')
+
+            if command == _BEACON:
+                self.counters['beacons'] += 1
+                # The sender of a beacon may leave the IP field empty (0),
+                # leaving it up to the repeater to fill in the address so that
+                # the ultimate recipient knows the correct origin.
+                if address == 0:
+                    if to_forward is data:
+                        to_forward = bytearray(data)
+                    start = offset + _ADDRESS_OFFSET
+                    to_forward[start:start + 4] = self._packed_host(host)
+                    server_host = host
+                else:
+                    server_host = caproto.ipv4_from_int32(address)
+                # The server port is sent in the data_count field.
+                self.servers[(server_host, data_count)] = now
+            elif command == _REGISTER:
+                # Do not broadcast registration requests to other clients.
+                registrations.append((offset, end))
+            offset = end
+
+        if registrations:
+            if to_forward is data:
+                to_forward = bytearray(data)
+            for start, end in reversed(registrations):
+                del to_forward[start:end]
+        return to_forward, bool(registrations)
+
+    def _packed_host(self, host):
+        try:
+            return self._packed_hosts[host]
+        except KeyError:
+            packed = struct.pack('!I', caproto.ipv4_to_int32(host))
+            self._packed_hosts[host] = packed
+            return packed
+
+    def _register(self, host, port, *, confirm):
+        self.counters['registrations'] += 1
+        if port not in self.clients:
+            self.clients[port] = host
+            logger.debug('New client %s:%d', host, port)
+        if not confirm:
+            return
+        try:
+            confirmation = self._confirmations[host]
+        except KeyError:
+            confirmation = bytes(caproto.RepeaterConfirmResponse(host))
+            self._confirmations[host] = confirmation
+        self.transport.sendto(confirmation, (host, port))
+
+    def _forward(self, data, sender_port):
+        'Send the same bytes to every client but the sender.'
+        sendto = self.transport.sendto
+        sent = 0
+        for port, host in self.clients.items():
+            if port != sender_port:
+                sendto(data, (host, port))
+                sent += 1
+        self.counters['datagrams_forwarded'] += sent
+        self.counters['bytes_forwarded'] += sent * len(data)
+
+    def sweep(self):
+        '''
+        Forget the clients which no longer hold their port, and the servers
+        which stopped sending beacons.
+        '''
+        self.counters['sweeps'] += 1
+        for host, port in check_ports_in_use(list(self.clients)):
+            logger.debug('Removing client %s:%d', self.clients[port], port)
+            del self.clients[port]
+            self.counters['clients_removed'] += 1
+
+        deadline = time.monotonic() - self.checkin_threshold
+        for server, last_beacon in list(self.servers.items()):
+            if last_beacon < deadline:
+                del self.servers[server]
+
+    async def _sweep_loop(self):
+        while True:
+            await asyncio.sleep(self.sweep_interval)
+            nclients, nservers = len(self.clients), len(self.servers)
+            self.sweep()
+            if (nclients, nservers) != (len(self.clients), len(self.servers)):
+                logger.debug('Active clients: %d servers: %d',
+                             len(self.clients), len(self.servers))
+
+    async def _send_statistics(self, reader, writer):
+        try:
+            writer.write(json.dumps(self.statistics).encode() + b'\n')
+            await writer.drain()
+        finally:
+            writer.close()
+
+    async def run(self, sock, *, stats_port=None):
+        '''
+        Run the repeater on a bound UDP socket, until cancelled.
+
+        Parameters
+        ----------
+        sock : socket.socket
+            The UDP socket, bound to the repeater port.
+        stats_port : int, optional
+            Serve :attr:`statistics` as JSON to connections to this TCP port
+            on localhost.
+        '''
+        loop = asyncio.get_running_loop()
+        sock.setblocking(False)
+        transport, _ = await loop.create_datagram_endpoint(
+            lambda: _RepeaterProtocol(self), sock=sock)
+        stats_server = None
+        if stats_port is not None:
+            stats_server = await asyncio.start_server(
+                self._send_statistics, '127.0.0.1', stats_port)
+            logger.info('Repeater statistics are served on 127.0.0.1:%d',
+                        stats_port)
+        try:
+            await self._sweep_loop()
+        finally:
+            if stats_server is not None:
+                stats_server.close()
+                await stats_server.wait_closed()
+            transport.close()
+
+
+async def start_repeater(sock, *, stats_port=None, sweep_interval=5.0):
+    'Run a :class:`Repeater` on a bound UDP socket.'
+    repeater = Repeater(sweep_interval=sweep_interval)
+    host, port = sock.getsockname()
+    logger.info("Repeater is listening on %s:%d", host, port)
+    await repeater.run(sock, stats_port=stats_port)
+
+
+def run(host='0.0.0.0', *, stats_port=None, sweep_interval=5.0):
+    '''
+    Run a repeater, unless one is already running.
+
+    A synchronous function that wraps start_repeater and exits cleanly.
+
+    Parameters
+    ----------
+    host : str, optional
+        The address to bind to.
+    stats_port : int, optional
+        Serve statistics as JSON to connections to this TCP port on
+        localhost.
+    sweep_interval : float, optional
+        Seconds between checks of which clients are still alive.
+    '''
+    port = caproto.get_environment_variables()['EPICS_CA_REPEATER_PORT']
+    logger.debug('Checking for another repeater....')
+
+    try:
+        sock = check_for_running_repeater((host, port))
+    except RepeaterAlreadyRunning:
+        logger.info('Another repeater is already running; exiting.')
+        return
+
+    try:
+        asyncio.run(start_repeater(sock, stats_port=stats_port,
+                                   sweep_interval=sweep_interval))
+    except KeyboardInterrupt:
+        logger.info('Keyboard interrupt; exiting.')
+    finally:
+        sock.close()
@@ -76,7 +76,7 @@ class VirtualCircuit(_VirtualCircuit):
 
     async def _send_buffers(self, *buffers):
         """Send ``buffers`` over the wire."""
-        await self.client.send(b"".join(buffers))
+        await self.client.send_buffers(buffers)
 
     async def run(self):
         self.tasks.create(self.command_queue_loop())
@@ -185,6 +185,11 @@ class Context(_Context):
 
         async_lib = AsyncioAsyncLayer()
 
+        async def spawn(async_fn, *args):
+            self.server_tasks.create(async_fn(*args))
+
+        self._start_scan_scheduler(async_lib, spawn)
+
         if startup_hook is not None:
             self.log.debug('Calling startup hook %r', startup_hook.__name__)
             tasks.create(startup_hook(async_lib))
@@ -91,9 +91,18 @@ class _TransportWrapper:
 
     async def send(self, bytes_to_send):
         """Sends data over a connected socket."""
+        await self.send_buffers([bytes_to_send])
+
+    async def send_buffers(self, buffers):
+        """
+        Sends a sequence of buffers over a connected socket.
+
+        Small buffers are coalesced; the remainder are handed to the transport
+        as-is, without joining them first.
+        """
         try:
             async with self.send_lock:
-                self.writer.write(bytes_to_send)
+                self.writer.writelines(ca.coalesce_buffers(buffers))
                 await self.writer.drain()
         except OSError as exc:
             try:
@@ -116,6 +125,13 @@ class _TransportWrapper:
                 f"Failed to receive: {exc}"
             ) from exc
 
+    async def recv_into(self, buffer):
+        """Receive from the socket into ``buffer``; return bytes received."""
+        data = await self.recv(len(buffer))
+        nbytes = len(data)
+        buffer[:nbytes] = data
+        return nbytes
+
     def close(self):
         return self.writer.close()
 
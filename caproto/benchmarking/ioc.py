@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+The IOC served by the benchmark suite in :mod:`caproto.benchmarking.suite`.
+
+Updates are driven by the client: writing N to ``scalar_burst`` (or
+``waveform_burst``) makes the server write N new values to ``scalar`` (or
+``waveform``) as fast as it can, with the put completing once all N writes
+have been published. Each value is timestamped at the time of writing, such
+that subscribers on the same host can compute the latency of every update.
+"""
+import textwrap
+
+import numpy as np
+
+from caproto import ChannelDouble
+from caproto.server import PVGroup, pvproperty, run, template_arg_parser
+
+#: The largest waveform the benchmark IOC can serve
+MAX_WAVEFORM_LENGTH = 1_000_000
+
+
+class BenchmarkIOC(PVGroup):
+    """
+    An IOC for benchmarking caproto servers.
+
+    Parameters
+    ----------
+    channels : int, optional
+        The number of additional, otherwise unused, scalar PVs to serve for
+        search and channel creation benchmarks. These are named
+        ``{prefix}ch:{index}``.
+    """
+
+    def __init__(self, *args, channels=0, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.channels = channels
+        self.pvdb.update(
+            (self.channel_name(self.prefix, idx), ChannelDouble(value=0.0))
+            for idx in range(channels)
+        )
+
+    @staticmethod
+    def channel_name(prefix, index):
+        'The name of one of the additional scalar PVs'
+        return f'{prefix}ch:{index}'
+
+    scalar = pvproperty(
+        value=0.0,
+        read_only=True,
+        doc="Scalar updated by scalar_burst",
+    )
+    waveform = pvproperty(
+        value=[0.0],
+        max_length=MAX_WAVEFORM_LENGTH,
+        read_only=True,
+        doc="Waveform updated by waveform_burst",
+    )
+    waveform_length = pvproperty(
+        value=1000,
+        doc="Number of elements written to waveform in each update",
+    )
+    scalar_burst = pvproperty(
+        value=0,
+        doc="Write N to publish N updates of scalar",
+    )
+    waveform_burst = pvproperty(
+        value=0,
+        doc="Write N to publish N updates of waveform",
+    )
+    put_target = pvproperty(
+        value=0.0,
+        doc="Used to measure put completion latency",
+    )
+
+    @scalar_burst.putter
+    async def scalar_burst(self, instance, value):
+        for idx in range(value):
+            await self.scalar.write(float(idx))
+        return value
+
+    @waveform_burst.putter
+    async def waveform_burst(self, instance, value):
+        length = min(self.waveform_length.value, MAX_WAVEFORM_LENGTH)
+        # Two alternating read-only arrays, such that the server does not
+        # make a defensive copy of either on write.
+        arrays = [np.full(length, float(idx)) for idx in range(2)]
+        for arr in arrays:
+            arr.flags.writeable = False
+        for idx in range(value):
+            await self.waveform.write(arrays[idx % 2])
+        return value
+
+
+if __name__ == '__main__':
+    parser, split_args = template_arg_parser(
+        default_prefix='bench:',
+        desc=textwrap.dedent(BenchmarkIOC.__doc__),
+    )
+    parser.add_argument(
+        '--channels',
+        help='The number of additional scalar PVs to serve.',
+        type=int,
+        default=0,
+    )
+    args = parser.parse_args()
+    ioc_options, run_options = split_args(args)
+    ioc = BenchmarkIOC(channels=args.channels, **ioc_options)
+    run(ioc.pvdb, **run_options)
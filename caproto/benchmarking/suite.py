@@ -0,0 +1,754 @@
+#!/usr/bin/env python3
+"""
+A reproducible benchmark suite for the caproto servers.
+
+Each server implementation (asyncio, curio, trio) is started in a subprocess
+serving :class:`caproto.benchmarking.ioc.BenchmarkIOC` on the loopback
+interface, and is then measured using minimal blocking clients built directly
+on the caproto core, so that client-side overhead stays small compared to the
+server under test. The following are measured:
+
+* ``monitor``: updates/sec, throughput and p50/p99 latency of subscription
+  updates for a scalar and a waveform, for each number of subscribers
+* ``search``: names resolved per second, with names packed into datagrams
+* ``create_channel``: channels created per second on a single circuit
+* ``put_completion``: latency of WriteNotifyRequest to WriteNotifyResponse
+* ``backend``: in-process, the time taken by each numpy backend to encode a
+  waveform update on the server and to decode (and do arithmetic on) it on
+  the client
+* ``records``: in-process, the time and memory taken to create many records,
+  with their fields created on first access (``lazy``) or along with them
+  (``eager``), and the time then taken to access a few fields of each
+* ``channel_data``: in-process, the memory taken per PV by many plain
+  ChannelData instances of each type, as for large numbers of mostly idle PVs
+
+Results are written as JSON, such that runs from different releases can be
+compared::
+
+    python -m caproto.benchmarking.suite --output new.json
+    python -m caproto.benchmarking.suite --compare old.json new.json
+"""
+import argparse
+import asyncio
+import contextlib
+import datetime
+import getpass
+import json
+import logging
+import math
+import os
+import platform
+import selectors
+import socket
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import caproto as ca
+
+from .._constants import SEARCH_MAX_DATAGRAM_BYTES
+from .._utils import batch_requests
+
+logger = logging.getLogger(__name__)
+
+__all__ = ('run_suite', 'compare_results', 'benchmark_monitor',
+           'benchmark_search', 'benchmark_create_channel',
+           'benchmark_put_completion', 'benchmark_backend',
+           'benchmark_records', 'benchmark_channel_data',
+           'benchmark_server')
+
+DEFAULT_ASYNC_LIBS = ('asyncio', 'curio', 'trio')
+DEFAULT_BACKENDS = ('numpy', 'numpy_native')
+DEFAULT_SUBSCRIBER_COUNTS = (1, 10, 100, 1000)
+DEFAULT_WAVEFORM_LENGTH = 1_000_000
+DEFAULT_PREFIX = 'bench:'
+
+
+def _percentile(sorted_values, percent):
+    'Nearest-rank percentile of an already-sorted sequence'
+    if not sorted_values:
+        return None
+    rank = math.ceil(percent / 100. * len(sorted_values))
+    return sorted_values[max(rank - 1, 0)]
+
+
+def _latency_summary(latencies):
+    'Summarize latencies (in seconds) as milliseconds'
+    latencies = sorted(latencies)
+    if not latencies:
+        return dict(p50_ms=None, p99_ms=None, max_ms=None, mean_ms=None)
+    return dict(
+        p50_ms=_percentile(latencies, 50) * 1e3,
+        p99_ms=_percentile(latencies, 99) * 1e3,
+        max_ms=latencies[-1] * 1e3,
+        mean_ms=sum(latencies) / len(latencies) * 1e3,
+    )
+
+
+class _BenchmarkCircuit:
+    '''
+    A minimal blocking client-side circuit.
+
+    Parameters
+    ----------
+    address : (host, port)
+        The server address.
+    priority : int, optional
+        The circuit priority.
+    timeout : float, optional
+        Socket timeout.
+    '''
+
+    def __init__(self, address, *, priority=0, timeout=10.0):
+        self.circuit = ca.VirtualCircuit(ca.CLIENT, address, priority)
+        self.sock = socket.create_connection(address, timeout)
+        self.sock.settimeout(timeout)
+        self.circuit.our_address = self.sock.getsockname()
+        self.send(
+            ca.VersionRequest(priority=priority,
+                              version=ca.DEFAULT_PROTOCOL_VERSION),
+            ca.HostNameRequest(socket.gethostname()),
+            ca.ClientNameRequest(getpass.getuser()),
+        )
+
+    def fileno(self):
+        return self.sock.fileno()
+
+    def send(self, *commands):
+        self.sock.sendall(b''.join(self.circuit.send(*commands)))
+
+    def recv(self):
+        'Receive and process whatever is available on the socket'
+        nbytes = self.sock.recv_into(self.circuit.get_recv_buffer(65536))
+        commands, _ = self.circuit.recv_buffer_updated(nbytes)
+        for command in commands:
+            if command is ca.DISCONNECTED:
+                raise ca.CaprotoNetworkError('Server disconnected')
+            self.circuit.process_command(command)
+        return commands
+
+    def recv_until(self, done, *, timeout=10.0):
+        '''
+        Receive until ``done(command)`` has returned True for some command.
+
+        Returns
+        -------
+        command : Message
+            The command for which ``done`` returned True.
+        '''
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            for command in self.recv():
+                if done(command):
+                    return command
+        raise ca.CaprotoTimeoutError('Timed out waiting for a response')
+
+    def create_channels(self, names, *, timeout=10.0):
+        'Create channels for all ``names`` with a single send'
+        channels = [ca.ClientChannel(name, self.circuit) for name in names]
+        self.send(*(chan.create() for chan in channels))
+        deadline = time.monotonic() + timeout
+        pending = set(channels)
+        while pending:
+            if time.monotonic() > deadline:
+                raise ca.CaprotoTimeoutError('Timed out creating channels')
+            for command in self.recv():
+                if isinstance(command, ca.CreateChFailResponse):
+                    raise ca.CaprotoRuntimeError(
+                        f'Failed to create channel (cid={command.cid})')
+            pending = {chan for chan in pending
+                       if chan.states[ca.CLIENT] is not ca.CONNECTED}
+        return channels
+
+    def write(self, chan, data, *, timeout=10.0):
+        'Write ``data`` to ``chan``, waiting for put completion'
+        request = chan.write(data, notify=True)
+        self.send(request)
+        return self.recv_until(
+            lambda command: (isinstance(command, ca.WriteNotifyResponse) and
+                             command.ioid == request.ioid),
+            timeout=timeout)
+
+    def close(self):
+        self.sock.close()
+
+
+def benchmark_monitor(address, pv_name, trigger_name, *, subscribers,
+                      updates, subscribers_per_circuit=100, timeout=60.0,
+                      idle_timeout=2.0):
+    '''
+    Measure subscription updates fanned out to many subscribers.
+
+    ``subscribers`` subscriptions to ``pv_name`` are spread over circuits of
+    ``subscribers_per_circuit`` subscriptions each. Writing ``updates`` to
+    ``trigger_name`` then has the server publish that many updates, which are
+    collected until all have arrived or no more have arrived for
+    ``idle_timeout`` seconds. Updates the server drops for slow subscribers
+    are reported as ``dropped``.
+
+    Latency is measured from the timestamp on each update (set by the server
+    on write) to its receipt.
+    '''
+    num_circuits = math.ceil(subscribers / subscribers_per_circuit)
+    circuits = [_BenchmarkCircuit(address) for _ in range(num_circuits)]
+    control = _BenchmarkCircuit(address)
+    sel = selectors.DefaultSelector()
+    try:
+        trigger, = control.create_channels([trigger_name])
+        remaining = subscribers
+        for circuit in circuits:
+            chan, = circuit.create_channels([pv_name])
+            count = min(remaining, subscribers_per_circuit)
+            remaining -= count
+            time_type = ca.field_types['time'][chan.native_data_type]
+            circuit.send(*(chan.subscribe(data_type=time_type)
+                           for _ in range(count)))
+            sel.register(circuit.sock, selectors.EVENT_READ, data=circuit)
+
+        def receive(wait_timeout):
+            'Returns [(receipt time, EventAddResponse), ...]'
+            received = []
+            for key, _ in sel.select(timeout=wait_timeout):
+                commands = key.data.recv()
+                now = time.time()
+                received.extend((now, command) for command in commands
+                                if isinstance(command, ca.EventAddResponse))
+            return received
+
+        # Every subscription first receives the current value.
+        initial = 0
+        deadline = time.monotonic() + timeout
+        while initial < subscribers and time.monotonic() < deadline:
+            initial += len(receive(0.1))
+
+        expected = subscribers * updates
+        latencies = []
+        total_bytes = 0
+        t0 = time.monotonic()
+        t_last = t0
+        control.send(trigger.write([updates], notify=True))
+        deadline = t0 + timeout
+        while len(latencies) < expected and time.monotonic() < deadline:
+            received = receive(idle_timeout)
+            if not received:
+                break
+            t_last = time.monotonic()
+            for receipt_time, command in received:
+                # The metadata is a zero-copy view into the received payload
+                latencies.append(receipt_time - command.buffers[0].timestamp)
+                total_bytes += len(command)
+
+        elapsed = max(t_last - t0, 1e-9)
+        return dict(
+            subscribers=subscribers,
+            updates_requested=updates,
+            updates_received=len(latencies),
+            dropped=expected - len(latencies),
+            elapsed_s=elapsed,
+            updates_per_sec=len(latencies) / elapsed,
+            megabytes_per_sec=total_bytes / elapsed / 1e6,
+            **_latency_summary(latencies),
+        )
+    finally:
+        sel.close()
+        for circuit in circuits + [control]:
+            circuit.close()
+
+
+def benchmark_search(address, names, *, timeout=2.0):
+    '''
+    Measure search throughput, with names packed into datagrams.
+
+    Each datagram is sent once, and its responses are awaited before sending
+    the next.
+    '''
+    broadcaster = ca.Broadcaster(our_role=ca.CLIENT)
+    requests = [ca.SearchRequest(name, cid, ca.DEFAULT_PROTOCOL_VERSION)
+                for cid, name in enumerate(names)]
+    version = ca.VersionRequest(0, ca.DEFAULT_PROTOCOL_VERSION)
+    answered = 0
+    datagrams = 0
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+        sock.bind(('127.0.0.1', 0))
+        sock.settimeout(timeout)
+        t0 = time.monotonic()
+        for batch in batch_requests(requests,
+                                    SEARCH_MAX_DATAGRAM_BYTES - len(version)):
+            unanswered = {request.cid for request in batch}
+            sock.sendto(broadcaster.send(version, *batch), address)
+            datagrams += 1
+            deadline = time.monotonic() + timeout
+            while unanswered and time.monotonic() < deadline:
+                try:
+                    data, addr = sock.recvfrom(ca.MAX_UDP_RECV)
+                except socket.timeout:
+                    break
+                for command in broadcaster.recv(data, addr):
+                    if isinstance(command, ca.SearchResponse):
+                        unanswered.discard(command.cid)
+            answered += len(batch) - len(unanswered)
+        elapsed = max(time.monotonic() - t0, 1e-9)
+
+    return dict(
+        names=len(names),
+        answered=answered,
+        datagrams=datagrams,
+        elapsed_s=elapsed,
+        searches_per_sec=answered / elapsed,
+    )
+
+
+def benchmark_create_channel(address, names, *, timeout=60.0):
+    'Measure the rate at which channels are created on a single circuit.'
+    circuit = _BenchmarkCircuit(address, timeout=timeout)
+    try:
+        # Wait for the circuit to be established before timing:
+        circuit.recv_until(
+            lambda command: isinstance(command, ca.VersionResponse))
+        t0 = time.monotonic()
+        circuit.create_channels(names, timeout=timeout)
+        elapsed = max(time.monotonic() - t0, 1e-9)
+    finally:
+        circuit.close()
+
+    return dict(
+        channels=len(names),
+        elapsed_s=elapsed,
+        channels_per_sec=len(names) / elapsed,
+    )
+
+
+def benchmark_put_completion(address, pv_name, *, puts, timeout=10.0):
+    'Measure the latency of sequential puts with completion.'
+    circuit = _BenchmarkCircuit(address, timeout=timeout)
+    try:
+        chan, = circuit.create_channels([pv_name])
+        latencies = []
+        for idx in range(puts):
+            t0 = time.monotonic()
+            circuit.write(chan, [float(idx)], timeout=timeout)
+            latencies.append(time.monotonic() - t0)
+    finally:
+        circuit.close()
+
+    return dict(puts=puts, **_latency_summary(latencies))
+
+
+def benchmark_backend(backend_name, *, length, updates=10):
+    '''
+    Time the handling of a waveform of doubles by a numpy backend.
+
+    The ``encode`` time covers a write to a ChannelDouble on the server through
+    to the EventAddResponse ready to be sent; the ``decode`` time covers
+    parsing that response on the client through to doing some arithmetic on
+    its values.
+    '''
+    import numpy as np
+
+    initial_backend = ca.backend.backend_name
+    ca.select_backend(backend_name)
+    try:
+        data = ca.ChannelDouble(value=np.zeros(length), max_length=length)
+        values = [np.random.random(length) for _ in range(2)]
+        data_type = ca.ChannelType.TIME_DOUBLE
+
+        async def encode(update):
+            await data.write(values[update % 2])
+            metadata, data_values = await data.read(data_type)
+            command = ca.EventAddResponse(
+                data=data_values, data_type=data_type, data_count=length,
+                status=1, subscriptionid=0, metadata=metadata)
+            return command
+
+        async def encode_all():
+            encoded = []
+            times = []
+            for update in range(updates):
+                t0 = time.perf_counter()
+                command = await encode(update)
+                times.append(time.perf_counter() - t0)
+                encoded.append(
+                    (command.header, b''.join(command.buffers[1:])))
+            return encoded, times
+
+        encoded, encode_times = asyncio.run(encode_all())
+
+        decode_times = []
+        for header, payload in encoded:
+            payload = bytearray(payload)
+            t0 = time.perf_counter()
+            response = ca.EventAddResponse.from_wire(header, payload)
+            received = response.data
+            received.mean()
+            received.std()
+            received * 2.0
+            decode_times.append(time.perf_counter() - t0)
+    finally:
+        ca.select_backend(initial_backend)
+
+    return dict(
+        encode_ms=min(encode_times) * 1e3,
+        decode_ms=min(decode_times) * 1e3,
+    )
+
+
+def benchmark_records(record_type='ai', *, count, lazy,
+                      fields=('VAL', 'EGU', 'DESC')):
+    '''
+    Time the creation of ``count`` records, and measure their memory usage.
+
+    The records are pvproperties with ``record=record_type`` in one PVGroup.
+    Creation is timed first, and then repeated to measure memory with
+    tracemalloc. The ``access`` time covers looking up ``fields`` of every
+    record once created.
+    '''
+    from ..server import PVGroup, pvproperty
+    from ..server.records import RecordFieldGroup
+
+    group_cls = type('RecordBenchmarkIOC', (PVGroup, ), {
+        f'record{idx}': pvproperty(value=0.0, record=record_type)
+        for idx in range(count)
+    })
+
+    initial_lazy = RecordFieldGroup.lazy_fields
+    RecordFieldGroup.lazy_fields = lazy
+    try:
+        t0 = time.perf_counter()
+        group = group_cls(prefix=DEFAULT_PREFIX)
+        create_s = time.perf_counter() - t0
+
+        t0 = time.perf_counter()
+        for prop in group.attr_pvdb.values():
+            for field in fields:
+                prop.get_field(field)
+        access_s = time.perf_counter() - t0
+        del group
+
+        tracemalloc.start()
+        try:
+            group = group_cls(prefix=DEFAULT_PREFIX)
+            memory, _ = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        del group
+    finally:
+        RecordFieldGroup.lazy_fields = initial_lazy
+
+    return dict(
+        records=count,
+        create_s=create_s,
+        access_s=access_s,
+        memory_mb=memory / 1e6,
+        bytes_per_record=memory / count,
+    )
+
+
+DEFAULT_CHANNEL_DATA_KINDS = {
+    'ChannelDouble': dict(value=0.0),
+    'ChannelInteger': dict(value=0),
+    'ChannelEnum': dict(value='off', enum_strings=['off', 'on']),
+    'ChannelString': dict(value=''),
+    'ChannelChar': dict(value='', max_length=40),
+}
+
+
+def benchmark_channel_data(kind='ChannelDouble', *, count, **kwargs):
+    '''
+    Measure the memory taken by ``count`` instances of a ChannelData class.
+
+    ``kind`` is the name of the class, and ``kwargs`` are passed to it (by
+    default, those in ``DEFAULT_CHANNEL_DATA_KINDS``). Memory is measured with
+    tracemalloc, and includes the alarm of each instance.
+    '''
+    cls = getattr(ca, kind)
+    kwargs = kwargs or DEFAULT_CHANNEL_DATA_KINDS[kind]
+
+    tracemalloc.start()
+    try:
+        t0 = time.perf_counter()
+        instances = [cls(**kwargs) for _ in range(count)]
+        create_s = time.perf_counter() - t0
+        memory, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del instances
+
+    return dict(
+        channels=count,
+        create_s=create_s,
+        memory_mb=memory / 1e6,
+        bytes_per_pv=memory / count,
+    )
+
+
+def _find_free_port():
+    'Find a port which is free for both TCP and UDP on the loopback'
+    for port in ca.random_ports(100):
+        with contextlib.ExitStack() as stack:
+            try:
+                for kind in (socket.SOCK_STREAM, socket.SOCK_DGRAM):
+                    sock = stack.enter_context(
+                        socket.socket(socket.AF_INET, kind))
+                    sock.bind(('127.0.0.1', port))
+            except OSError:
+                continue
+        return port
+    raise ca.CaprotoRuntimeError('Unable to find a free port')
+
+
+@contextlib.contextmanager
+def benchmark_server(async_lib, *, prefix=DEFAULT_PREFIX, channels=0,
+                     port=None, startup_timeout=20.0):
+    '''
+    [context manager] Run the benchmark IOC in a subprocess.
+
+    Yields
+    ------
+    address : (host, port)
+        The loopback address the server is listening on.
+    '''
+    if port is None:
+        port = _find_free_port()
+
+    env = os.environ.copy()
+    env.update(
+        EPICS_CAS_INTF_ADDR_LIST='127.0.0.1',
+        EPICS_CA_SERVER_PORT=str(port),
+        EPICS_CAS_BEACON_ADDR_LIST='127.0.0.1',
+        EPICS_CAS_AUTO_BEACON_ADDR_LIST='NO',
+    )
+    args = [sys.executable, '-m', 'caproto.benchmarking.ioc',
+            '--prefix', prefix, '--async-lib', async_lib,
+            '--channels', str(channels), '--quiet']
+    logger.debug('Starting benchmark server: %s', ' '.join(args))
+    proc = subprocess.Popen(args, env=env, stdout=subprocess.DEVNULL)
+    address = ('127.0.0.1', port)
+    try:
+        deadline = time.monotonic() + startup_timeout
+        while True:
+            if proc.poll() is not None:
+                raise ca.CaprotoRuntimeError(
+                    f'Benchmark server exited with code {proc.returncode}')
+            try:
+                socket.create_connection(address, timeout=1.0).close()
+            except OSError:
+                if time.monotonic() > deadline:
+                    raise ca.CaprotoTimeoutError(
+                        'Timed out waiting for the benchmark server')
+                time.sleep(0.1)
+            else:
+                break
+        yield address
+    finally:
+        proc.terminate()
+        try:
+            proc.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.wait()
+
+
+def run_suite(*, async_libs=DEFAULT_ASYNC_LIBS,
+              subscriber_counts=DEFAULT_SUBSCRIBER_COUNTS,
+              waveform_length=DEFAULT_WAVEFORM_LENGTH, scalar_updates=1000,
+              waveform_updates=10, channels=10000, puts=1000,
+              backends=DEFAULT_BACKENDS, records=10000,
+              channel_data=100000, prefix=DEFAULT_PREFIX):
+    '''
+    Run the full benchmark suite.
+
+    Returns
+    -------
+    results : dict
+        JSON-serializable results, including information about the
+        environment the suite was run in.
+    '''
+    from .ioc import BenchmarkIOC
+
+    results = []
+
+    def add_result(async_lib, benchmark, result, **params):
+        logger.info('%s %s %s: %s', async_lib, benchmark, params, result)
+        results.append(dict(async_lib=async_lib, benchmark=benchmark,
+                            **params, **result))
+
+    channel_names = [BenchmarkIOC.channel_name(prefix, idx)
+                     for idx in range(channels)]
+    for async_lib in async_libs:
+        with benchmark_server(async_lib, prefix=prefix,
+                              channels=channels) as address:
+            control = _BenchmarkCircuit(address)
+            try:
+                length_chan, = control.create_channels(
+                    [f'{prefix}waveform_length'])
+                control.write(length_chan, [waveform_length])
+            finally:
+                control.close()
+
+            for kind, updates in (('scalar', scalar_updates),
+                                  ('waveform', waveform_updates)):
+                for subscribers in subscriber_counts:
+                    add_result(
+                        async_lib, 'monitor',
+                        benchmark_monitor(address, f'{prefix}{kind}',
+                                          f'{prefix}{kind}_burst',
+                                          subscribers=subscribers,
+                                          updates=updates),
+                        kind=kind,
+                        waveform_length=(waveform_length
+                                         if kind == 'waveform' else 1),
+                    )
+
+            add_result(async_lib, 'search',
+                       benchmark_search(address, channel_names))
+            add_result(async_lib, 'create_channel',
+                       benchmark_create_channel(address, channel_names))
+            add_result(async_lib, 'put_completion',
+                       benchmark_put_completion(address, f'{prefix}put_target',
+                                                puts=puts))
+
+    for backend_name in backends:
+        add_result(None, 'backend',
+                   benchmark_backend(backend_name, length=waveform_length,
+                                     updates=waveform_updates),
+                   kind=backend_name, waveform_length=waveform_length)
+
+    if records:
+        for kind in ('eager', 'lazy'):
+            add_result(None, 'records',
+                       benchmark_records(count=records, lazy=(kind == 'lazy')),
+                       kind=kind)
+
+    if channel_data:
+        for kind in DEFAULT_CHANNEL_DATA_KINDS:
+            add_result(None, 'channel_data',
+                       benchmark_channel_data(kind, count=channel_data),
+                       kind=kind)
+
+    return dict(
+        caproto_version=ca.__version__,
+        python_version=platform.python_version(),
+        platform=platform.platform(),
+        date=datetime.datetime.now().isoformat(),
+        results=results,
+    )
+
+
+def _result_key(result):
+    return tuple((key, result.get(key))
+                 for key in ('async_lib', 'benchmark', 'kind', 'subscribers'))
+
+
+#: Per benchmark, the figure of merit and whether higher is better
+FIGURES_OF_MERIT = {
+    'monitor': [('updates_per_sec', True), ('p99_ms', False)],
+    'search': [('searches_per_sec', True)],
+    'create_channel': [('channels_per_sec', True)],
+    'put_completion': [('p50_ms', False), ('p99_ms', False)],
+    'backend': [('encode_ms', False), ('decode_ms', False)],
+    'records': [('create_s', False), ('memory_mb', False)],
+    'channel_data': [('bytes_per_pv', False)],
+}
+
+
+def compare_results(baseline, current, *, threshold=0.1):
+    '''
+    Compare two sets of results from :func:`run_suite`.
+
+    Parameters
+    ----------
+    baseline : dict
+    current : dict
+    threshold : float, optional
+        The fractional change beyond which a figure of merit is considered to
+        have regressed.
+
+    Returns
+    -------
+    comparison : list of dict
+        One entry per figure of merit found in both sets of results, with
+        the ``ratio`` of current to baseline and whether it ``regressed``.
+    '''
+    baseline_by_key = {_result_key(res): res for res in baseline['results']}
+    comparison = []
+    for result in current['results']:
+        base = baseline_by_key.get(_result_key(result))
+        if base is None:
+            continue
+        for attr, higher_is_better in FIGURES_OF_MERIT[result['benchmark']]:
+            old, new = base.get(attr), result.get(attr)
+            if not old or new is None:
+                continue
+            ratio = new / old
+            regressed = (ratio < 1 - threshold if higher_is_better
+                         else ratio > 1 + threshold)
+            comparison.append(dict(_result_key(result), attr=attr,
+                                   baseline=old, current=new, ratio=ratio,
+                                   regressed=regressed))
+    return comparison
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument('--output', '-o', type=str,
+                        help='Write JSON results to this file')
+    parser.add_argument('--compare', nargs=2, metavar=('BASELINE', 'CURRENT'),
+                        help='Compare two JSON result files and exit')
+    parser.add_argument('--async-lib', dest='async_libs', nargs='+',
+                        default=list(DEFAULT_ASYNC_LIBS),
+                        choices=list(DEFAULT_ASYNC_LIBS))
+    parser.add_argument('--subscribers', nargs='+', type=int,
+                        default=list(DEFAULT_SUBSCRIBER_COUNTS))
+    parser.add_argument('--waveform-length', type=int,
+                        default=DEFAULT_WAVEFORM_LENGTH)
+    parser.add_argument('--scalar-updates', type=int, default=1000)
+    parser.add_argument('--waveform-updates', type=int, default=10)
+    parser.add_argument('--channels', type=int, default=10000)
+    parser.add_argument('--puts', type=int, default=1000)
+    parser.add_argument('--records', type=int, default=10000,
+                        help='Records to create in the records benchmark')
+    parser.add_argument('--channel-data', type=int, default=100000,
+                        help='Instances to create per ChannelData class')
+    parser.add_argument('--backends', nargs='*',
+                        default=list(DEFAULT_BACKENDS),
+                        choices=list(DEFAULT_BACKENDS))
+    parser.add_argument('-v', '--verbose', action='store_true')
+    args = parser.parse_args()
+
+    logging.basicConfig(level='INFO' if args.verbose else 'WARNING')
+
+    if args.compare:
+        with open(args.compare[0]) as f:
+            baseline = json.load(f)
+        with open(args.compare[1]) as f:
+            current = json.load(f)
+        for item in compare_results(baseline, current):
+            print(('REGRESSED ' if item['regressed'] else '          ') +
+                  ' '.join(f'{key}={value}' for key, value in item.items()
+                           if key != 'regressed'))
+        return
+
+    results = run_suite(async_libs=args.async_libs,
+                        subscriber_counts=args.subscribers,
+                        waveform_length=args.waveform_length,
+                        scalar_updates=args.scalar_updates,
+                        waveform_updates=args.waveform_updates,
+                        channels=args.channels,
+                        puts=args.puts,
+                        records=args.records,
+                        channel_data=args.channel_data,
+                        backends=args.backends)
+    text = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text)
+    else:
+        print(text)
+
+
+if __name__ == '__main__':
+    main()
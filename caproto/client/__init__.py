@@ -1,4 +1,5 @@
 from . import common
 from . import search_results
+from . import search_scheduler
 
-__all__ = ['common', 'search_results']
+__all__ = ['common', 'search_results', 'search_scheduler']
@@ -32,6 +32,15 @@ AUTOMONITOR_MAXLENGTH = int(
     os.environ.get("CAPROTO_CLIENT_AUTOMONITOR_MAXLENGTH", 65536)
 )
 BEACON_MARGIN = float(os.environ.get("CAPROTO_CLIENT_BEACON_MARGIN_SEC", 1))
+# How to handle updates for a subscription with CALLBACK_QUEUE_SIZE updates
+# already waiting for its callbacks:
+CALLBACK_OVERFLOW_POLICIES = ('drop-oldest', 'latest', 'block')
+CALLBACK_OVERFLOW_POLICY = os.environ.get(
+    "CAPROTO_CLIENT_CALLBACK_OVERFLOW_POLICY", "drop-oldest"
+)
+CALLBACK_QUEUE_SIZE = int(
+    os.environ.get("CAPROTO_CLIENT_CALLBACK_QUEUE_SIZE", 1000)
+)
 EVENT_ADD_BATCH_MAX_BYTES = int(
     os.environ.get("CAPROTO_CLIENT_EVENT_ADD_BATCH_MAX_BYTES", 2 ** 16)
 )
@@ -50,6 +59,15 @@ RETRY_RETIRED_SEARCHES_INTERVAL = float(
 SEARCH_RETIREMENT_AGE = int(
     os.environ.get("CAPROTO_CLIENT_SEARCH_RETIREMENT_AGE_SEC", 8 * 60)
 )
+SEARCH_DATAGRAM_RATE = float(
+    os.environ.get("CAPROTO_CLIENT_SEARCH_DATAGRAM_RATE", 100)
+)
+SEARCH_DATAGRAM_BURST = int(
+    os.environ.get("CAPROTO_CLIENT_SEARCH_DATAGRAM_BURST", 100)
+)
+SELECTOR_SHARDS = int(
+    os.environ.get("CAPROTO_CLIENT_SELECTOR_SHARDS", 1)
+)
 STR_ENC = os.environ.get('CAPROTO_STRING_ENCODING', 'latin-1')
 
 
@@ -109,5 +127,9 @@ SUBSCRIBE_SIG = inspect.Signature([
     Parameter('low', Parameter.POSITIONAL_OR_KEYWORD, default=0),
     Parameter('high', Parameter.POSITIONAL_OR_KEYWORD, default=0),
     Parameter('to', Parameter.POSITIONAL_OR_KEYWORD, default=0),
-    Parameter('mask', Parameter.POSITIONAL_OR_KEYWORD, default=None)
+    Parameter('mask', Parameter.POSITIONAL_OR_KEYWORD, default=None),
+    Parameter('shared_memory', Parameter.POSITIONAL_OR_KEYWORD,
+              default=False),
+    Parameter('coalesce_interval', Parameter.POSITIONAL_OR_KEYWORD,
+              default=None)
 ])
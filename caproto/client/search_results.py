@@ -11,6 +11,7 @@ import caproto as ca
 from .. import _utils as utils
 from .. import _constants as constants
 from . import common
+from .search_scheduler import SearchScheduler
 
 
 class UnknownSearchResponse(ca.CaprotoError):
@@ -36,29 +37,176 @@ def _locked(func):
 class _UnansweredSearch:
     name: str
     results_queue: object
-    last_sent: float
-    retirement_deadline: float
 
-    def __init__(self, name, results_queue, last_sent,
-                 retirement_deadline):
+    def __init__(self, name, results_queue):
         self.name = name
         self.results_queue = results_queue
-        self.last_sent = last_sent
-        self.retirement_deadline = retirement_deadline
 
     def __repr__(self):
-        retire = self.retirement_deadline - time.monotonic()
+        return f'<_UnansweredSearch name={self.name}>'
 
-        if self.last_sent > 0:
-            resend = self.last_sent - time.monotonic()
-        else:
-            resend = 'never'
 
-        return (
-            f'<_UnansweredSearch name={self.name} '
-            f'relative_resend_deadline={resend}) '
-            f'relative_retirement_deadline={retire})'
-        )
+class _CachedSearchResult:
+    __slots__ = ('address', 'timestamp', 'channels')
+
+    def __init__(self, address, timestamp):
+        self.address = address
+        self.timestamp = timestamp
+        # The number of channels to the name on live circuits
+        self.channels = 0
+
+
+class SearchCache:
+    '''
+    Thread-safe cache of the addresses of the servers found for PV names
+
+    Results are indexed both by name and by server address, such that looking
+    up a name, refreshing it, and invalidating all of the names of a server
+    (e.g., when it restarts) do not require scanning every cached result.
+
+    A result expires some time after it was found, unless a channel to the
+    name exists on a live circuit. Creating and disconnecting channels is
+    tracked with :meth:`mark_channel_created` and
+    :meth:`mark_channel_disconnected`.
+    '''
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._by_name = {}
+        self._by_address = collections.defaultdict(set)
+
+    def __len__(self):
+        return len(self._by_name)
+
+    def __contains__(self, name):
+        return name in self._by_name
+
+    def __repr__(self):
+        return (f'<{self.__class__.__name__} names={len(self._by_name)} '
+                f'servers={len(self._by_address)}>')
+
+    def _remove(self, name):
+        'Remove the result for name; the lock must be held'
+        result = self._by_name.pop(name, None)
+        if result is not None:
+            names = self._by_address.get(result.address)
+            if names is not None:
+                names.discard(name)
+                if not names:
+                    del self._by_address[result.address]
+
+    def _add(self, name, address, timestamp):
+        'Replace the result for name; the lock must be held'
+        self._remove(name)
+        result = self._by_name[name] = _CachedSearchResult(address, timestamp)
+        self._by_address[address].add(name)
+        return result
+
+    def _get(self, name, threshold, now):
+        'Look up the address for name; the lock must be held'
+        result = self._by_name[name]
+        if (threshold is not None and not result.channels and
+                now - result.timestamp > threshold):
+            # Clean up expired result.
+            self._remove(name)
+            raise utils.CaprotoKeyError(f'{name!r}: stale search result')
+        return result.address
+
+    def get(self, name, *, threshold=constants.STALE_SEARCH_EXPIRATION):
+        '''
+        Get the address of the server found for name.
+
+        Parameters
+        ----------
+        name : str
+        threshold : float or None, optional
+            The age, in seconds, at which results without channels expire.
+            None to ignore the age.
+
+        Raises
+        ------
+        CaprotoKeyError
+            If missing or stale.
+        '''
+        with self._lock:
+            return self._get(name, threshold, time.monotonic())
+
+    def split_cached_results(self, names, *,
+                             threshold=constants.STALE_SEARCH_EXPIRATION):
+        '''
+        Tell which PVs have valid cached addresses, and which do not.
+
+        Returns
+        -------
+        use_cached_search : dict
+            Address to list of names
+        needs_search : list
+            Remaining PVs that need a search attempt
+        '''
+        needs_search = []
+        use_cached_search = collections.defaultdict(list)
+        now = time.monotonic()
+        with self._lock:
+            for name in names:
+                try:
+                    address = self._get(name, threshold, now)
+                except KeyError:
+                    needs_search.append(name)
+                else:
+                    use_cached_search[address].append(name)
+
+        return use_cached_search, needs_search
+
+    def mark_name_found(self, name, address):
+        '{name} was found at {address}; update state'
+        now = time.monotonic()
+        with self._lock:
+            result = self._by_name.get(name)
+            if result is not None and result.address == address:
+                result.timestamp = now
+            else:
+                self._add(name, address, now)
+
+    def mark_channel_created(self, name, address):
+        'Channel was created with {name} at {address}'
+        with self._lock:
+            result = self._by_name.get(name)
+            if result is None or result.address != address:
+                result = self._add(name, address, time.monotonic())
+            result.channels += 1
+
+    def mark_channel_disconnected(self, name, address):
+        '''
+        Channel by name {name} was disconnected from {address}
+
+        The result is removed, such that the name is searched for again.
+        '''
+        with self._lock:
+            result = self._by_name.get(name)
+            if result is not None and result.address == address:
+                self._remove(name)
+
+    def discard(self, name):
+        'Remove the result for name, if any'
+        with self._lock:
+            self._remove(name)
+
+    def invalidate_server(self, address):
+        '''
+        Remove the results for the server at address (e.g., as it may have
+        restarted), except for names with channels on live circuits.
+        '''
+        with self._lock:
+            names = [name for name in self._by_address.get(address, ())
+                     if not self._by_name[name].channels]
+            for name in names:
+                self._remove(name)
+
+    def clear(self):
+        'Remove all results'
+        with self._lock:
+            self._by_name.clear()
+            self._by_address.clear()
 
 
 class SearchResults:
@@ -84,6 +232,9 @@ class SearchResults:
     unanswered_searches : dict
         Holds pending searches
         Maps search_id -> _UnansweredSearch
+
+    scheduler : SearchScheduler
+        When to (re-)send each of the unanswered searches
     '''
 
     def __init__(self):
@@ -97,6 +248,7 @@ class SearchResults:
         self._searches = {}
         self._searches_by_name = {}
         self._unanswered_searches = {}
+        self.scheduler = SearchScheduler()
         self._last_beacon = {}
         self._search_id_counter = ca.ThreadsafeCounter(
             initial_value=random.randint(0, constants.MAX_ID),
@@ -122,10 +274,12 @@ class SearchResults:
     @_locked
     def mark_server_alive(self, address, identifier):
         'Beacon from a server received'
+        now = time.monotonic()
         for name in self.addr_to_names[address]:
-            self.name_to_addrs[name][address] = time.monotonic()
+            entry = self.name_to_addrs[name]
+            if entry.get(address) is not common.VALID_CHANNEL_MARKER:
+                entry[address] = now
 
-        now = time.monotonic()
         if address not in self._last_beacon:
             # We made a new friend!
             self.beacon_log.info("Watching Beacons from %s:%d", *address,
@@ -141,13 +295,21 @@ class SearchResults:
                 # Network misconfiguration, or multiple users of SearchResults?
                 return
 
-            if interval < last_beacon['interval'] / 4:
+            if identifier < last_identifier:
+                # Beacon IDs start over when a server restarts.
+                self.beacon_log.info(
+                    "Beacon ID reset: %s:%d has restarted.", *address,
+                )
+                self.invalidate_server(address)
+                self.new_server_found(address)
+            elif interval < last_beacon['interval'] / 4:
                 # Beacons are arriving *faster*? The server at this address may
                 # have restarted.
                 self.beacon_log.info(
                     "Beacon anomaly: %s:%d may have restarted.", *address,
                     # extra=TODO
                 )
+                self.invalidate_server(address)
                 self.new_server_found(address)
 
         self._last_beacon[address] = {
@@ -163,12 +325,7 @@ class SearchResults:
         Bring all the unanswered searches out of retirement to see if we have a
         new match.
         '''
-        retirement_deadline = (
-            time.monotonic() + common.SEARCH_RETIREMENT_AGE
-        )
-
-        for item in self._unanswered_searches.values():
-            item.retirement_deadline = retirement_deadline
+        self.scheduler.reset()
 
     @property
     @_locked
@@ -193,6 +350,7 @@ class SearchResults:
             cid = self._searches_by_name.pop(name, None)
             if cid is not None:
                 self._unanswered_searches.pop(cid, None)
+                self.scheduler.remove(cid)
 
     def __contains__(self, name):
         return bool(self.name_to_addrs.get(name, {}))
@@ -205,10 +363,25 @@ class SearchResults:
         'Clear all status'
         self.name_to_addrs.clear()
         self.addr_to_names.clear()
+        for cid in self._unanswered_searches:
+            self.scheduler.remove(cid)
         self._unanswered_searches.clear()
         self._searches_by_name.clear()
         self._searches.clear()
 
+    @_locked
+    def invalidate_server(self, addr):
+        '''
+        Server may have restarted; forget its search results, except for
+        names with channels on live circuits.
+        '''
+        names = self.addr_to_names.get(addr, set())
+        for name in list(names):
+            entry = self.name_to_addrs[name]
+            if entry.get(addr) is not common.VALID_CHANNEL_MARKER:
+                entry.pop(addr, None)
+                names.discard(name)
+
     @_locked
     def mark_server_disconnected(self, addr):
         'Server disconnected; update all associated channels'
@@ -269,6 +442,7 @@ class SearchResults:
         first_response = True
         try:
             info = self._unanswered_searches.pop(cid)
+            self.scheduler.remove(cid, answered=True)
         except KeyError:
             first_response = False
             try:
@@ -291,38 +465,35 @@ class SearchResults:
             addresses=list(self.name_to_addrs[name])
         )
 
-    def items_to_retry(self, threshold, resend_deadline):
-        'All search results in need of retrying (if beyond threshold)'
-        with self._lock:
-            items = list(self._unanswered_searches.items())
-
-        if not threshold:
-            return items
-
-        # Skip over searches that haven't gotten any results in
-        # SEARCH_RETIREMENT_AGE.
-        return list(
-            (search_id, it)
-            for search_id, it in items
-            if (it.retirement_deadline > threshold and
-                it.last_sent < resend_deadline)
-        )
+    @_locked
+    def items_to_retry(self, now=None):
+        '''
+        Unanswered searches due to be (re-)sent, as determined by
+        :attr:`scheduler`.
+
+        Each search ID must then be passed back to either
+        ``scheduler.mark_sent`` or ``scheduler.requeue``.
+        '''
+        return [
+            (search_id, self._unanswered_searches[search_id])
+            for search_id in self.scheduler.pop_due(now)
+            if search_id in self._unanswered_searches
+        ]
 
     @_locked
-    def search(self, *names, results_queue, retirement_deadline):
+    def search(self, *names, results_queue):
         'Search for names, adding items to results_queue'
-        # Search requests that are past their retirement deadline with no
-        # results will be searched for less frequently.
+        search_ids = []
         for name in names:
             id_ = self._search_id_counter()
-            item = _UnansweredSearch(name=name,
-                                     results_queue=results_queue,
-                                     last_sent=0,
-                                     retirement_deadline=retirement_deadline)
+            item = _UnansweredSearch(name=name, results_queue=results_queue)
 
             self._unanswered_searches[id_] = item
             self._searches[id_] = item
-            self._searches_by_name[name] = item
+            self._searches_by_name[name] = id_
+            search_ids.append(id_)
+
+        self.scheduler.add(*search_ids)
 
     @_locked
     def split_cached_results(self, names):
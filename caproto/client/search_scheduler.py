@@ -0,0 +1,236 @@
+"""
+Scheduling of (re-)sent SearchRequests, shared by the client implementations.
+
+Each unanswered search backs off on its own: it is sent as soon as it is
+added, then retried after MIN_RETRY_SEARCHES_INTERVAL, with the interval
+doubling up to MAX_RETRY_SEARCHES_INTERVAL. Searches which go unanswered for
+SEARCH_RETIREMENT_AGE are retired, and only retried every
+RETRY_RETIRED_SEARCHES_INTERVAL. Adding searches does not affect the schedule
+of the others; finding a new server (or one which restarted) brings all of
+them back to the initial interval.
+
+Searches are kept in a priority queue keyed on the time they are next due,
+such that only the searches which are due are looked at. The datagrams they
+are sent in are limited by a token bucket, shared by all searches.
+"""
+import heapq
+import threading
+import time
+
+from . import common
+
+__all__ = ('SearchScheduler', 'TokenBucket')
+
+
+class TokenBucket:
+    '''
+    A token bucket rate limiter.
+
+    Parameters
+    ----------
+    rate : float
+        Tokens added per second. Zero (or less) for no limit.
+    capacity : int
+        The maximum number of tokens, i.e., the size of a burst.
+    '''
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = max(capacity, 1)
+        self.tokens = self.capacity
+        self._last = None
+
+    def __repr__(self):
+        return (f'<{self.__class__.__name__} rate={self.rate} '
+                f'capacity={self.capacity} tokens={self.tokens:.1f}>')
+
+    def _refill(self, now):
+        if self._last is None:
+            self._last = now
+        elif now > self._last:
+            self.tokens = min(self.capacity,
+                              self.tokens + (now - self._last) * self.rate)
+            self._last = now
+
+    def acquire(self, now=None):
+        'Take a token if one is available, returning whether one was.'
+        if self.rate <= 0:
+            return True
+        self._refill(time.monotonic() if now is None else now)
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+    def time_until_available(self, now=None):
+        'Time, in seconds, until a token is available'
+        if self.rate <= 0:
+            return 0.0
+        self._refill(time.monotonic() if now is None else now)
+        return max(0.0, (1 - self.tokens) / self.rate)
+
+
+class _ScheduledSearch:
+    __slots__ = ('next_send', 'interval', 'retirement_deadline', 'retired')
+
+    def __init__(self, next_send, retirement_deadline):
+        self.next_send = next_send
+        self.interval = common.MIN_RETRY_SEARCHES_INTERVAL
+        self.retirement_deadline = retirement_deadline
+        self.retired = False
+
+
+class SearchScheduler:
+    '''
+    Thread-safe scheduling of unanswered searches, keyed on search ID.
+
+    Parameters
+    ----------
+    datagram_rate : float, optional
+        Search datagrams per second. Zero for no limit.
+    datagram_burst : int, optional
+        The number of datagrams which may be sent at once.
+
+    Attributes
+    ----------
+    statistics : dict
+        Counts of the searches ``sent`` (including retries), ``answered``, and
+        ``retired``, and of those ``pending``.
+    '''
+
+    def __init__(self, *, datagram_rate=common.SEARCH_DATAGRAM_RATE,
+                 datagram_burst=common.SEARCH_DATAGRAM_BURST):
+        self._lock = threading.Lock()
+        self._searches = {}
+        # (next_send, search_id); entries which no longer match the search
+        # are skipped when popped.
+        self._queue = []
+        self.rate_limit = TokenBucket(datagram_rate, datagram_burst)
+        self.sent = 0
+        self.answered = 0
+        self.retired = 0
+
+    def __len__(self):
+        return len(self._searches)
+
+    def __repr__(self):
+        return (f'<{self.__class__.__name__} pending={len(self._searches)} '
+                f'sent={self.sent} answered={self.answered} '
+                f'retired={self.retired}>')
+
+    @property
+    def statistics(self):
+        return dict(sent=self.sent, answered=self.answered,
+                    retired=self.retired, pending=len(self._searches))
+
+    def _push(self, search_id, search):
+        heapq.heappush(self._queue, (search.next_send, search_id))
+        if len(self._queue) > 2 * len(self._searches) + 64:
+            # Drop the entries left behind by rescheduled searches.
+            self._queue = [(search.next_send, search_id)
+                           for search_id, search in self._searches.items()]
+            heapq.heapify(self._queue)
+
+    def add(self, *search_ids, now=None):
+        'Schedule new searches to be sent right away.'
+        now = time.monotonic() if now is None else now
+        retirement_deadline = now + common.SEARCH_RETIREMENT_AGE
+        with self._lock:
+            for search_id in search_ids:
+                search = _ScheduledSearch(now, retirement_deadline)
+                self._searches[search_id] = search
+                self._push(search_id, search)
+
+    def remove(self, search_id, *, answered=False):
+        'Stop scheduling a search, as it was answered or cancelled.'
+        with self._lock:
+            if self._searches.pop(search_id, None) is not None and answered:
+                self.answered += 1
+
+    def reset(self, now=None):
+        '''
+        Bring all searches back to the initial interval, and out of
+        retirement, e.g., as a new server was found.
+        '''
+        now = time.monotonic() if now is None else now
+        retirement_deadline = now + common.SEARCH_RETIREMENT_AGE
+        with self._lock:
+            for search_id, search in self._searches.items():
+                search.interval = common.MIN_RETRY_SEARCHES_INTERVAL
+                search.retirement_deadline = retirement_deadline
+                search.retired = False
+                if search.next_send > now:
+                    search.next_send = now
+                    self._push(search_id, search)
+
+    def pop_due(self, now=None):
+        '''
+        Get the searches which are due to be sent, in the order they became
+        due.
+
+        Each search must then be passed back to either :meth:`mark_sent` or
+        :meth:`requeue`.
+        '''
+        now = time.monotonic() if now is None else now
+        due = []
+        with self._lock:
+            queue = self._queue
+            while queue and queue[0][0] <= now:
+                next_send, search_id = heapq.heappop(queue)
+                search = self._searches.get(search_id)
+                if search is not None and search.next_send == next_send:
+                    due.append(search_id)
+        return due
+
+    def mark_sent(self, search_ids, now=None):
+        'Searches were sent; schedule their next retry.'
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            for search_id in search_ids:
+                search = self._searches.get(search_id)
+                if search is None:
+                    continue
+                self.sent += 1
+                if now >= search.retirement_deadline:
+                    if not search.retired:
+                        search.retired = True
+                        self.retired += 1
+                    search.interval = common.RETRY_RETIRED_SEARCHES_INTERVAL
+                    search.next_send = now + search.interval
+                else:
+                    search.next_send = now + search.interval
+                    search.interval = min(2 * search.interval,
+                                          common.MAX_RETRY_SEARCHES_INTERVAL)
+                self._push(search_id, search)
+
+    def requeue(self, search_ids):
+        'Searches from pop_due which were not sent; keep them due.'
+        with self._lock:
+            for search_id in search_ids:
+                search = self._searches.get(search_id)
+                if search is not None:
+                    self._push(search_id, search)
+
+    def acquire_datagram(self, now=None):
+        'Whether a datagram of searches may be sent now, consuming a token.'
+        with self._lock:
+            return self.rate_limit.acquire(now)
+
+    def time_until_due(self, now=None):
+        '''
+        Time, in seconds, until searches are due and may be sent, or None if
+        there are no searches.
+        '''
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            queue = self._queue
+            while queue:
+                next_send, search_id = queue[0]
+                search = self._searches.get(search_id)
+                if search is not None and search.next_send == next_send:
+                    break
+                heapq.heappop(queue)
+            else:
+                return None
+            return max(next_send - now,
+                       self.rate_limit.time_until_available(now))
@@ -17,7 +17,7 @@ from .. import ChannelType, __version__, field_types, set_handler
 from .._log import _set_handler_with_logger
 from .._utils import ShowVersionAction
 from ..client.common import GLOBAL_DEFAULT_TIMEOUT
-from ..sync.client import read
+from ..sync.client import read_many
 from .cli_print_formats import (clean_format_args, format_response_data,
                                 format_str_adjust, gen_data_format)
 
@@ -167,15 +167,21 @@ def main():
     if args.wide:
         data_type = 'time'
     try:
-        for pv_name in args.pv_names:
-
-            response = read(pv_name=pv_name,
-                            data_type=data_type,
-                            data_count=args.data_count,
-                            timeout=args.timeout,
-                            priority=args.priority,
-                            force_int_enums=args.n,
-                            repeater=not args.no_repeater)
+        # Search for, connect to, and read all of the PVs together.
+        responses = read_many(args.pv_names,
+                              data_type=data_type,
+                              data_count=args.data_count,
+                              timeout=args.timeout,
+                              priority=args.priority,
+                              force_int_enums=args.n,
+                              repeater=not args.no_repeater,
+                              return_exceptions=True)
+        for pv_name, response in zip(args.pv_names, responses):
+            if isinstance(response, Exception):
+                if args.verbose:
+                    raise response
+                print(response)
+                continue
 
             data_fmt = gen_data_format(args=args, data=response.data)
 
@@ -9,11 +9,11 @@ python3 -m caproto.commandline.repeater ...
 
 For access to the underlying functionality from a Python script or interactive
 Python session, do not import this module; instead import
-caproto.sync.repeater.
+caproto.asyncio.repeater.
 """
 import argparse
 import os
-from ..sync.repeater import run
+from ..asyncio.repeater import run
 from .. import set_handler, __version__
 from .._log import _set_handler_with_logger
 from .._utils import ShowVersionAction
@@ -38,6 +38,12 @@ EPICS_CA_REPEATER_PORT. It defaults to the standard 5065. The current value is
                        help="Verbose mode. (Use -vvv for more.)")
     parser.add_argument('--no-color', action='store_true',
                         help="Suppress ANSI color codes in log messages.")
+    parser.add_argument('--stats-port', type=int, default=None,
+                        help=("Serve repeater statistics as JSON to "
+                              "connections to this TCP port on localhost."))
+    parser.add_argument('--sweep-interval', type=float, default=5.0,
+                        help=("Seconds between checks of which clients are "
+                              "still alive. Default is 5."))
     parser.add_argument('--version', '-V', action='show_version',
                         default=argparse.SUPPRESS,
                         help="Show caproto version and exit.")
@@ -53,7 +59,7 @@ EPICS_CA_REPEATER_PORT. It defaults to the standard 5065. The current value is
             level = 'INFO'
         _set_handler_with_logger(logger_name='caproto.repeater', color=not args.no_color, level=level)
     try:
-        run()
+        run(stats_port=args.stats_port, sweep_interval=args.sweep_interval)
     except BaseException as exc:
         if args.verbose:
             # Show the full traceback.
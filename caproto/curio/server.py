@@ -6,7 +6,8 @@ from curio import socket
 
 import caproto as ca
 
-from .._utils import safe_getsockname
+from .._utils import (SENDMSG_MAX_BUFFERS, SENDMSG_SUPPORTED, coalesce_buffers,
+                      consume_buffers, safe_getsockname)
 from ..server import AsyncLibraryLayer
 from ..server.common import Context as _Context
 from ..server.common import VirtualCircuit as _VirtualCircuit
@@ -81,9 +82,16 @@ class VirtualCircuit(_VirtualCircuit):
 
     async def _send_buffers(self, *buffers):
         """Send ``buffers`` over the wire."""
+        buffers = coalesce_buffers(buffers)
         async with self._send_lock:
-            for buffer in buffers:
-                await self.client.sendall(bytes(buffer))
+            if not SENDMSG_SUPPORTED:
+                await self.client.sendall(b''.join(buffers))
+                return
+
+            while buffers:
+                nbytes = await self.client.sendmsg(
+                    buffers[:SENDMSG_MAX_BUFFERS])
+                buffers = consume_buffers(buffers, nbytes)
 
     async def run(self):
         await self.pending_tasks.spawn(self.command_queue_loop())
@@ -196,6 +204,12 @@ class Context(_Context):
                 await g.spawn(self.broadcast_beacon_loop)
 
                 async_lib = CurioAsyncLayer()
+
+                async def spawn(async_fn, *args):
+                    # As daemons, finished tasks are not kept by the group
+                    await g.spawn(async_fn, *args, daemon=True)
+
+                self._start_scan_scheduler(async_lib, spawn)
                 if startup_hook is not None:
                     self.log.debug('Calling startup hook %r',
                                    startup_hook.__name__)
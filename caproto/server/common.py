@@ -1,13 +1,15 @@
 from __future__ import annotations
 
+import ctypes
 import logging
 import os
 import sys
 import time
 import typing
 import weakref
-from collections import ChainMap, defaultdict, deque, namedtuple
-from typing import DefaultDict, Deque, Tuple
+from collections import ChainMap, OrderedDict, defaultdict, deque, namedtuple
+from collections.abc import Mapping
+from typing import DefaultDict, Deque, Optional, Tuple
 
 import caproto as ca
 from caproto import (CaprotoKeyError, CaprotoNetworkError, CaprotoRuntimeError,
@@ -15,8 +17,11 @@ from caproto import (CaprotoKeyError, CaprotoNetworkError, CaprotoRuntimeError,
                      get_environment_variables)
 
 from .._constants import MAX_UDP_RECV
+from .._data import SubscriptionUpdateBatch
 from .._dbr import DbrTypeBase, _LongStringChannelType
 from .._utils import apply_deadband_filter
+from .scan import ScanScheduler
+from .search_filter import SearchFilter, record_part
 
 if typing.TYPE_CHECKING:
     from .._circuit import ServerChannel, SubscriptionType
@@ -52,6 +57,42 @@ MAX_LATENCY = float(os.environ.get("CAPROTO_SERVER_MAX_LATENCY_SEC", 1.0))
 WRITE_LOCK_TIMEOUT = float(
     os.environ.get("CAPROTO_SERVER_WRITE_LOCK_TIMEOUT_SEC", 0.001)
 )
+# Remember up to this many PV names which are not served here, such that
+# repeated searches for them (e.g., for PVs of other servers on the same subnet)
+# are rejected without parsing the name again.
+UNKNOWN_PV_CACHE_SIZE = int(
+    os.environ.get("CAPROTO_SERVER_UNKNOWN_PV_CACHE_SIZE", 10000)
+)
+# Reject searches for PVs not hosted here using a Bloom filter with this
+# false-positive rate. Set to 0 to disable the filter. The filter must not be
+# used with a pvdb which creates PVs on demand.
+SEARCH_FILTER_ERROR_RATE = float(
+    os.environ.get("CAPROTO_SERVER_SEARCH_FILTER_ERROR_RATE", 0)
+)
+# Pass the values of large arrays to subscribers on the same host by way of
+# shared memory, if requested by the client.
+SHARED_MEMORY = os.environ.get(
+    "CAPROTO_SERVER_SHARED_MEMORY", "y"
+).lower() in ("y", "yes", "true", "1")
+# Values smaller than this (in bytes) are sent over TCP regardless.
+SHARED_MEMORY_MIN_BYTES = int(
+    os.environ.get("CAPROTO_SERVER_SHARED_MEMORY_MIN_BYTES", 2 ** 16)
+)
+# The number of values of each PV which are kept in shared memory. Clients
+# must read each value before this many newer ones have been published.
+SHARED_MEMORY_SLOTS = int(
+    os.environ.get("CAPROTO_SERVER_SHARED_MEMORY_SLOTS", 8)
+)
+# Run the periodic scans of pvproperties in scan classes grouped by period,
+# rather than in a task of their own (see caproto.server.scan).
+SCAN_SCHEDULER = os.environ.get(
+    "CAPROTO_SERVER_SCAN_SCHEDULER", "y"
+).lower() in ("y", "yes", "true", "1")
+# Create the fields of records (pvproperties with ``record=``) when they are
+# first accessed, rather than all of them along with the record.
+LAZY_RECORD_FIELDS = os.environ.get(
+    "CAPROTO_SERVER_LAZY_RECORD_FIELDS", "y"
+).lower() in ("y", "yes", "true", "1")
 
 
 class DisconnectedCircuit(Exception):
@@ -62,10 +103,34 @@ class LoopExit(Exception):
     ...
 
 
+class _BatchMarker:
+    '''
+    Marks the start or the end of a batch of updates in the subscription
+    queue of a circuit. Updates following the start are held back until the
+    end, and are then sent right away, together.
+
+    It stands in for a reference to a command, and so dereferences to itself.
+    '''
+
+    def __init__(self, name):
+        self.name = name
+
+    def __repr__(self):
+        return self.name
+
+    def __call__(self):
+        return self
+
+
+BATCH_START = _BatchMarker('BATCH_START')
+BATCH_END = _BatchMarker('BATCH_END')
+
+
 class Subscription(namedtuple('Subscription',
                               ('mask', 'channel_filter', 'circuit', 'channel',
                                'data_type', 'data_count', 'subscriptionid',
-                               'db_entry'))
+                               'db_entry', 'shared_memory'),
+                              defaults=(False, ))
                    ):
     '''
     An individual subscription from a client
@@ -89,6 +154,8 @@ class Subscription(namedtuple('Subscription',
         The ID of the subscription
     db_entry : ChannelData
         The database entry
+    shared_memory : bool
+        Whether values are to be passed by way of shared memory
     '''
     mask: SubscriptionType
     channel_filter: ChannelFilter
@@ -98,6 +165,7 @@ class Subscription(namedtuple('Subscription',
     data_count: int
     subscriptionid: int
     db_entry: ChannelData
+    shared_memory: bool
 
 
 class SubscriptionSpec(namedtuple('SubscriptionSpec',
@@ -143,6 +211,9 @@ class VirtualCircuit:
         self.context = context
         self.client_hostname = None
         self.client_username = None
+        # Shared memory is only of use to clients on this host.
+        self.shared_memory_allowed = SHARED_MEMORY and ca.is_same_host(
+            self.circuit.address, self.circuit.our_address)
         # The structure of self.subscriptions is:
         # {SubscriptionSpec: deque([Subscription, Subscription, ...]), ...}
         self.subscriptions = defaultdict(deque)
@@ -201,11 +272,12 @@ class VirtualCircuit:
         Receive bytes over TCP and cache them in this circuit's buffer.
         """
         try:
-            bytes_received = await self.client.recv(4096)
+            nbytes = await self.client.recv_into(
+                self.circuit.get_recv_buffer(4096))
         except OSError:
-            bytes_received = []
+            nbytes = 0
 
-        commands, _ = self.circuit.recv(bytes_received)
+        commands, _ = self.circuit.recv_buffer_updated(nbytes)
         for c in commands:
             try:
                 await self.command_queue.put(c)
@@ -220,7 +292,7 @@ class VirtualCircuit:
                                  f"memory.")
                 await self._on_disconnect()
                 raise DisconnectedCircuit()
-        if not bytes_received:
+        if not nbytes:
             await self._on_disconnect()
             raise DisconnectedCircuit()
 
@@ -346,6 +418,8 @@ class VirtualCircuit:
         commands = deque()
         latency_limit = HIGH_LOAD_TIMEOUT
         deadline = 0.0
+        # Whether a batch from write_many has started, but not yet ended.
+        in_batch = False
         while True:
             send_now = False
             commands.clear()
@@ -360,11 +434,16 @@ class VirtualCircuit:
                 # and it should sacrifice some latency in order to batch
                 # requests efficiently.
                 while True:
-                    ref = await self.get_from_sub_queue(timeout=HIGH_LOAD_TIMEOUT)
+                    # The rest of an open batch from write_many is on its way,
+                    # but give up on it if its end was lost to a full queue.
+                    ref = await self.get_from_sub_queue(
+                        timeout=MAX_LATENCY if in_batch else HIGH_LOAD_TIMEOUT
+                    )
                     if ref is None:
                         # We have caught up with the producer. Stop batching,
                         # and optimize for low latency.
                         send_now = True
+                        in_batch = False
                         if commands:
                             # We have accumulated commands while previously in
                             # the "fast producer" regime. Short-circuit and
@@ -380,6 +459,15 @@ class VirtualCircuit:
                         latency_limit = HIGH_LOAD_TIMEOUT
 
                     command = ref()
+                    if command is BATCH_START:
+                        in_batch = True
+                        continue
+                    if command is BATCH_END:
+                        in_batch = False
+                        send_now = True
+                        if commands:
+                            break
+                        continue
                     if command is None:
                         # Quota for this subscription has been exceeded.  This
                         # client is a slow consumer. To avoid letting it get
@@ -405,16 +493,18 @@ class VirtualCircuit:
                         # Set a dealine by which will must send this oldest
                         # command in the batch, effecitvely a limit of latency.
                         deadline = now + latency_limit
-                    elif deadline < now:
+                    elif deadline < now and not in_batch:
                         send_now = True
                     if commands_bytes > SUB_BATCH_THRESH:
-                        send_now = True
+                        # Too large to hold on to, even part way through a
+                        # batch from write_many.
+                        break
                     # Send the batch if we are in low-latency / slow producer
-                    # mode, or if the high-latency deadline has passed, or if
-                    # the batch has reached max size.  But be sure _not_ to
-                    # send it if it is empty (because all the would-be contents
-                    # were expired.)
-                    if commands and send_now:
+                    # mode, or if the high-latency deadline has passed, unless
+                    # a batch from write_many is still open.  But be sure _not_
+                    # to send it if it is empty (because all the would-be
+                    # contents were expired.)
+                    if commands and send_now and not in_batch:
                         break
             except self.TaskCancelled:
                 break
@@ -494,6 +584,12 @@ class VirtualCircuit:
         db_entry = self.context[chan.name]
         return chan, db_entry
 
+    def _use_shared_memory(self, command, data_type):
+        """Whether an EventAddRequest is to be answered by way of shared memory"""
+        return (self.shared_memory_allowed and
+                ca.EventAddFlag.SHARED_MEMORY in command.flags and
+                not isinstance(data_type, _LongStringChannelType))
+
     async def _process_command(self, command):
         '''Process a command from a client, and return the server response'''
         tags = self._tags
@@ -666,7 +762,9 @@ class VirtualCircuit:
                                data_type=read_data_type,
                                data_count=command.data_count,
                                subscriptionid=command.subscriptionid,
-                               db_entry=db_entry)
+                               db_entry=db_entry,
+                               shared_memory=self._use_shared_memory(
+                                   command, read_data_type))
             sub_spec = SubscriptionSpec(
                 db_entry=db_entry,
                 data_type_name=read_data_type.name,
@@ -746,6 +844,46 @@ class VirtualCircuit:
         return to_send
 
 
+def _created_fields(instance):
+    'The fields of a record which were created, keyed on field name'
+    fields = getattr(instance, 'fields', None) or {}
+    # Fields created on demand (see RecordFields) are left alone
+    return getattr(fields, 'created', fields)
+
+
+class _RecordsAndFields(Mapping):
+    '''
+    A read-only view of records and their fields, keyed on PV name.
+
+    Fields which are created on demand are only created when looked up, not
+    when iterating over the names.
+    '''
+
+    def __init__(self, pvdb):
+        self._pvdb = pvdb
+
+    def __getitem__(self, name):
+        try:
+            return self._pvdb[name]
+        except KeyError:
+            ...
+        record, _, field = name.rpartition('.')
+        fields = getattr(self._pvdb[record], 'fields', None)
+        if not field or fields is None:
+            raise KeyError(name)
+        return fields[field]
+
+    def __iter__(self):
+        for name, instance in self._pvdb.items():
+            yield name
+            for field_name in getattr(instance, 'fields', ()):
+                yield f'{name}.{field_name}'
+
+    def __len__(self):
+        return sum(1 + len(getattr(instance, 'fields', ()))
+                   for instance in self._pvdb.values())
+
+
 class Context:
     subscriptions: DefaultDict[SubscriptionSpec, Deque[Subscription]]
 
@@ -768,6 +906,11 @@ class Context:
         # Channel Filter.
         self.last_sync_edge_update = defaultdict(lambda: defaultdict(dict))
         self.last_dead_band = {}
+        # Map ChannelData to the SharedMemoryRing holding its values for
+        # subscribers on this host.
+        self.shared_memory_rings = weakref.WeakKeyDictionary()
+        # The ScanScheduler running the scans of pvproperties, once started
+        self.scan_scheduler = None
         self.beacon_count = 0
 
         self.environ = get_environment_variables()
@@ -784,19 +927,77 @@ class Context:
         ignore_addresses = self.environ['EPICS_CAS_IGNORE_ADDR_LIST']
         self.ignore_addresses = ignore_addresses.split(' ')
 
+        # Map name to ChannelData for every name that can be accessed without
+        # a channel filter, and an LRU set of names known not to exist:
+        self._name_index = {}
+        self._indexed_names = set()
+        # The record parts of the names in the search filter:
+        self._indexed_records = set()
+        self._indexed_pvdb_size = None
+        self._unknown_names = OrderedDict()
+        # Optional prefilter for searches, kept up-to-date with the index:
+        self.search_filter = None
+        if SEARCH_FILTER_ERROR_RATE > 0:
+            self.search_filter = SearchFilter(SEARCH_FILTER_ERROR_RATE)
+        self.rebuild_name_index()
+
     @property
     def pvdb_with_fields(self):
-        'Dynamically generated each time - use sparingly'
-        # TODO is static generation sufficient?
-        pvdb = {}
+        'All records and their fields, keyed on PV name'
+        return _RecordsAndFields(self.pvdb)
+
+    def rebuild_name_index(self):
+        '''
+        Rebuild the index of PV names served.
+
+        Record fields are added to the index as they are looked up, as they
+        may be created on demand. The search filter, if enabled, is updated
+        along with it. This is done automatically when the number of entries
+        in ``pvdb`` changes, as when the pvdb of a PVGroup is added to it
+        after startup, and when a name which the search filter rejected turns
+        out to be in ``pvdb``. It should be called explicitly if entries are
+        replaced in place.
+        '''
+        index = {}
+        # The long-string modifier is valid for string and char data only
+        long_string_types = (ChannelType.STRING, ChannelType.CHAR)
+
+        def add_name(name, instance):
+            index[name] = instance
+            if getattr(instance, 'data_type', None) in long_string_types:
+                index[f'{name}$'] = instance
+
         for name, instance in self.pvdb.items():
-            pvdb[name] = instance
-            if hasattr(instance, 'fields'):
-                # Note that we support PvpropertyData along with ChannelData
-                # instances here (which may not have fields)
-                for field_name, field in instance.fields.items():
-                    pvdb[f'{name}.{field_name}'] = field
-        return pvdb
+            # A trailing '.' is valid, as is '.$'
+            add_name(f'{name}.', instance)
+            if hasattr(instance, 'get_field'):
+                add_name(f'{name}.VAL', instance.get_field('VAL'))
+
+        # Entries in the pvdb itself take precedence:
+        index.update(self.pvdb)
+
+        # Fields share the record part of their names with their record, and
+        # so need not be added to the search filter.
+        names = set(self.pvdb)
+        search_filter = self.search_filter
+        if search_filter is not None:
+            only_added = self._indexed_names <= names
+            if only_added:
+                search_filter.update(names - self._indexed_names)
+            if not only_added or search_filter.full:
+                # PVs were removed or the filter is over capacity
+                search_filter.rebuild(names)
+            self._indexed_records = set(record_part(name) for name in names)
+
+        self._name_index = index
+        self._indexed_names = names
+        self._indexed_pvdb_size = len(self.pvdb)
+        self._unknown_names.clear()
+
+    def _check_name_index(self):
+        'Rebuild the name index if PVs have been added or removed'
+        if len(self.pvdb) != self._indexed_pvdb_size:
+            self.rebuild_name_index()
 
     async def _core_broadcaster_loop(self, udp_sock):
         while True:
@@ -852,46 +1053,93 @@ class Context:
     def __getitem__(self, pvname):
         try:
             return self.pvdb[pvname]
-        except KeyError as ex:
-            try:
-                (rec_field, rec, field, mods) = ca.parse_record_field(pvname)
-            except ValueError:
-                raise ex from None
+        except KeyError:
+            ...
+
+        self._check_name_index()
+        try:
+            return self._name_index[pvname]
+        except KeyError:
+            ...
 
-            if not field and not mods:
-                # No field or modifiers, but a trailing '.' is valid
-                return self.pvdb[rec]
+        if pvname in self._unknown_names:
+            self._unknown_names.move_to_end(pvname)
+            raise CaprotoKeyError(pvname)
 
-        # Without the modifiers, try 'record[.field]'
         try:
-            inst = self.pvdb[rec_field]
+            return self._get_filtered(pvname)
         except KeyError:
-            # Finally, access 'record', see if it has 'field'
-            try:
-                inst = self.pvdb[rec]
-            except KeyError:
-                raise CaprotoKeyError(f'Neither record nor field exists: '
-                                      f'{rec_field}')
+            self._unknown_names[pvname] = None
+            while len(self._unknown_names) > UNKNOWN_PV_CACHE_SIZE:
+                self._unknown_names.popitem(last=False)
+            raise
 
-            try:
-                inst = inst.get_field(field)
-            except (AttributeError, KeyError):
-                raise CaprotoKeyError(f'Neither record nor field exists: '
-                                      f'{rec_field}')
+    def _get_filtered(self, pvname):
+        '''
+        Look up a PV name not covered by the name index: a record field not
+        looked up before, or a name with modifiers
+        '''
+        try:
+            rec_field, _, _, mods = ca.parse_record_field(pvname)
+        except ValueError:
+            raise CaprotoKeyError(pvname) from None
 
-        # Verify the modifiers are usable BEFORE caching rec_field in the pvdb:
-        if ca.RecordModifiers.long_string in (mods or {}):
+        try:
+            inst = self._name_index[rec_field]
+        except KeyError:
+            inst = self._get_field(rec_field)
+        else:
+            if not mods:
+                # Any other name without modifiers would have been found
+                raise CaprotoKeyError(pvname)
+
+        if mods and ca.RecordModifiers.long_string in mods:
             if inst.data_type not in (ChannelType.STRING,
                                       ChannelType.CHAR):
                 raise CaprotoKeyError(
                     f'Long-string modifier not supported with types '
                     f'other than string or char ({inst.data_type})'
                 )
+        return inst
 
-        # Cache record.FIELD for later usage
-        self.pvdb[rec_field] = inst
+    def _get_field(self, rec_field):
+        'Look up a record field, creating it if need be, and index it'
+        # Field names have no '.', though record names may
+        rec, _, field = rec_field.rpartition('.')
+        get_field = getattr(self.pvdb.get(rec), 'get_field', None)
+        if not field or get_field is None:
+            raise CaprotoKeyError(f'Neither record nor field exists: '
+                                  f'{rec_field}')
+        try:
+            inst = get_field(field)
+        except KeyError:
+            raise CaprotoKeyError(f'Neither record nor field exists: '
+                                  f'{rec_field}') from None
+        self._name_index[rec_field] = inst
         return inst
 
+    def _is_hosted(self, pvname):
+        'Check if a PV name in a SearchRequest is hosted by this server'
+        search_filter = self.search_filter
+        if search_filter is not None:
+            self._check_name_index()
+            if not search_filter.check(pvname):
+                if (pvname not in self.pvdb and
+                        record_part(pvname) not in self.pvdb):
+                    return False
+                # Entries of the pvdb were replaced without a rebuild
+                self.rebuild_name_index()
+
+        try:
+            return self[pvname] is not None
+        except KeyError:
+            # Only a name whose record is not hosted at all, rather than an
+            # unknown field of a hosted record, got past the filter wrongly.
+            if (search_filter is not None and
+                    record_part(pvname) not in self._indexed_records):
+                search_filter.record_false_positive()
+            return False
+
     async def _broadcaster_queue_iteration(self, addr, commands):
         self.broadcaster.process_commands(commands)
         if addr in self.ignore_addresses:
@@ -903,13 +1151,7 @@ class Context:
             if isinstance(command, ca.VersionRequest):
                 version_requested = True
             elif isinstance(command, ca.SearchRequest):
-                pv_name = command.name
-                try:
-                    known_pv = self[pv_name] is not None
-                except KeyError:
-                    known_pv = False
-
-                if known_pv:
+                if self._is_hosted(command.name):
                     # responding with an IP of `None` tells client to get IP
                     # address from the datagram.
                     search_replies.append(
@@ -945,14 +1187,30 @@ class Context:
         while True:
             # This queue receives updates that match the db_entry, data_type
             # and mask ("subscription spec") of one or more subscriptions.
-            sub_specs, metadata, values, flags, sub = await self.subscription_queue.get()
-            await self._subscription_queue_iteration(
-                sub_specs,
-                metadata,
-                values,
-                flags,
-                sub,
-            )
+            update = await self.subscription_queue.get()
+            await self._handle_subscription_update(update)
+
+    async def _handle_subscription_update(self, update):
+        """
+        This handles a single queue item from ``subscription_queue``: a
+        SubscriptionUpdate, or a SubscriptionUpdateBatch from ``write_many``.
+        """
+        if not isinstance(update, SubscriptionUpdateBatch):
+            await self._subscription_queue_iteration(*update)
+            return
+
+        # Queue the responses of the whole batch to each circuit between
+        # markers of the start and the end of the batch, such that each
+        # circuit holds them back and then sends them together.
+        circuits = set()
+        for item in update.updates:
+            await self._subscription_queue_iteration(*item, circuits=circuits)
+
+        for circuit in circuits:
+            try:
+                await circuit.subscription_queue.put(BATCH_END)
+            except circuit.QueueFull:
+                ...
 
     async def _subscription_queue_iteration(
         self,
@@ -961,11 +1219,19 @@ class Context:
         values,
         flags: int,
         sub: Subscription,
+        circuits: Optional[set] = None,
     ):
-        """This handles a single queue item from ``subscription_queue``."""
+        """
+        This handles a single SubscriptionUpdate from ``subscription_queue``.
+
+        If ``circuits`` is given, the circuits to which responses were queued
+        are added to it.
+        """
         if sub is None:
             # Broadcast to all Subscriptions for the relevant
-            # SubscriptionSpec(s).
+            # SubscriptionSpec(s). Subscriptions that would receive identical
+            # payloads for this update share a single serialized response.
+            encode_cache = {}
             for sub_spec in sub_specs:
                 for sub in self.subscriptions[sub_spec]:
                     await self._subscription_queue_send(
@@ -974,6 +1240,8 @@ class Context:
                         metadata=metadata,
                         values=values,
                         flags=flags,
+                        encode_cache=encode_cache,
+                        circuits=circuits,
                     )
         else:
             # A specific Subscription has been specified, which means this
@@ -990,6 +1258,7 @@ class Context:
                 metadata=metadata,
                 values=values,
                 flags=flags,
+                circuits=circuits,
             )
 
     async def _subscription_queue_send(
@@ -999,11 +1268,22 @@ class Context:
         metadata: DbrTypeBase,
         values,
         flags: int,
+        encode_cache: Optional[dict] = None,
+        circuits: Optional[set] = None,
     ):
         '''Called on every item from the Context subscription queue
 
         This queue receives updates that match the db_entry, data_type and mask
         ("subscription spec") of one or more subscriptions.
+
+        If ``encode_cache`` is given, it is used to look up (and store) the
+        EventAddResponse already built for this update, keyed on
+        ``(sub_spec, data_type, data_count, shared_memory)``. Only the header
+        is then regenerated for each subscription.
+
+        If ``circuits`` is given, the response is part of a batch:
+        ``BATCH_START`` is queued to the circuit ahead of its first response of
+        the batch, and the circuit is added to ``circuits``.
         '''
         circuit = sub.circuit
 
@@ -1017,11 +1297,6 @@ class Context:
                 to_resend.append(sub)
             return
 
-        # Pack the data and metadata into an EventAddResponse and send it.  We
-        # have to make a new response for each channel because each may have a
-        # different requested data_count.
-        chan = sub.channel
-
         # This is a pass-through if arr is None.
         values = apply_arr_filter(sub_spec.channel_filter.arr, values)
 
@@ -1031,15 +1306,6 @@ class Context:
         if data_count != len(values):
             values = values[:data_count]
 
-        command = chan.subscribe(
-            data=values,
-            metadata=metadata,
-            data_type=sub.data_type,
-            data_count=data_count,
-            subscriptionid=sub.subscriptionid,
-            status=1,
-        )
-
         dbnd = sub.channel_filter.dbnd
         if dbnd is not None:
             deadband_tracking_value = apply_deadband_filter(
@@ -1054,6 +1320,30 @@ class Context:
 
             self.last_dead_band[sub] = deadband_tracking_value
 
+        # Pack the data and metadata into an EventAddResponse and send it.
+        # Each channel may have requested a different data_type and
+        # data_count, but subscriptions which match on those share a payload.
+        cache_key = (sub_spec, sub.data_type, data_count, sub.shared_memory)
+        cached = (encode_cache.get(cache_key) if encode_cache is not None
+                  else None)
+        if cached is not None:
+            command = cached.for_subscription(sub.subscriptionid)
+        else:
+            data = values
+            if sub.shared_memory:
+                data = self._write_shared_memory(
+                    sub_spec, values, sub.data_type, data_count, encode_cache)
+            command = sub.channel.subscribe(
+                data=data,
+                metadata=metadata,
+                data_type=sub.data_type,
+                data_count=data_count,
+                subscriptionid=sub.subscriptionid,
+                status=1,
+            )
+            if encode_cache is not None:
+                encode_cache[cache_key] = command
+
         # Special-case for edge-triggered modes of the sync Channel
         # Filter (before, after, first, last). Only send the first
         # update to each channel.
@@ -1104,6 +1394,9 @@ class Context:
         # This is a queue with the commands from _all_ subscriptions on this
         # circuit.
         try:
+            if circuits is not None and circuit not in circuits:
+                await circuit.subscription_queue.put(BATCH_START)
+                circuits.add(circuit)
             await circuit.subscription_queue.put(weakref.ref(command, destroyed))
         except circuit.QueueFull:
             # We have hit the overall max for subscription backlog.
@@ -1114,6 +1407,41 @@ class Context:
             circuit.subscription_queue.clear()
             circuit.unexpired_updates.clear()
 
+    def _write_shared_memory(self, sub_spec, values, data_type, data_count,
+                             encode_cache=None):
+        """
+        Write values to the SharedMemoryRing of a ChannelData.
+
+        Returns
+        -------
+        data : bytes or values
+            The SharedMemoryReference, or ``values`` if too small to be worth
+            passing by way of shared memory.
+        """
+        native = ca.native_type(data_type)
+        nbytes = (min(data_count, len(values)) *
+                  ctypes.sizeof(ca.DBR_TYPES[native]))
+        if nbytes < SHARED_MEMORY_MIN_BYTES:
+            return values
+
+        # Subscriptions with different metadata share the values.
+        cache_key = ('shared_memory', sub_spec.channel_filter.arr, native,
+                     data_count)
+        if encode_cache is not None and cache_key in encode_cache:
+            return encode_cache[cache_key]
+
+        db_entry = sub_spec.db_entry
+        try:
+            ring = self.shared_memory_rings[db_entry]
+        except KeyError:
+            ring = ca.SharedMemoryRing(SHARED_MEMORY_SLOTS)
+            self.shared_memory_rings[db_entry] = ring
+
+        data = bytes(ring.write(values, data_type, data_count))
+        if encode_cache is not None:
+            encode_cache[cache_key] = data
+        return data
+
     async def broadcast_beacon_loop(self):
         self.log.debug('Will send beacons to %r',
                        [f'{h}:{p}' for h, p in self.beacon_socks.keys()])
@@ -1146,10 +1474,16 @@ class Context:
 
     def _find_hook_methods(self, *attrs):
         """Return a dictionary of (not-None) methods given attribute names."""
+        instances = {}
+        for name, instance in self.pvdb.items():
+            instances[name] = instance
+            # Fields with hooks are created along with their record
+            for field_name, field in _created_fields(instance).items():
+                instances[f'{name}.{field_name}'] = field
         return {
             f"{name}.{attr}": getattr(instance, attr)
             for attr in attrs
-            for name, instance in self.pvdb_with_fields.items()
+            for name, instance in instances.items()
             if getattr(instance, attr, None) is not None
         }
 
@@ -1163,6 +1497,22 @@ class Context:
         'Notify all ChannelData instances of the server shutdown'
         return self._find_hook_methods("server_shutdown")
 
+    def _start_scan_scheduler(self, async_lib, spawn):
+        '''
+        Create the scheduler of periodic scans, for the startup methods.
+
+        Parameters
+        ----------
+        async_lib : AsyncLibraryLayer
+            The layer handed to the startup methods.
+        spawn : async callable
+            ``await spawn(async_fn, *args)`` runs ``async_fn(*args)`` in a new
+            task of the server.
+        '''
+        if SCAN_SCHEDULER:
+            self.scan_scheduler = ScanScheduler(async_lib, spawn)
+            async_lib.scan_scheduler = self.scan_scheduler
+
     async def _bind_tcp_sockets_with_consistent_port_number(self, make_socket):
         # Find a random port number that is free on all self.interfaces,
         # and get a bound TCP socket with that port number on each
@@ -7,21 +7,87 @@ a reference EPICS DBD file.
 
 Any customizations required for fields should be done in this file.
 '''
+import collections.abc
 import logging
-from typing import ClassVar
+from typing import ClassVar, Dict
 
 from ..._data import ChannelData
+from .. import common
 from ..server import PvpropertyStringRO, pvproperty
 from . import base
 from .utils import link_enum_strings, link_parent_attribute, register_record
 
 logger = logging.getLogger(__name__)
 
+# Fields which mirror the alarm of the record, and the alarm attribute of each
+_ALARM_FIELDS = {
+    'alarm_acknowledge_transient': 'must_acknowledge_transient',
+    'alarm_acknowledge_severity': 'severity_to_acknowledge',
+    'alarm_status': 'status',
+    'current_alarm_severity': 'severity',
+}
+
+
+class _FieldAttrPvdb(dict):
+    """
+    The ``attr_pvdb`` of a RecordFieldGroup with lazy fields, creating each
+    field when first looked up.
+    """
+    __slots__ = ('group', )
+
+    def __init__(self, group):
+        super().__init__()
+        self.group = group
+
+    def __missing__(self, attr):
+        return self.group._create_field(attr)
+
+
+class RecordFields(collections.abc.Mapping):
+    """
+    The fields of a record, keyed on field name.
+
+    Fields are created when first looked up. Iterating over the field names
+    does not create them.
+    """
+    __slots__ = ('group', )
+
+    def __init__(self, group):
+        self.group = group
+
+    def __getitem__(self, field):
+        group = self.group
+        return group.attr_pvdb[group._field_attrs()[field]]
+
+    def __contains__(self, field):
+        return field in self.group._field_attrs()
+
+    def __iter__(self):
+        return iter(self.group._field_attrs())
+
+    def __len__(self):
+        return len(self.group._field_attrs())
+
+    @property
+    def created(self) -> Dict[str, ChannelData]:
+        'The fields created so far, keyed on field name'
+        attr_to_pvname = self.group.attr_to_pvname
+        return {attr_to_pvname[attr]: field
+                for attr, field in self.group.attr_pvdb.items()}
+
+    def __repr__(self):
+        return (f'<{self.__class__.__name__} {self.group.name} '
+                f'created={len(self.group.attr_pvdb)}/{len(self)}>')
+
 
 class RecordFieldGroup(base.RecordFieldGroup):
     _base = base.RecordFieldGroup
     _record_type: ClassVar[str]
     parent: ChannelData
+    # The ScanEntry of the scan of the parent, if run by a ScanScheduler
+    _scan_entry = None
+    #: Create fields when they are first accessed
+    lazy_fields: ClassVar[bool] = common.LAZY_RECORD_FIELDS
 
     # Add some handling onto the autogenerated code above:
     record_type = pvproperty(
@@ -34,25 +100,71 @@ class RecordFieldGroup(base.RecordFieldGroup):
     def __init__(self, prefix, **kw):
         super().__init__(prefix, **kw)
 
-        parent = self.parent
-        # set .NAME
-        self.record_name._data['value'] = parent.pvname
-        # set .RTYP
-        self.record_type._data['value'] = self._record_type
-
         # automatic alarm handling
-        self._alarm = parent.alarm
+        self._alarm = self.parent.alarm
         self._alarm.connect(self)
 
+    @classmethod
+    def _field_attrs(cls) -> Dict[str, str]:
+        'Field name to attribute name, shared by all records of the class'
+        try:
+            return cls.__dict__['_field_attrs_']
+        except KeyError:
+            ...
+        field_attrs = {pvprop.pvspec.name: attr
+                       for attr, pvprop in cls._pvs_.items()}
+        cls._field_attrs_ = field_attrs
+        return field_attrs
+
+    def _create_pvdb(self):
+        if not self.lazy_fields or self.prefix or self._subgroups_:
+            super()._create_pvdb()
+            for attr, field in self.attr_pvdb.items():
+                self._initialize_field(attr, field)
+            return
+
+        self.attr_pvdb = _FieldAttrPvdb(self)
+        self.pvdb = RecordFields(self)
+        for attr, pvprop in self._pvs_.items():
+            spec = pvprop.pvspec
+            if (spec.startup, spec.scan, spec.shutdown) != (None, None, None):
+                # Fields with hooks are found by the server at startup
+                self._create_field(attr)
+
+    def _create_field(self, attr):
+        'Create a field, by attribute name, on first access'
+        field = self._pvs_[attr].pvspec.create(self)
+        self.attr_pvdb[attr] = field
+        self.attr_to_pvname[attr] = field.pvname
+        for key, val in self.states.items():
+            field.pre_state_change(key, val)
+            field.post_state_change(key, val)
+        self._initialize_field(attr, field)
+        return field
+
+    def _initialize_field(self, attr, field):
+        'Set the initial value of a field which depends on its record'
+        if attr == 'record_name':
+            field._data['value'] = self.parent.pvname
+        elif attr == 'record_type':
+            field._data['value'] = self._record_type
+        elif attr in _ALARM_FIELDS:
+            # Fields created after the alarm was published must catch up
+            value = getattr(self.parent.alarm, _ALARM_FIELDS[attr])
+            try:
+                field._data['value'] = field.enum_strings[value]
+            except (IndexError, TypeError):
+                ...
+
     async def publish(self, flags):
         # if SubscriptionType.DBE_ALARM in flags:
         # TODO this needs tweaking - proof of concept at the moment
-        await self.alarm_acknowledge_transient.write(
-            self._alarm.must_acknowledge_transient)
-        await self.alarm_acknowledge_severity.write(
-            self._alarm.severity_to_acknowledge)
-        await self.alarm_status.write(self._alarm.status)
-        await self.current_alarm_severity.write(self._alarm.severity)
+        # Fields which were not created yet are initialized from the alarm
+        # when they are.
+        for attr, alarm_attr in _ALARM_FIELDS.items():
+            field = self.attr_pvdb.get(attr)
+            if field is not None:
+                await field.write(getattr(self._alarm, alarm_attr))
 
     @_base.scan_rate.putter
     async def scan_rate(self, instance, value):
@@ -64,6 +176,9 @@ class RecordFieldGroup(base.RecordFieldGroup):
         else:
             self._scan_rate_sec = float(scan_string.split(' ')[0])
 
+        if self._scan_entry is not None:
+            await self._scan_entry.reschedule(self._scan_rate_sec)
+
         if hasattr(self.parent, 'scan_rate'):
             self.parent.scan_rate = self._scan_rate_sec
 
@@ -0,0 +1,283 @@
+"""
+A scheduler for the periodic scans of pvproperties.
+
+Rather than each scanned pvproperty sleeping in a task of its own, scans are
+registered with the :class:`ScanScheduler` of the server and grouped by
+period into scan classes, much like the periodic scan threads of an EPICS
+IOC. Each scan class keeps time for all of its scans in a single task of the
+server, and starts a run of each of them in a task of its own on each tick,
+such that a scan which awaits something (e.g., I/O or a sleep) does not hold
+up the others. A scan whose previous run is still in flight is skipped for
+the tick, and counted as skipped. A scan class with no scans has no task.
+
+Ticks are aligned to a grid of multiples of the period, shared by all scan
+classes, and do not drift: the next tick is due one period after the previous
+one was due, regardless of when it actually started. When a tick starts a
+whole period or more late, the ticks that were missed are skipped and counted
+as overruns, realigning the scan class to the grid.
+
+Passive scans (a period of zero, e.g., a ``.SCAN`` field of "Passive") are not
+run at all, rather than polling for a change of period. A scan is moved to
+another scan class as soon as its period is changed by way of
+:meth:`ScanEntry.reschedule`.
+
+The scheduler is used by :func:`caproto.server.scan_wrapper` unless
+``CAPROTO_SERVER_SCAN_SCHEDULER`` is set to "no".
+"""
+import logging
+import math
+import time
+import weakref
+
+__all__ = ('ScanScheduler', 'ScanEntry', 'ScanClass', 'get_scan_statistics')
+
+logger = logging.getLogger(__name__)
+
+# All schedulers in use in this process, for reporting
+_active_schedulers = weakref.WeakSet()
+
+
+class ScanClass:
+    '''
+    The scans sharing a period, and statistics on running them.
+
+    Parameters
+    ----------
+    period : float
+        The period of the scans, in seconds.
+    '''
+
+    def __init__(self, period):
+        self.period = period
+        # An ordered set of ScanEntry, run in the order they were added
+        self.entries = {}
+        self.running = False
+        # Statistics:
+        self.ticks = 0
+        self.overruns = 0
+        self.skipped = 0
+        self.max_jitter = 0.0
+        self.total_jitter = 0.0
+
+    def __repr__(self):
+        return (f'<{self.__class__.__name__} period={self.period} '
+                f'scans={len(self.entries)} ticks={self.ticks} '
+                f'overruns={self.overruns} skipped={self.skipped}>')
+
+    @property
+    def statistics(self):
+        '''
+        Statistics on the scan class.
+
+        Returns
+        -------
+        stats : dict
+            With keys ``period``, ``scans``, ``ticks``, ``overruns`` (the
+            number of ticks missed as the scan class started them a period or
+            more late), ``skipped`` (the number of runs of scans skipped as
+            their previous run was still in flight) and ``max_jitter`` and
+            ``mean_jitter``, the lateness of the start of ticks in seconds.
+        '''
+        return dict(
+            period=self.period,
+            scans=len(self.entries),
+            ticks=self.ticks,
+            overruns=self.overruns,
+            skipped=self.skipped,
+            max_jitter=self.max_jitter,
+            mean_jitter=(self.total_jitter / self.ticks
+                         if self.ticks else 0.0),
+        )
+
+
+class ScanEntry:
+    '''
+    A scan registered with a :class:`ScanScheduler`.
+
+    Parameters
+    ----------
+    scheduler : ScanScheduler
+    callback : async callable
+        Called without arguments on each tick of the scan class.
+    name : str, optional
+        The name of the scan, for logging.
+    '''
+
+    def __init__(self, scheduler, callback, *, name=None):
+        self.scheduler = scheduler
+        self.callback = callback
+        self.name = name
+        self.scan_class = None
+        # Whether a run is in flight
+        self.running = False
+        # The number of ticks on which the scan was not run, as its previous
+        # run was still in flight
+        self.skipped = 0
+
+    def __repr__(self):
+        return (f'<{self.__class__.__name__} name={self.name!r} '
+                f'period={self.period}>')
+
+    @property
+    def period(self):
+        'The period of the scan, or None if it is not being run'
+        if self.scan_class is None:
+            return None
+        return self.scan_class.period
+
+    async def reschedule(self, period):
+        '''
+        Move the scan to the scan class of ``period``.
+
+        A ``period`` of None or zero (or less) stops the scan from being run
+        until rescheduled.
+        '''
+        if period is not None and period <= 0:
+            period = None
+        if period == self.period:
+            return
+
+        self.cancel()
+        if period is not None:
+            await self.scheduler._add_to_scan_class(self, period)
+
+    def cancel(self):
+        'Stop running the scan, until rescheduled.'
+        if self.scan_class is not None:
+            self.scan_class.entries.pop(self, None)
+            self.scan_class = None
+
+
+class ScanScheduler:
+    '''
+    Runs the periodic scans of a server, grouped by period.
+
+    Parameters
+    ----------
+    async_lib : AsyncLibraryLayer
+        The async library layer of the server.
+    spawn : async callable
+        ``await spawn(async_fn, *args)`` runs ``async_fn(*args)`` in a new
+        task of the server.
+    '''
+
+    def __init__(self, async_lib, spawn):
+        self.async_lib = async_lib
+        self._spawn = spawn
+        # period -> ScanClass; scan classes are kept for their statistics
+        self.scan_classes = {}
+        _active_schedulers.add(self)
+
+    def __repr__(self):
+        return (f'<{self.__class__.__name__} '
+                f'periods={sorted(self.scan_classes)}>')
+
+    async def add(self, callback, period, *, name=None):
+        '''
+        Run ``callback`` every ``period`` seconds.
+
+        Parameters
+        ----------
+        callback : async callable
+            Called without arguments on each tick. The scan stops if it raises.
+        period : float or None
+            The period. None or zero registers the scan without running it.
+        name : str, optional
+            The name of the scan, for logging.
+
+        Returns
+        -------
+        entry : ScanEntry
+            For rescheduling or cancelling the scan.
+        '''
+        entry = ScanEntry(self, callback, name=name)
+        await entry.reschedule(period)
+        return entry
+
+    async def _add_to_scan_class(self, entry, period):
+        try:
+            scan_class = self.scan_classes[period]
+        except KeyError:
+            scan_class = self.scan_classes[period] = ScanClass(period)
+
+        scan_class.entries[entry] = None
+        entry.scan_class = scan_class
+        if not scan_class.running:
+            scan_class.running = True
+            await self._spawn(self._run_scan_class, scan_class)
+
+    async def _run_scan_class(self, scan_class):
+        sleep = self.async_lib.library.sleep
+        period = scan_class.period
+        # The first tick on the grid of multiples of the period
+        next_tick = math.ceil(time.monotonic() / period) * period
+        try:
+            while scan_class.entries:
+                delay = next_tick - time.monotonic()
+                if delay > 0:
+                    await sleep(delay)
+                    if not scan_class.entries:
+                        break
+
+                now = time.monotonic()
+                missed = int((now - next_tick) // period)
+                if missed > 0:
+                    # Skip to the latest tick due, back on the grid
+                    scan_class.overruns += missed
+                    next_tick += missed * period
+
+                jitter = max(now - next_tick, 0.0)
+                scan_class.ticks += 1
+                scan_class.total_jitter += jitter
+                scan_class.max_jitter = max(scan_class.max_jitter, jitter)
+
+                for entry in list(scan_class.entries):
+                    if entry.scan_class is not scan_class:
+                        # Rescheduled while the runs of this tick started
+                        continue
+                    if entry.running:
+                        entry.skipped += 1
+                        scan_class.skipped += 1
+                        continue
+                    entry.running = True
+                    await self._spawn(self._run_entry, entry)
+
+                next_tick += period
+        finally:
+            scan_class.running = False
+
+    async def _run_entry(self, entry):
+        try:
+            await entry.callback()
+        except Exception:
+            logger.exception('Scan %r failed; it will no longer be run',
+                             entry)
+            entry.cancel()
+        finally:
+            entry.running = False
+
+    def get_statistics(self):
+        '''
+        Get statistics on each scan class.
+
+        Returns
+        -------
+        stats : list of dict
+            See :attr:`ScanClass.statistics`, sorted by period.
+        '''
+        return [self.scan_classes[period].statistics
+                for period in sorted(self.scan_classes)]
+
+
+def get_scan_statistics():
+    '''
+    Get statistics on the scan classes of all schedulers in this process.
+
+    Returns
+    -------
+    stats : list of dict
+        See :attr:`ScanClass.statistics`.
+    '''
+    return [stats
+            for scheduler in list(_active_schedulers)
+            for stats in scheduler.get_statistics()]
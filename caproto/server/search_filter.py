@@ -0,0 +1,187 @@
+"""
+A probabilistic prefilter for names in UDP SearchRequests.
+
+Servers on a busy network see many searches for PVs hosted elsewhere. A Bloom
+filter over the names hosted by a server rejects nearly all of those without
+parsing the name or consulting the PV database. Names passing the filter
+still go through the full lookup, so the filter never causes a hosted PV to
+go unanswered; its false positives only cost that lookup.
+
+The filter holds the *record* part of hosted names (everything before the
+first ``.``). As every record field, modifier, and channel filter of a
+hosted PV shares that prefix, this covers all of them with one entry per
+record.
+
+The server updates the filter as the number of entries in its PV database
+changes. Entries replaced in place are picked up when a search for one of
+them is rejected and the name is then found in the database, at the cost of
+a rebuild; calling ``rebuild_name_index`` after such changes avoids that.
+
+The filter is enabled by setting ``CAPROTO_SERVER_SEARCH_FILTER_ERROR_RATE``
+to the target false-positive rate, e.g., ``0.01``. It must not be used with
+a PV database that creates PVs on demand for arbitrary names.
+"""
+import math
+import weakref
+
+from .. import CaprotoValueError
+
+__all__ = ('SearchFilter', 'get_search_filter_statistics')
+
+# All filters in use in this process, for reporting by way of the stats PVs
+_active_filters = weakref.WeakSet()
+
+
+def record_part(name):
+    'The part of a PV name before the first "."'
+    return name.split('.', 1)[0]
+
+
+class SearchFilter:
+    '''
+    A Bloom filter over the record names hosted by a server.
+
+    Parameters
+    ----------
+    error_rate : float
+        The target probability of a name not in the filter passing it.
+    capacity : int, optional
+        The number of names to size the filter for initially. The filter is
+        resized by :meth:`rebuild`.
+    '''
+
+    def __init__(self, error_rate, capacity=1):
+        if not 0 < error_rate < 1:
+            raise CaprotoValueError(f'Invalid error rate: {error_rate}')
+
+        self.error_rate = error_rate
+        self._allocate(capacity)
+        # Statistics on searches:
+        self.checks = 0
+        self.rejected = 0
+        self.false_positives = 0
+        _active_filters.add(self)
+
+    def _allocate(self, capacity):
+        'Clear the filter, sizing it for ``capacity`` names'
+        self.capacity = max(int(capacity), 1)
+        # Optimal number of bits and hashes for the capacity and error rate:
+        self.num_bits = max(
+            int(math.ceil(-self.capacity * math.log(self.error_rate) /
+                          math.log(2) ** 2)),
+            8
+        )
+        self.num_hashes = max(
+            int(round(self.num_bits / self.capacity * math.log(2))), 1
+        )
+        self._bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+
+    def rebuild(self, names):
+        '''
+        Clear the filter and add the record part of each of ``names``.
+
+        The filter is resized with room to spare for names added later by way
+        of :meth:`update`. Statistics are retained.
+        '''
+        records = set(record_part(name) for name in names)
+        self._allocate(2 * len(records))
+        self.update(records)
+
+    def __repr__(self):
+        return (f'<{self.__class__.__name__} count={self.count} '
+                f'capacity={self.capacity} num_bits={self.num_bits} '
+                f'num_hashes={self.num_hashes}>')
+
+    def _bit_indices(self, record):
+        # Double hashing on the (cached) hash of the string, split in two:
+        h = hash(record)
+        h1 = h & 0xFFFFFFFF
+        h2 = ((h >> 32) & 0xFFFFFFFF) | 1
+        num_bits = self.num_bits
+        return [(h1 + i * h2) % num_bits for i in range(self.num_hashes)]
+
+    def add(self, name):
+        'Add the record part of ``name`` to the filter.'
+        bits = self._bits
+        added = False
+        for idx in self._bit_indices(record_part(name)):
+            mask = 1 << (idx & 7)
+            if not bits[idx >> 3] & mask:
+                bits[idx >> 3] |= mask
+                added = True
+        # Names already (seemingly) present do not count towards capacity
+        if added:
+            self.count += 1
+
+    def update(self, names):
+        'Add the record part of each of ``names`` to the filter.'
+        for name in names:
+            self.add(name)
+
+    def __contains__(self, name):
+        bits = self._bits
+        return all(bits[idx >> 3] & (1 << (idx & 7))
+                   for idx in self._bit_indices(record_part(name)))
+
+    @property
+    def full(self):
+        'Whether more names than the filter is sized for have been added'
+        return self.count > self.capacity
+
+    def check(self, name):
+        '''
+        Check a searched-for name, keeping statistics on the result.
+
+        Returns
+        -------
+        maybe_hosted : bool
+            False if the name is definitely not hosted.
+        '''
+        self.checks += 1
+        if name in self:
+            return True
+        self.rejected += 1
+        return False
+
+    def record_false_positive(self):
+        'Note that a name which passed :meth:`check` was not hosted.'
+        self.false_positives += 1
+
+    @property
+    def false_positive_rate(self):
+        'The observed fraction of names not hosted which passed the filter'
+        not_hosted = self.false_positives + self.rejected
+        if not not_hosted:
+            return 0.0
+        return self.false_positives / not_hosted
+
+    @property
+    def expected_false_positive_rate(self):
+        'The false positive rate expected given the number of names added'
+        return (1 - math.exp(-self.num_hashes * self.count /
+                             self.num_bits)) ** self.num_hashes
+
+
+def get_search_filter_statistics():
+    '''
+    Get statistics on the search filters in use in this process.
+
+    Returns
+    -------
+    stats : dict
+        With keys ``checks``, ``rejected``, ``false_positives`` summed over
+        all filters and the overall ``false_positive_rate``.
+    '''
+    filters = list(_active_filters)
+    checks = sum(filt.checks for filt in filters)
+    rejected = sum(filt.rejected for filt in filters)
+    false_positives = sum(filt.false_positives for filt in filters)
+    not_hosted = rejected + false_positives
+    return dict(
+        checks=checks,
+        rejected=rejected,
+        false_positives=false_positives,
+        false_positive_rate=(false_positives / not_hosted
+                             if not_hosted else 0.0),
+    )
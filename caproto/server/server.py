@@ -20,7 +20,7 @@ import typing
 from collections import OrderedDict, defaultdict, namedtuple
 from types import MethodType
 from typing import (Any, Callable, ClassVar, Dict, Generator, Generic, List,
-                    Optional, Tuple, Type, TypeVar, Union, cast)
+                    Mapping, Optional, Tuple, Type, TypeVar, Union, cast)
 
 from caproto._log import _set_handler_with_logger, set_handler
 
@@ -29,7 +29,7 @@ from .. import (AccessRights, AlarmSeverity, AlarmStatus,
                 CaprotoValueError, ChannelAlarm, ChannelByte, ChannelChar,
                 ChannelData, ChannelDouble, ChannelEnum, ChannelFloat,
                 ChannelInteger, ChannelShort, ChannelString, ChannelType,
-                __version__, _constants, get_server_address_list)
+                __version__, _constants, get_server_address_list, write_many)
 from .._backend import backend
 from .typing import (AinitHook, AsyncLibraryLayer, BoundGetter, BoundPutter,
                      BoundScan, BoundShutdown, BoundStartup, Getter, Putter,
@@ -140,7 +140,7 @@ class PvpropertyData(Generic[T_RecordFields], ChannelData):
     """
 
     field_inst: T_RecordFields
-    fields: Dict[str, ChannelData]
+    fields: Mapping[str, ChannelData]
     getter: Optional[BoundGetter]
     group: Optional[PVGroup]
     log: logging.Logger
@@ -369,7 +369,7 @@ class PvpropertyData(Generic[T_RecordFields], ChannelData):
 
     def get_field(self, field: str) -> ChannelData:
         """
-        Get a field by name.
+        Get a field by name, creating it if it was not accessed before.
 
         Parameters
         ----------
@@ -816,6 +816,15 @@ def scan_wrapper(
     -------
     wrapped : callable
         The wrapped ``scan`` function.
+
+    Notes
+    -----
+    If the server provides a scheduler (``async_lib.scan_scheduler``, unless
+    ``CAPROTO_SERVER_SCAN_SCHEDULER`` is disabled), scans with
+    ``subtract_elapsed`` are run by it on the ticks of all scans of the same
+    period, which do not drift. A run is skipped if the previous one is still
+    in flight. Passive scans are then not run at all until the .SCAN field is
+    changed. Otherwise, each scan sleeps in a task of its own.
     """
     async def call_scan_function(group, prop, async_lib):
         try:
@@ -846,6 +855,18 @@ def scan_wrapper(
                 prop.field_inst._scan_rate_sec = period
                 # TODO: update .SCAN to reflect this number
 
+        scheduler = getattr(async_lib, 'scan_scheduler', None)
+        if scheduler is not None and subtract_elapsed:
+            entry = await scheduler.add(
+                functools.partial(call_scan_function, group, prop, async_lib),
+                prop.field_inst.scan_rate_sec if use_scan_field else period,
+                name=prop.pvname,
+            )
+            if use_scan_field:
+                # Rescheduled by the .SCAN putter
+                prop.field_inst._scan_entry = entry
+            return
+
         sleep = async_lib.library.sleep
         while True:
             t0 = time.monotonic()
@@ -2074,6 +2095,36 @@ class PVGroup(metaclass=PVGroupMeta):
         self.log.debug('group_write: %s = %s', instance.pvspec.attr, value)
         return value
 
+    async def write_many(
+        self,
+        values: Dict[Union[str, ChannelData], Any],
+        *,
+        timestamp: Optional[float] = None,
+        flags: int = 0,
+    ):
+        """
+        Write the values of many pvproperties at once, as of one timestamp.
+
+        Subscribers are sent the updates of all of the values together. See
+        :func:`caproto.write_many`.
+
+        Parameters
+        ----------
+        values : dict
+            Maps pvproperty instances, or their attribute names (as in
+            ``attr_pvdb``), to their new values.
+        timestamp : float, optional
+            The timestamp of all of the values. Defaults to ``time.time()``.
+        flags : SubscriptionType or int, optional
+            The flags for subscribers.
+        """
+        await write_many(
+            {(self.attr_pvdb[key] if isinstance(key, str) else key): value
+             for key, value in values.items()},
+            timestamp=timestamp,
+            flags=flags,
+        )
+
 
 class _StateUpdateContext:
     def __init__(self, pv_group: PVGroup, state, value):
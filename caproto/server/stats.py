@@ -14,6 +14,7 @@ from typing import List, Optional
 from .. import ChannelType, __version__
 from . import PVGroup, SubGroup, pvproperty
 from .autosave import autosaved
+from .search_filter import get_search_filter_statistics
 
 try:
     import psutil
@@ -375,6 +376,25 @@ class PeriodicStatusHelper(PVGroup):
         doc='Number of threads in use',
     )
 
+    search_filter_rejected = pvproperty(
+        value=0,
+        name='SEARCH_FILT_REJ',
+        record='longin',
+        read_only=True,
+        doc='Searches rejected by the search filter',
+    )
+
+    search_filter_fp_rate = pvproperty(
+        value=0.0,
+        name='SEARCH_FILT_FP',
+        record='ai',
+        lower_ctrl_limit=0.0,
+        upper_ctrl_limit=100.0,
+        units='%',
+        read_only=True,
+        doc='Searches for unknown PVs passing the search filter',
+    )
+
     update_period = pvproperty(
         value=15.0,
         name='UPD_TIME',
@@ -416,6 +436,14 @@ class PeriodicStatusHelper(PVGroup):
 
         await self.num_threads.write(value=threading.active_count())
 
+        search_stats = get_search_filter_statistics()
+        await self.search_filter_rejected.write(
+            value=search_stats['rejected'] % (2 ** 31)
+        )
+        await self.search_filter_fp_rate.write(
+            value=100.0 * search_stats['false_positive_rate']
+        )
+
         # Uptime since our startup method was first called:
         elapsed = datetime.datetime.now() - self._startup_time
         await self.uptime.write(value=elapsed.total_seconds())
@@ -5,6 +5,7 @@ import typing
 from typing import Any, Optional, Protocol, Type, TypeVar
 
 if typing.TYPE_CHECKING:
+    from .scan import ScanScheduler
     from .server import PVGroup
 
 
@@ -64,6 +65,8 @@ class AsyncLibraryLayer(abc.ABC):
     Event: Type[_AsyncEvent]
     ThreadsafeQueue: Type[_AsyncQueue]
     library: _AsyncLibrary
+    #: Runs the periodic scans of pvproperties, if set by the server
+    scan_scheduler: Optional[ScanScheduler] = None
 
     async def sleep(self, seconds: float) -> None:
         """Sleep for ``seconds`` seconds."""
@@ -11,18 +11,20 @@ import socket
 import threading  # just to make callback processing thread-safe
 import time
 import weakref
+from collections import defaultdict
 
 import caproto as ca
 
+from .._constants import SEARCH_MAX_DATAGRAM_BYTES
 from .._dbr import ChannelType, SubscriptionType, field_types, native_type
 from .._utils import (CaprotoError, CaprotoTimeoutError, ErrorResponseReceived,
-                      adapt_old_callback_signature, get_environment_variables,
-                      safe_getsockname)
+                      adapt_old_callback_signature, batch_requests,
+                      get_environment_variables, safe_getsockname)
 from ..client import common
 from .repeater import spawn_repeater
 
 __all__ = ('read', 'write', 'subscribe', 'block', 'interrupt',
-           'read_write_read')
+           'read_write_read', 'read_many', 'write_many')
 logger = logging.getLogger('caproto.ctx')
 
 # Make a dict to hold our tcp sockets.
@@ -43,14 +45,84 @@ def send(circuit, command, pv_name=None):
 
 
 def recv(circuit):
-    bytes_received = sockets[circuit].recv(4096)
-    commands, _ = circuit.recv(bytes_received)
+    nbytes = sockets[circuit].recv_into(circuit.get_recv_buffer(4096))
+    commands, _ = circuit.recv_buffer_updated(nbytes)
     for c in commands:
         circuit.process_command(c)
     return commands
 
 
-def search(pv_name, udp_sock, timeout, *, max_retries=2):
+def _send_many(circuit, commands):
+    'Send many commands to a circuit, together'
+    buffers_to_send = circuit.send(*commands)
+    sockets[circuit].sendall(b"".join(buffers_to_send))
+
+
+def _collect(circuits, handle, deadline):
+    """
+    Receive from many circuits in one selector loop.
+
+    ``handle(circuit, command)`` is called with each command received, and
+    returns whether more are awaited from that circuit. Returns the circuits
+    still awaiting commands at the deadline.
+    """
+    waiting = set(circuits)
+    sock_to_circuit = {sockets[circuit]: circuit for circuit in waiting}
+    selector = selectors.DefaultSelector()
+    try:
+        for sock in sock_to_circuit:
+            selector.register(sock, selectors.EVENT_READ)
+        while waiting:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            for selector_key, _ in selector.select(timeout=remaining):
+                sock = selector_key.fileobj
+                circuit = sock_to_circuit[sock]
+                try:
+                    commands = recv(circuit)
+                except OSError:
+                    commands = [ca.DISCONNECTED]
+                tags = {'direction': '<<<---',
+                        'our_address': circuit.our_address,
+                        'their_address': circuit.address}
+                for command in commands:
+                    if isinstance(command, ca.Message):
+                        tags['bytesize'] = len(command)
+                        logger.debug("%r", command, extra=tags)
+                    if not handle(circuit, command):
+                        waiting.discard(circuit)
+                        selector.unregister(sock)
+                        break
+    finally:
+        selector.close()
+    return waiting
+
+
+def search_many(pv_names, udp_sock, timeout, *, max_retries=2):
+    """
+    Search for many PVs at once.
+
+    The SearchRequests are packed into as few datagrams as possible, and those
+    still unanswered are re-sent up to ``max_retries`` times.
+
+    Parameters
+    ----------
+    pv_names : iterable of str
+        The PV names to search for
+    udp_sock : socket.socket
+        A bound UDP socket
+    timeout : float
+        Seconds to wait for all of the responses
+    max_retries : int, optional
+        The number of times to re-send unanswered searches
+
+    Returns
+    -------
+    addresses : dict
+        Maps each PV name found within the timeout to the address of its
+        server. Those not found are left out.
+    """
     # Set Broadcaster log level to match our logger.
     b = ca.Broadcaster(our_role=ca.CLIENT)
     b.client_address = safe_getsockname(udp_sock)
@@ -71,54 +143,57 @@ def search(pv_name, udp_sock, timeout, *, max_retries=2):
         raise ca.CaprotoNetworkError(
             f"Failed to send to {local_address}:{repeater_port}") from exc
 
-    logger.debug("Searching for %r....", pv_name)
-    search_cid = random.randint(0, 65535)
-    commands = (
-        ca.VersionRequest(0, ca.DEFAULT_PROTOCOL_VERSION),
-        ca.SearchRequest(pv_name, search_cid, ca.DEFAULT_PROTOCOL_VERSION),
-    )
-    bytes_to_send = b.send(*commands)
+    # search cid -> PV name, for the searches not yet answered
+    first_cid = random.randint(0, 65535)
+    unanswered = dict(enumerate(dict.fromkeys(pv_names), first_cid))
+    logger.debug("Searching for %d PV(s)....", len(unanswered))
+    version_req = ca.VersionRequest(0, ca.DEFAULT_PROTOCOL_VERSION)
+    max_batch_bytes = SEARCH_MAX_DATAGRAM_BYTES - len(version_req)
     tags = {'role': 'CLIENT',
             'our_address': b.client_address,
             'direction': '--->>>'}
 
-    def send_search():
-        for dest in client_address_list:
-            tags['their_address'] = dest
-            b.log.debug(
-                '%d commands %dB',
-                len(commands), len(bytes_to_send), extra=tags)
-            try:
-                udp_sock.sendto(bytes_to_send, dest)
-            except OSError as exc:
-                host, port = dest
-                raise ca.CaprotoNetworkError(f"Failed to send to {host}:{port}") from exc
-
-    def check_timeout():
+    def send_searches():
+        requests = [ca.SearchRequest(pv_name, cid, ca.DEFAULT_PROTOCOL_VERSION)
+                    for cid, pv_name in unanswered.items()]
+        for batch in batch_requests(requests, max_batch_bytes):
+            commands = (version_req, *batch)
+            bytes_to_send = b.send(*commands)
+            for dest in client_address_list:
+                tags['their_address'] = dest
+                b.log.debug(
+                    '%d commands %dB',
+                    len(commands), len(bytes_to_send), extra=tags)
+                try:
+                    udp_sock.sendto(bytes_to_send, dest)
+                except OSError as exc:
+                    host, port = dest
+                    raise ca.CaprotoNetworkError(f"Failed to send to {host}:{port}") from exc
+
+    def timed_out():
         nonlocal retry_at
 
+        if time.monotonic() - t > timeout:
+            return True
+
         if time.monotonic() >= retry_at:
-            send_search()
+            send_searches()
             retry_at = time.monotonic() + retry_timeout
-
-        if time.monotonic() - t > timeout:
-            raise CaprotoTimeoutError(f"Timed out while awaiting a response "
-                                      f"from the search for {pv_name!r}. Search "
-                                      f"requests were sent to this address list: "
-                                      f"{ca.get_address_list()}.")
+        return False
 
     # Initial search attempt
-    send_search()
+    send_searches()
 
-    # Await a search response, and keep track of registration status
+    # Await the search responses, and keep track of registration status
     retry_timeout = timeout / max((max_retries, 1))
     t = time.monotonic()
     retry_at = t + retry_timeout
 
+    addresses = {}
     try:
         orig_timeout = udp_sock.gettimeout()
         udp_sock.settimeout(retry_timeout)
-        while True:
+        while unanswered:
             try:
                 bytes_received, address = udp_sock.recvfrom(ca.MAX_UDP_RECV)
             except ConnectionResetError as ex:
@@ -128,27 +203,45 @@ def search(pv_name, udp_sock, timeout, *, max_retries=2):
                 #
                 # https://docs.microsoft.com/en-us/windows/win32/api/winsock/nf-winsock-recvfrom
                 logger.debug('Connection reset, retrying: %s', ex)
-                check_timeout()
+                if timed_out():
+                    break
                 continue
             except socket.timeout:
-                check_timeout()
+                if timed_out():
+                    break
                 continue
 
-            check_timeout()
-
             commands = b.recv(bytes_received, address)
             b.process_commands(commands)
             for command in commands:
-                if isinstance(command, ca.SearchResponse) and command.cid == search_cid:
-                    address = ca.extract_address(command)
-                    logger.debug('Found %r at %s:%d', pv_name, *address)
-                    return address
-            else:
-                # None of the commands we have seen are a reply to our request.
-                # Receive more data.
-                continue
+                if isinstance(command, ca.SearchResponse):
+                    pv_name = unanswered.pop(command.cid, None)
+                    if pv_name is not None:
+                        address = ca.extract_address(command)
+                        logger.debug('Found %r at %s:%d', pv_name, *address)
+                        addresses[pv_name] = address
+
+            if unanswered and timed_out():
+                break
     finally:
         udp_sock.settimeout(orig_timeout)
+    return addresses
+
+
+def _search_timeout_error(pv_name):
+    return CaprotoTimeoutError(f"Timed out while awaiting a response "
+                               f"from the search for {pv_name!r}. Search "
+                               f"requests were sent to this address list: "
+                               f"{ca.get_address_list()}.")
+
+
+def search(pv_name, udp_sock, timeout, *, max_retries=2):
+    addresses = search_many([pv_name], udp_sock, timeout,
+                            max_retries=max_retries)
+    try:
+        return addresses[pv_name]
+    except KeyError:
+        raise _search_timeout_error(pv_name) from None
 
 
 def make_channel(pv_name, udp_sock, priority, timeout):
@@ -210,7 +303,124 @@ def make_channel(pv_name, udp_sock, priority, timeout):
     return chan
 
 
-def _read(chan, timeout, data_type, data_count, notify, force_int_enums):
+def _close_circuits(circuits):
+    for circuit in circuits:
+        sock = sockets.pop(circuit, None)
+        if sock is not None:
+            sock.close()
+        global_circuits.pop((circuit.address, circuit.priority), None)
+
+
+def _clear_channels(channels):
+    'Clear channels, sending the requests on each circuit together'
+    to_clear = defaultdict(list)
+    for chan in channels:
+        to_clear[chan.circuit].append(chan)
+    try:
+        for circuit, chans in to_clear.items():
+            commands = [chan.clear() for chan in chans
+                        if chan.states[ca.CLIENT] is ca.CONNECTED]
+            if commands:
+                _send_many(circuit, commands)
+    finally:
+        _close_circuits(to_clear)
+
+
+def _make_channels(pv_names, udp_sock, priority, timeout):
+    """
+    Search for and create channels to many PVs at once.
+
+    The channels on each circuit are created together, and the responses
+    collected in one selector loop.
+
+    Returns
+    -------
+    channels : dict
+        Maps PV names to their connected channels
+    errors : dict
+        Maps PV names to the exception raised for those which failed
+    """
+    pv_names = list(dict.fromkeys(pv_names))
+    addresses = search_many(pv_names, udp_sock, timeout)
+    errors = {pv_name: _search_timeout_error(pv_name)
+              for pv_name in pv_names if pv_name not in addresses}
+
+    to_create = defaultdict(list)
+    for pv_name, address in addresses.items():
+        try:
+            circuit = global_circuits[(address, priority)]
+        except KeyError:
+            circuit = global_circuits[(address, priority)] = ca.VirtualCircuit(
+                our_role=ca.CLIENT,
+                address=address,
+                priority=priority)
+        to_create[circuit].append(ca.ClientChannel(pv_name, circuit))
+
+    # circuit -> {name: channel}, for the channels awaiting creation
+    pending = {}
+    for circuit, chans in to_create.items():
+        commands = []
+        try:
+            if circuit not in sockets:
+                sockets[circuit] = socket.create_connection(circuit.address,
+                                                            timeout)
+                circuit.our_address = sockets[circuit].getsockname()
+                # Initialize our new TCP-based CA connection with a
+                # VersionRequest.
+                commands = [
+                    ca.VersionRequest(priority=priority,
+                                      version=ca.DEFAULT_PROTOCOL_VERSION),
+                    chans[0].host_name(socket.gethostname()),
+                    chans[0].client_name(getpass.getuser()),
+                ]
+            commands.extend(chan.create() for chan in chans)
+            _send_many(circuit, commands)
+        except OSError as ex:
+            _close_circuits([circuit])
+            host, port = circuit.address
+            for chan in chans:
+                errors[chan.name] = ca.CaprotoNetworkError(
+                    f"Failed to connect to {host}:{port}: {ex}")
+            continue
+        pending[circuit] = {chan.name: chan for chan in chans}
+
+    channels = {}
+
+    def handle(circuit, command):
+        chans = pending[circuit]
+        for pv_name, chan in list(chans.items()):
+            if command is ca.DISCONNECTED:
+                errors[pv_name] = CaprotoError(
+                    'Disconnected during initialization')
+            elif chan.states[ca.CLIENT] is ca.CONNECTED:
+                chan.log.info("Channel connected.")
+                channels[pv_name] = chan
+            elif chan.states[ca.CLIENT] is ca.FAILED:
+                errors[pv_name] = CaprotoError(
+                    f'The server failed to create the channel {pv_name!r}')
+            else:
+                continue
+            del chans[pv_name]
+        return bool(chans)
+
+    try:
+        _collect(pending, handle, time.monotonic() + timeout)
+    except BaseException:
+        _clear_channels(channels.values())
+        _close_circuits(pending)
+        raise
+
+    for chans in pending.values():
+        for pv_name in chans:
+            errors[pv_name] = CaprotoTimeoutError(
+                f"Timeout while awaiting creation of the channel {pv_name!r}.")
+    # Close the circuits left without any channels.
+    _close_circuits(set(pending) - set(chan.circuit
+                                       for chan in channels.values()))
+    return channels, errors
+
+
+def _read_request(chan, data_type, data_count, notify, force_int_enums):
     logger = chan.log
     logger.debug("Detected native data_type %r.", chan.native_data_type)
     ntype = native_type(chan.native_data_type)  # abundance of caution
@@ -218,7 +428,12 @@ def _read(chan, timeout, data_type, data_count, notify, force_int_enums):
             (data_type is None) and (not force_int_enums)):
         logger.debug("Changing requested data_type to STRING.")
         data_type = ChannelType.STRING
-    req = chan.read(data_type=data_type, data_count=data_count, notify=notify)
+    return chan.read(data_type=data_type, data_count=data_count, notify=notify)
+
+
+def _read(chan, timeout, data_type, data_count, notify, force_int_enums):
+    logger = chan.log
+    req = _read_request(chan, data_type, data_count, notify, force_int_enums)
     send(chan.circuit, req, chan.name)
     t = time.monotonic()
     while True:
@@ -482,13 +697,22 @@ def block(*subscriptions, duration=None, timeout=common.GLOBAL_DEFAULT_TIMEOUT,
     # Must bind or getsocketname() will raise on Windows.
     # See https://github.com/caproto/caproto/issues/514.
     udp_sock.bind(('', 0))
+    channels = {}
     try:
         udp_sock.settimeout(timeout)
-        channels = {}
+        # Connect to the PVs of each priority together.
+        by_priority = defaultdict(list)
         for sub in subscriptions:
-            pv_name = sub.pv_name
-            chan = make_channel(pv_name, udp_sock, sub.priority, timeout)
-            channels[sub] = chan
+            by_priority[sub.priority].append(sub)
+        for priority, subs in by_priority.items():
+            chans, errors = _make_channels([sub.pv_name for sub in subs],
+                                           udp_sock, priority, timeout)
+            for sub in subs:
+                if sub.pv_name in chans:
+                    channels[sub] = chans[sub.pv_name]
+            if errors:
+                _clear_channels(channels.values())
+                raise next(iter(errors.values()))
     finally:
         udp_sock.close()
     try:
@@ -548,20 +772,13 @@ def block(*subscriptions, duration=None, timeout=common.GLOBAL_DEFAULT_TIMEOUT,
             pass
     finally:
         _permission_to_block.clear()
-        try:
-            for chan in channels.values():
-                if chan.states[ca.CLIENT] is ca.CONNECTED:
-                    send(chan.circuit, chan.clear(), chan.name)
-        finally:
-            # Reinstate the timeout for channel cleanup.
-            for chan in channels.values():
-                sockets[chan.circuit].settimeout(timeout)
-                sockets[chan.circuit].close()
-                del sockets[chan.circuit]
-                del global_circuits[(chan.circuit.address, chan.circuit.priority)]
+        # Reinstate the timeout for channel cleanup.
+        for chan in channels.values():
+            sockets[chan.circuit].settimeout(timeout)
+        _clear_channels(set(channels.values()))
 
 
-def _write(chan, data, metadata, timeout, data_type, notify):
+def _write_request(chan, data, metadata, data_type, notify):
     logger.debug("Detected native data_type %r.", chan.native_data_type)
     # abundance of caution
     ntype = field_types['native'][chan.native_data_type]
@@ -580,8 +797,12 @@ def _write(chan, data, metadata, timeout, data_type, notify):
             logger.debug("Will write to ENUM as data_type STRING.")
             data_type = ChannelType.STRING
     logger.debug("Writing.")
-    req = chan.write(data=data, notify=notify,
-                     data_type=data_type, metadata=metadata)
+    return chan.write(data=data, notify=notify,
+                      data_type=data_type, metadata=metadata)
+
+
+def _write(chan, data, metadata, timeout, data_type, notify):
+    req = _write_request(chan, data, metadata, data_type, notify)
     send(chan.circuit, req, chan.name)
     t = time.monotonic()
     if notify:
@@ -783,6 +1004,218 @@ def read_write_read(pv_name, data, *, notify=False,
     return initial, res, final
 
 
+def _request_many(pv_names, channels, make_request, timeout):
+    """
+    Make one request for each position in ``pv_names``, sending those on each
+    circuit together, and collect the responses in one selector loop.
+
+    ``make_request(index, chan)`` returns the request for position ``index``,
+    or None if no request should be made. Positions whose PV has no channel
+    are skipped. Returns a dict mapping positions to responses (or None, for
+    requests which get no response), or to the exception raised for them.
+    """
+    results = {}
+    requests = defaultdict(list)
+    # circuit -> {ioid: index}, for the responses awaited
+    pending = defaultdict(dict)
+    for index, pv_name in enumerate(pv_names):
+        chan = channels.get(pv_name)
+        if chan is None:
+            continue
+        try:
+            req = make_request(index, chan)
+        except Exception as ex:
+            results[index] = ex
+            continue
+        requests[chan.circuit].append(req)
+        if isinstance(req, (ca.ReadRequest, ca.ReadNotifyRequest,
+                            ca.WriteNotifyRequest)):
+            pending[chan.circuit][req.ioid] = index
+        else:
+            results[index] = None
+
+    for circuit, reqs in requests.items():
+        _send_many(circuit, reqs)
+
+    def handle(circuit, command):
+        awaited = pending[circuit]
+        if command is ca.DISCONNECTED:
+            for index in awaited.values():
+                results[index] = CaprotoError('Disconnected while waiting '
+                                              'for response')
+            awaited.clear()
+        elif isinstance(command, ca.ErrorResponse):
+            for ioid, index in list(awaited.items()):
+                if channels[pv_names[index]].cid == command.cid:
+                    results[index] = ErrorResponseReceived(command)
+                    del awaited[ioid]
+        elif isinstance(command, (ca.ReadResponse, ca.ReadNotifyResponse,
+                                  ca.WriteNotifyResponse)):
+            index = awaited.pop(command.ioid, None)
+            if index is not None:
+                results[index] = command
+        return bool(awaited)
+
+    _collect(pending, handle, time.monotonic() + timeout)
+    for awaited in pending.values():
+        for index in awaited.values():
+            results[index] = CaprotoTimeoutError(
+                f"Timeout while awaiting the response for "
+                f"{pv_names[index]!r}.")
+    return results
+
+
+def _many(pv_names, make_request, timeout, priority, repeater,
+          return_exceptions):
+    if repeater:
+        # As per the EPICS spec, a well-behaved client should start a
+        # caproto-repeater that will continue running after it exits.
+        spawn_repeater()
+    udp_sock = ca.bcast_socket()
+    # Must bind or getsocketname() will raise on Windows.
+    # See https://github.com/caproto/caproto/issues/514.
+    udp_sock.bind(('', 0))
+    try:
+        udp_sock.settimeout(timeout)
+        channels, errors = _make_channels(pv_names, udp_sock, priority,
+                                          timeout)
+    finally:
+        udp_sock.close()
+    try:
+        responses = _request_many(pv_names, channels, make_request, timeout)
+    finally:
+        _clear_channels(channels.values())
+
+    results = [errors[pv_name] if pv_name in errors else responses[index]
+               for index, pv_name in enumerate(pv_names)]
+    if not return_exceptions:
+        for result in results:
+            if isinstance(result, Exception):
+                raise result
+    return results
+
+
+def read_many(pv_names, *, data_type=None, data_count=None,
+              timeout=common.GLOBAL_DEFAULT_TIMEOUT, priority=0, notify=True,
+              force_int_enums=False, repeater=True, return_exceptions=False):
+    """
+    Read many Channels at once.
+
+    The PVs are searched for together, and the requests to each server are
+    sent together, such that this takes about as long as reading one PV.
+
+    Parameters
+    ----------
+    pv_names : list of str
+        The PV names to read from
+    data_type : {'native', 'status', 'time', 'graphic', 'control'} or ChannelType or int ID, optional
+        Request specific data type or a class of data types, matched to the
+        channel's native data type. Default is Channel's native data type.
+    data_count : integer, optional
+        Requested number of values. Default is the channel's native data
+        count.
+    timeout : float, optional
+        Default is 1 second. This applies to connecting to the PVs, and then
+        again to awaiting the responses.
+    priority : 0, optional
+        Virtual Circuit priority. Default is 0, lowest. Highest is 99.
+    notify : boolean, optional
+        Send a ReadNotifyRequest instead of a ReadRequest. True by default.
+    force_int_enums : boolean, optional
+        Retrieve enums as integers. (Default is strings.)
+    repeater : boolean, optional
+        Spawn a Channel Access Repeater process if the port is available.
+        True default, as the Channel Access spec stipulates that well-behaved
+        clients should do this.
+    return_exceptions : boolean, optional
+        Return the exception for each PV which failed (e.g., a
+        CaprotoTimeoutError) in place of its response. By default, the first
+        such exception is raised.
+
+    Returns
+    -------
+    responses : list of ReadResponse or ReadNotifyResponse
+        The response for each PV, in order.
+
+    Examples
+    --------
+
+    Get the values of Channels named 'simple:A' and 'simple:B'.
+
+    >>> [response.data for response in read_many(['simple:A', 'simple:B'])]
+    [array([1], dtype=int32), array([2], dtype=int32)]
+    """
+    def make_request(index, chan):
+        return _read_request(chan, data_type, data_count, notify,
+                             force_int_enums)
+
+    return _many(pv_names, make_request, timeout, priority, repeater,
+                 return_exceptions)
+
+
+def write_many(pv_names, values, *, notify=False, data_type=None,
+               metadata=None, timeout=common.GLOBAL_DEFAULT_TIMEOUT,
+               priority=0, repeater=True, return_exceptions=False):
+    """
+    Write to many Channels at once.
+
+    The PVs are searched for together, and the requests to each server are
+    sent together, such that this takes about as long as writing to one PV.
+
+    Parameters
+    ----------
+    pv_names : list of str
+        The PV names to write to. A PV may be given more than once, to be
+        written to once for each of its values, in order.
+    values : list
+        The value(s) to write to each PV: str, bytes, int, or float or any
+        Iterable of these.
+    notify : boolean, optional
+        Request notification of completion and wait for it. False by default.
+    data_type : {'native', 'status', 'time', 'graphic', 'control'} or ChannelType or int ID, optional
+        Write as specific data type. Default is inferred from input.
+    metadata : ``ctypes.BigEndianStructure`` or tuple
+        Status and control metadata for the values
+    timeout : float, optional
+        Default is 1 second. This applies to connecting to the PVs, and then
+        again to awaiting the responses.
+    priority : 0, optional
+        Virtual Circuit priority. Default is 0, lowest. Highest is 99.
+    repeater : boolean, optional
+        Spawn a Channel Access Repeater process if the port is available.
+        True default, as the Channel Access spec stipulates that well-behaved
+        clients should do this.
+    return_exceptions : boolean, optional
+        Return the exception for each PV which failed (e.g., a
+        CaprotoTimeoutError) in place of its response. By default, the first
+        such exception is raised.
+
+    Returns
+    -------
+    responses : list
+        The WriteNotifyResponse for each PV, in order, or None for each if
+        ``notify`` is False.
+
+    Examples
+    --------
+
+    Write to Channels named 'simple:A' and 'simple:B', and wait for the
+    writes to complete.
+
+    >>> write_many(['simple:A', 'simple:B'], [5, 6], notify=True)
+    """
+    if len(pv_names) != len(values):
+        raise ca.CaprotoValueError(
+            'The number of PV names and values must be the same')
+
+    def make_request(index, chan):
+        return _write_request(chan, values[index], metadata, data_type,
+                              notify)
+
+    return _many(pv_names, make_request, timeout, priority, repeater,
+                 return_exceptions)
+
+
 class Subscription:
     """
     This object encapsulates state related to a Subscription.
@@ -903,7 +903,7 @@ def threaded_in_curio_wrapper(fcn):
     return test_runner
 
 
-@pytest.fixture(scope='function', params=['array', 'numpy'])
+@pytest.fixture(scope='function', params=['array', 'numpy', 'numpy_native'])
 def backends(request):
     from caproto import backend, select_backend
 
@@ -0,0 +1,87 @@
+import asyncio
+import time
+
+import pytest
+
+import caproto as ca
+from caproto.asyncio.client import Batch, Context
+
+
+def test_batch(ioc):
+    async def test():
+        async with Context() as context:
+            int_pv, float_pv = await context.get_pvs(ioc.pvs['int'],
+                                                     ioc.pvs['float'])
+            await int_pv.wait_for_connection(timeout=10)
+            await float_pv.wait_for_connection(timeout=10)
+
+            async with Batch() as batch:
+                write = batch.write(int_pv, [5])
+                no_notify = batch.write(float_pv, [3.125], notify=False)
+                reads = [batch.read(int_pv), batch.read(float_pv)]
+                # Nothing is sent until the end of the block
+                assert not write.done()
+
+            assert no_notify is None
+            response = await write
+            assert isinstance(response, ca.WriteNotifyResponse)
+            int_reading, _ = await asyncio.gather(*reads)
+            assert int_reading.data[0] == 5
+
+            # Not sent, as the block raised
+            with pytest.raises(RuntimeError):
+                async with Batch() as batch:
+                    future = batch.read(int_pv)
+                    raise RuntimeError()
+            assert future.cancelled()
+
+    asyncio.run(test())
+
+
+def test_read_write_many(ioc):
+    async def test():
+        async with Context() as context:
+            pvs = await context.get_pvs(ioc.pvs['int'], ioc.pvs['float'])
+            responses = await context.write_many(pvs, [7, 3.15], timeout=10)
+            assert all(isinstance(response, ca.WriteNotifyResponse)
+                       for response in responses)
+            readings = await context.read_many(pvs, data_type='time',
+                                               timeout=10)
+            assert [reading.data[0] for reading in readings] == [7, 3.15]
+
+            missing, = await context.get_pvs('does_not_exist')
+            readings = await context.read_many(pvs + [missing], timeout=0.5,
+                                               return_exceptions=True)
+            assert readings[0].data[0] == 7
+            assert isinstance(readings[2], ca.CaprotoTimeoutError)
+            with pytest.raises(ca.CaprotoTimeoutError):
+                await context.read_many([missing], timeout=0.5)
+
+            with pytest.raises(ca.CaprotoValueError):
+                await context.write_many(pvs, [1])
+
+    asyncio.run(test())
+
+
+def test_subscription_coalescing(ioc):
+    async def test():
+        async with Context() as context:
+            pv, = await context.get_pvs(ioc.pvs['int'])
+            await pv.wait_for_connection(timeout=10)
+            sub = pv.subscribe(coalesce_interval=0.2)
+
+            deliveries = []
+            async for response in sub:
+                deliveries.append((time.monotonic(), response.data[0]))
+                if len(deliveries) == 1:
+                    for value in range(1, 11):
+                        await pv.write([value])
+                elif response.data[0] == 10:
+                    break
+
+            times = [delivered_at for delivered_at, _ in deliveries]
+            assert all(b - a >= 0.19 for a, b in zip(times, times[1:]))
+            assert sub.dropped_updates > 0
+            assert len(deliveries) + sub.dropped_updates == 11
+
+    asyncio.run(test())
@@ -0,0 +1,51 @@
+import pytest
+
+from caproto.benchmarking.suite import compare_results, run_suite
+
+
+def test_compare_results():
+    def results(updates_per_sec, p99_ms):
+        return dict(results=[
+            dict(async_lib='asyncio', benchmark='monitor', kind='scalar',
+                 subscribers=10, updates_per_sec=updates_per_sec,
+                 p99_ms=p99_ms),
+            dict(async_lib='asyncio', benchmark='search',
+                 searches_per_sec=100.),
+        ])
+
+    comparison = compare_results(results(1000., 1.), results(500., 1.05))
+    by_attr = {item['attr']: item for item in comparison}
+    assert set(by_attr) == {'updates_per_sec', 'p99_ms', 'searches_per_sec'}
+    assert by_attr['updates_per_sec']['ratio'] == pytest.approx(0.5)
+    assert by_attr['updates_per_sec']['regressed']
+    assert not by_attr['p99_ms']['regressed']
+    assert not by_attr['searches_per_sec']['regressed']
+
+
+@pytest.mark.parametrize('async_lib', ['asyncio', 'trio'])
+def test_run_suite(async_lib):
+    results = run_suite(async_libs=[async_lib], subscriber_counts=[1, 3],
+                        waveform_length=100, scalar_updates=5,
+                        waveform_updates=2, channels=20, puts=5,
+                        records=20, channel_data=100)
+    by_benchmark = {}
+    for result in results['results']:
+        by_benchmark.setdefault(result['benchmark'], []).append(result)
+
+    assert len(by_benchmark['monitor']) == 4
+    for result in by_benchmark['monitor']:
+        assert result['updates_received'] > 0
+    search, = by_benchmark['search']
+    assert search['answered'] == 20
+    create, = by_benchmark['create_channel']
+    assert create['channels'] == 20
+    put, = by_benchmark['put_completion']
+    assert put['p50_ms'] > 0
+    assert {result['kind'] for result in by_benchmark['backend']} == {
+        'numpy', 'numpy_native'}
+    eager, lazy = by_benchmark['records']
+    assert (eager['kind'], lazy['kind']) == ('eager', 'lazy')
+    assert lazy['memory_mb'] < eager['memory_mb']
+    assert {result['kind'] for result in by_benchmark['channel_data']} == {
+        'ChannelDouble', 'ChannelInteger', 'ChannelEnum', 'ChannelString',
+        'ChannelChar'}
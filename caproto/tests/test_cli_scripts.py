@@ -3,7 +3,9 @@ import sys
 
 import pytest
 
-from caproto.sync.client import block, read, subscribe, write
+import caproto as ca
+from caproto.sync.client import (block, read, read_many, subscribe, write,
+                                 write_many)
 
 from .conftest import dump_process_output
 
@@ -20,6 +22,8 @@ def fix_arg_prefixes(ioc, args):
 @pytest.mark.parametrize('func,args,kwargs',
                          [(read, ('__does_not_exist',), {}),
                           (write, ('__does_not_exist', 5), {}),
+                          (read_many, (['__does_not_exist'],), {}),
+                          (write_many, (['__does_not_exist'], [5]), {}),
                           ])
 def test_timeout(func, args, kwargs):
     with pytest.raises(TimeoutError):
@@ -70,6 +74,25 @@ def test_subscribe_options(more_kwargs, ioc):
     block(sub, duration=0.5, **more_kwargs)
 
 
+def test_read_write_many(ioc):
+    float_pv, int_pv, str_pv = fix_arg_prefixes(ioc, ['float', 'int', 'str'])
+    pv_names = [float_pv, int_pv, str_pv, int_pv]
+    responses = write_many(pv_names, [3.15, 5, 'abc', 6], notify=True)
+    assert all(isinstance(response, ca.WriteNotifyResponse)
+               for response in responses)
+    # Each write to a PV given twice gets its own request
+    assert responses[1].ioid != responses[3].ioid
+
+    float_reading, *readings = read_many(pv_names, data_type='time')
+    assert float_reading.data[0] == 3.15
+    assert [reading.data[0] for reading in readings] == [6, b'abc', 6]
+
+    readings = read_many([int_pv, '__does_not_exist'], timeout=0.5,
+                         return_exceptions=True)
+    assert readings[0].data[0] == 6
+    assert isinstance(readings[1], TimeoutError)
+
+
 fmt1 = '{response.data[0]}'
 fmt2 = '{timestamp:%%H:%%M}'
 fmt3 = '{response.data}'
@@ -83,6 +106,8 @@ fmt3 = '{response.data}'
                           ('caproto-get', ('--list-types',)),
                           ('caproto-get', ('float',)),
                           ('caproto-get', ('float', 'str')),
+                          ('caproto-get', ('float', 'str', 'int', 'enum')),
+                          ('caproto-get', ('float', '__does_not_exist')),
                           # data_type as int, enum name, class on type
                           ('caproto-get', ('float', '-d', '0')),
                           ('caproto-get', ('float', '-d', 'STRING')),
@@ -169,6 +194,7 @@ def test_cli(command, args, ioc, ):
                           ('float', '-m v'),
                           ('enum',),
                           ('enum', '-n'),
+                          ('float', 'int'),
                           ('float', '-n'),  # should have no effect
                           ('float', '--no-repeater'),
                           ('float', '-p', '0'),
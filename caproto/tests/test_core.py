@@ -383,3 +383,60 @@ def test_enum_too_long():
 def test_enum_too_many():
     with pytest.raises(ValueError, match='The maximum number of enum states is'):
         ca.ChannelEnum(enum_strings='a' * 17)
+
+
+@pytest.mark.parametrize('chunk_size', [1, 7, 16, 100, 4096])
+def test_receive_buffer_chunked(chunk_size):
+    responses = [ca.EventAddResponse(data=list(range(i)), data_type=5,
+                                     data_count=i, subscriptionid=i,
+                                     status=1, metadata=None)
+                 for i in range(1, 50)]
+    stream = b''.join(bytes(res) for res in responses)
+
+    recv_buffer = ca.ReceiveBuffer(size=64)
+    received = []
+    for start in range(0, len(stream), chunk_size):
+        recv_buffer.extend(stream[start:start + chunk_size])
+        while True:
+            command, num_bytes_needed = recv_buffer.next_command(ca.SERVER)
+            if command is ca.NEED_DATA:
+                assert num_bytes_needed > 0
+                break
+            received.append(command)
+
+    assert len(recv_buffer) == 0
+    assert received == responses
+    # Commands parsed earlier must not be clobbered by later receipts.
+    for command, res in zip(received, responses):
+        assert list(command.data) == list(res.data)
+
+
+def test_circuit_recv_into(circuit_pair):
+    cli_circuit, srv_circuit = circuit_pair
+    cli_channel, srv_channel = make_channels(*circuit_pair, 5, 1, name='a')
+
+    req = cli_channel.read()
+    payload = b''.join(cli_circuit.send(req))
+    buffer = srv_circuit.get_recv_buffer(len(payload))
+    assert len(buffer) >= len(payload)
+    buffer[:len(payload)] = payload
+    (command,), _ = srv_circuit.recv_buffer_updated(len(payload))
+    assert command == req
+
+    commands, _ = srv_circuit.recv_buffer_updated(0)
+    assert list(commands) == [ca.DISCONNECTED]
+
+
+@pytest.mark.parametrize('data_count', [3, 70000])
+def test_event_add_response_for_subscription(data_count):
+    res = ca.EventAddResponse(data=[1.5] * data_count, data_type=6,
+                              data_count=data_count, subscriptionid=1,
+                              status=1, metadata=None)
+    other = res.for_subscription(2)
+    assert other.subscriptionid == 2
+    assert res.subscriptionid == 1
+    assert all(a is b for a, b in zip(other.buffers, res.buffers))
+    expected = ca.EventAddResponse(data=[1.5] * data_count, data_type=6,
+                                   data_count=data_count, subscriptionid=2,
+                                   status=1, metadata=None)
+    assert bytes(other) == bytes(expected)
@@ -75,7 +75,11 @@ def run_conversion_test(values, from_dtype, to_dtype, expected,
                   f' ({returned.typecode})')
             returned = returned.tolist()
         elif isinstance(returned, array_types):
-            assert returned.dtype == backend.type_map[to_dtype]
+            expected_dtype = backend.type_map[to_dtype]
+            if backend.backend_name == 'numpy_native':
+                # Values are kept in the byte order of this host
+                expected_dtype = expected_dtype.newbyteorder('=')
+            assert returned.dtype == expected_dtype
             print(f'numpy to list {returned} -> {returned.tolist()}'
                   f' ({returned.dtype})')
             returned = returned.tolist()
@@ -395,3 +399,21 @@ def test_long_to_wire(backends, from_dtype, to_dtype, values, expected,
     run_conversion_test(values=values, from_dtype=from_dtype,
                         to_dtype=to_dtype, expected=expected,
                         direction=TO_WIRE, **kwargs)
+
+
+def test_string_array_buffer():
+    size = 40  # MAX_STRING_SIZE
+    full = b'x' * size
+    strings = DbrStringArray([b'abc', b'', full, full + b'truncated'])
+    buf = strings.tobytes()
+    assert len(buf) == 4 * size
+    assert buf[:size] == b'abc'.ljust(size, b'\x00')
+    assert DbrStringArray.pack(iter(strings)) == buf
+
+    assert DbrStringArray.frombuffer(buf) == [b'abc', b'', full, full]
+    assert DbrStringArray.frombuffer(memoryview(buf), 2) == [b'abc', b'']
+    # Bytes after the null terminator are ignored; strings past the end of
+    # the buffer are empty
+    garbage = b'def\x00garbage'.ljust(size, b'\x00')
+    strings = DbrStringArray.frombuffer(garbage + b'gh', 3)
+    assert strings == [b'def', b'gh', b'']
@@ -1,10 +1,15 @@
+import array
+import asyncio
 import copy
+import pickle
 
 import pytest
 
-from .. import (ChannelByte, ChannelChar, ChannelData, ChannelDouble,
-                ChannelEnum, ChannelFloat, ChannelInteger, ChannelShort,
-                ChannelString)
+from .. import (ChannelAlarm, ChannelByte, ChannelChar, ChannelData,
+                ChannelDataSnapshot, ChannelDouble, ChannelEnum, ChannelFloat,
+                ChannelInteger, ChannelShort, ChannelString, ChannelType)
+from .._dbr import _LongStringChannelType, field_types
+from .._utils import CaprotoConversionError
 from ..server.server import (PVGroup, PvpropertyBoolEnum, PvpropertyBoolEnumRO,
                              PvpropertyByte, PvpropertyByteRO, PvpropertyChar,
                              PvpropertyCharRO, PvpropertyDouble,
@@ -198,3 +203,149 @@ def test_getnewargs(data: ChannelData):
     args, kwargs = data.__getnewargs_ex__()
     copied = type(data)(*args, **kwargs)
     compare_data(data, copied)
+
+
+def test_read_cache():
+    alarm = ChannelAlarm()
+    data = ChannelDouble(value=1.0, precision=2, alarm=alarm)
+    other = ChannelDouble(value=2.0, alarm=alarm)
+
+    async def test():
+        md, values = await data.read(ChannelType.CTRL_DOUBLE)
+        # Cached until something changes
+        assert (await data.read(ChannelType.CTRL_DOUBLE)) == (md, values)
+        assert (await data.read(ChannelType.CTRL_DOUBLE))[0] is md
+        assert (await data.read(ChannelType.CTRL_INT))[0] is not md
+
+        await data.write(3.0)
+        md, values = await data.read(ChannelType.CTRL_DOUBLE)
+        assert list(values) == [3.0]
+
+        await data.write_metadata(precision=4)
+        md, values = await data.read(ChannelType.CTRL_DOUBLE)
+        assert md.precision == 4
+
+        # A change to an alarm shared with another channel
+        await other.write(4.0, severity=2)
+        md, values = await data.read(ChannelType.CTRL_DOUBLE)
+        assert md.severity == 2
+
+    asyncio.run(test())
+
+
+def test_read_cache_mutable_value():
+    data = ChannelDouble(value=[1.0, 2.0])
+
+    async def test():
+        _, values = await data.read(ChannelType.DOUBLE)
+        assert list(values) == [1.0, 2.0]
+        # Modifying the value in place is seen by the next read, once noted
+        data.value[0] = 3.0
+        data.mark_modified()
+        _, values = await data.read(ChannelType.DOUBLE)
+        assert list(values) == [3.0, 2.0]
+
+    asyncio.run(test())
+
+
+def test_read_cache_long_string():
+    data = ChannelString(value='string', long_string_max_length=82)
+
+    async def test():
+        _, values = await data.read(_LongStringChannelType.LONG_STRING)
+        assert bytes(values).rstrip(b'\0') == b'string'
+        # Shares its value with CHAR, which a string cannot be read as
+        with pytest.raises(CaprotoConversionError):
+            await data.read(ChannelType.CHAR)
+
+    asyncio.run(test())
+
+
+@pytest.mark.parametrize("data", sample_data)
+def test_snapshot(data: ChannelData):
+    snapshot = ChannelDataSnapshot(data)
+    # Lists and writable arrays are copied, anything else is shared
+    assert (snapshot.value is data.value or
+            list(snapshot.value) == list(data.value))
+    assert snapshot.timestamp == data.timestamp
+
+    async def test():
+        for data_type in (field_types['control'][data.data_type],
+                          field_types['time'][data.data_type],
+                          ChannelType.STSACK_STRING, ChannelType.CLASS_NAME):
+            try:
+                md, values = await data.read(data_type)
+            except Exception as ex:
+                with pytest.raises(type(ex)):
+                    await snapshot._read(data_type)
+                continue
+            snap_md, snap_values = await snapshot._read(data_type)
+            assert bytes(snap_md) == bytes(md)
+            assert list(snap_values) == list(values)
+
+    asyncio.run(test())
+
+
+def test_snapshot_unchanged_by_write():
+    data = ChannelEnum(value='a', enum_strings=['a', 'b'])
+    snapshot = ChannelDataSnapshot(data)
+
+    async def test():
+        await data.write('b', severity=2)
+        await data.write_metadata(enum_strings=['c', 'b', 'a'])
+        md, values = await snapshot._read(ChannelType.CTRL_ENUM)
+        assert list(values) == [0]
+        assert md.severity == 0
+        assert md.enum_strings == (b'a', b'b')
+        md, values = await data.read(ChannelType.CTRL_ENUM)
+        assert list(values) == [1]
+        assert md.severity == 2
+        assert md.enum_strings == (b'c', b'b', b'a')
+
+    asyncio.run(test())
+
+
+@pytest.mark.parametrize("array_type", [list, array.array])
+def test_snapshot_unchanged_in_place(array_type):
+    value = ([0.0, 0.0] if array_type is list else
+             array.array('d', [0.0, 0.0]))
+    data = ChannelDouble(value=value)
+    snapshot = ChannelDataSnapshot(data)
+    data.value[0] = 99.0
+
+    async def test():
+        _, values = await snapshot._read(ChannelType.DOUBLE)
+        assert list(values) == [0.0, 0.0]
+        assert list(snapshot.value) == [0.0, 0.0]
+
+    asyncio.run(test())
+
+
+@pytest.mark.parametrize("data", [param for param in sample_data
+                                  if param.id.startswith("Channel")])
+def test_pickle(data: ChannelData):
+    copied = pickle.loads(pickle.dumps(data))
+    compare_data(data, copied)
+    assert copied.data_type == data.data_type
+    # The restored instance uses its own copy of the alarm
+    assert copied.alarm == data.alarm
+    assert copied.alarm.channels == (copied, )
+
+
+def test_lazy_subscription_state():
+    alarm = ChannelAlarm()
+    data = ChannelDouble(value=1.0, alarm=alarm)
+    other = ChannelDouble(value=2.0, alarm=alarm)
+    assert not hasattr(data, "__dict__")
+    assert set(alarm.channels) == {data, other}
+    assert data._queues is None and data._snapshots is None
+
+    async def test():
+        # Writes do not allocate subscription state
+        await data.write(3.0)
+        assert data._queues is None
+
+        other.alarm = ChannelAlarm()
+        assert list(alarm.channels) == [data]
+
+    asyncio.run(test())
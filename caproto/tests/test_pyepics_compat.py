@@ -100,7 +100,9 @@ from caproto.threading.pyepics_compat import (PV, caput, caget, cainfo,
                                               AccessRightsException)
 from unittest import mock
 
-from .conftest import default_setup_module, default_teardown_module
+from caproto import CaprotoTimeoutError
+
+from .conftest import default_setup_module, default_teardown_module, wait_for
 from .test_threading_client import context, shared_broadcaster
 
 
@@ -1077,3 +1079,41 @@ def test_auto_monitor_subscription_no_user_callback(pvnames):
     ) as mocked_read_response:
         pv.get()
     mocked_read_response.assert_not_called()
+
+
+def test_caget_caput_many_batched(ioc, context):
+    pvnames = [ioc.pvs['int'], ioc.pvs['float'], ioc.pvs['str'],
+               'ceci nest pas une PV']
+    success = caput_many(pvnames, [7, 3.15, 'batched', 23], wait='all',
+                         connection_timeout=1, put_timeout=5,
+                         context=context)
+    assert success == [1, 1, 1, -1]
+
+    values = caget_many(pvnames, timeout=1, context=context)
+    assert values == [7, 3.15, 'batched', None]
+
+    with pytest.raises(CaprotoTimeoutError):
+        caget_many(pvnames, timeout=0.5, context=context, raises=True)
+
+    success = caput_many(pvnames[:2], [8, 3.125], connection_timeout=1,
+                         context=context)
+    assert success == [1, 1]
+    wait_for(lambda: caget_many(pvnames[:2], context=context) == [8, 3.125],
+             timeout=5)
+
+
+def test_caput_many_enum_strings(ioc, context):
+    enum_pv, = context.get_pvs(ioc.pvs['enum'])
+    enum_pv.wait_for_connection(timeout=5)
+    enum_strings = [
+        enum_str.decode('latin-1') for enum_str in
+        enum_pv.read(data_type='control').metadata.enum_strings
+    ]
+    pvnames = [ioc.pvs['int'], ioc.pvs['enum'], ioc.pvs['enum']]
+    # An unknown enum string fails only its own PV
+    success = caput_many(pvnames, [9, enum_strings[1], 'not an enum string'],
+                         wait='all', connection_timeout=1, put_timeout=5,
+                         context=context)
+    assert success == [1, 1, -1]
+    assert caget_many(pvnames[1:2], as_string=True, context=context) == [
+        enum_strings[1]]
@@ -1,3 +1,5 @@
+import asyncio
+
 import pytest
 
 from caproto import AlarmSeverity, AlarmStatus, ChannelType
@@ -89,3 +91,39 @@ def test_alarms(request, prefix, sevr_target, sevr_value, context, records_ioc):
         ctrl_vars = PV.get_ctrlvars()
         assert ctrl_vars['status'] == a_status
         assert ctrl_vars['severity'] == a_sevr
+
+
+@pytest.mark.parametrize('lazy', [True, False])
+def test_lazy_fields(monkeypatch, lazy):
+    from caproto.server import PVGroup, pvproperty
+    from caproto.server.records import RecordFieldGroup
+
+    monkeypatch.setattr(RecordFieldGroup, 'lazy_fields', lazy)
+
+    class Group(PVGroup):
+        value = pvproperty(value=0.0, record='ai', upper_alarm_limit=10.0,
+                           lower_alarm_limit=-10.0)
+
+    group = Group(prefix='lazy:')
+    fields = group.value.field_inst.attr_pvdb
+    assert 'DESC' in group.value.fields
+    assert (len(fields) == 0) is lazy
+
+    async def test():
+        await group.value.write(20.0)
+        # Fields created after the alarm changed pick up its state
+        assert group.value.get_field('SEVR').value == 'MAJOR'
+        assert group.value.get_field('STAT').value == 'HIHI'
+        await group.value.alarm.write(status=AlarmStatus.NO_ALARM,
+                                      severity=AlarmSeverity.NO_ALARM)
+        assert group.value.get_field('SEVR').value == 'NO_ALARM'
+
+    asyncio.run(test())
+    assert group.value.get_field('NAME').value == 'lazy:value'
+    assert group.value.get_field('RTYP').value == 'ai'
+    assert group.value.fields['DESC'] is group.value.field_inst.description
+    if lazy:
+        assert set(fields) == {'current_alarm_severity', 'alarm_status',
+                               'record_name', 'record_type', 'description'}
+    with pytest.raises(KeyError):
+        group.value.get_field('NOPE')
@@ -1,4 +1,8 @@
+import asyncio
+import json
 import logging
+import socket
+
 import pytest
 
 
@@ -32,3 +36,63 @@ def test_sync_repeater(ioc):
 
     with curio.Kernel() as kernel:
         kernel.run(check_repeater)
+
+
+def test_asyncio_repeater():
+    from caproto.asyncio.repeater import Repeater
+
+    def make_client():
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        sock.bind(('127.0.0.1', 0))
+        sock.settimeout(2)
+        return sock
+
+    async def test():
+        repeater = Repeater(sweep_interval=0.1)
+        server_sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        server_sock.bind(('127.0.0.1', 0))
+        addr = server_sock.getsockname()
+        stats_sock = socket.socket()
+        stats_sock.bind(('127.0.0.1', 0))
+        stats_port = stats_sock.getsockname()[1]
+        stats_sock.close()
+
+        loop = asyncio.get_running_loop()
+        task = loop.create_task(repeater.run(server_sock,
+                                             stats_port=stats_port))
+        await asyncio.sleep(0.1)
+
+        clients = [make_client() for _ in range(2)]
+        register = bytes(ca.RepeaterRegisterRequest('0.0.0.0'))
+        for client in clients:
+            client.sendto(register, addr)
+            data = await loop.run_in_executor(None, client.recv, 1024)
+            assert data == bytes(ca.RepeaterConfirmResponse('127.0.0.1'))
+
+        # A beacon without an address has it filled in, and is forwarded to
+        # all clients but the sender.
+        beacon = ca.Beacon(13, 5064, 1, '0.0.0.0')
+        clients[0].sendto(bytes(beacon), addr)
+        data = await loop.run_in_executor(None, clients[1].recv, 1024)
+        assert data == bytes(ca.Beacon(13, 5064, 1, '127.0.0.1'))
+        assert ('127.0.0.1', 5064) in repeater.servers
+
+        # Clients which went away are removed by the next sweep.
+        clients.pop().close()
+        await asyncio.sleep(0.3)
+        assert len(repeater.clients) == 1
+
+        reader, writer = await asyncio.open_connection('127.0.0.1',
+                                                       stats_port)
+        stats = json.loads(await reader.read())
+        writer.close()
+        assert stats['registrations'] == 2
+        assert stats['beacons'] == 1
+        assert stats['datagrams_forwarded'] == 1
+        assert stats['clients_removed'] == 1
+        assert stats['clients'] == 1
+
+        task.cancel()
+        clients[0].close()
+
+    asyncio.run(test())
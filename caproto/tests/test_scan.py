@@ -0,0 +1,155 @@
+import asyncio
+import time
+
+import pytest
+
+from caproto.server.scan import ScanScheduler, get_scan_statistics
+from caproto.server.server import AsyncLibraryLayer
+from caproto.sync.client import read, write
+
+from .conftest import run_example_ioc
+
+
+class _AsyncioLayer(AsyncLibraryLayer):
+    library = asyncio
+
+
+def _make_scheduler():
+    tasks = []
+
+    async def spawn(async_fn, *args):
+        tasks.append(asyncio.get_running_loop().create_task(async_fn(*args)))
+
+    return ScanScheduler(_AsyncioLayer(), spawn), tasks
+
+
+def test_scan_classes():
+    calls = []
+
+    def make_callback(name):
+        async def callback():
+            calls.append(name)
+        return callback
+
+    async def test():
+        scheduler, tasks = _make_scheduler()
+        a = await scheduler.add(make_callback('a'), 0.05, name='a')
+        b = await scheduler.add(make_callback('b'), 0.05, name='b')
+        passive = await scheduler.add(make_callback('passive'), 0)
+        # Both scans share one scan class and a single task
+        assert list(scheduler.scan_classes) == [0.05]
+        assert len(tasks) == 1
+        assert passive.period is None
+
+        await asyncio.sleep(0.22)
+        assert 'passive' not in calls
+        # Run in the order they were added, on each tick
+        assert calls[:4] == ['a', 'b', 'a', 'b']
+
+        await b.reschedule(0)
+        await passive.reschedule(0.05)
+        calls.clear()
+        await asyncio.sleep(0.12)
+        assert set(calls) == {'a', 'passive'}
+
+        a.cancel()
+        passive.cancel()
+        await asyncio.sleep(0.1)
+        # The scan class has no scans left, and no task
+        assert all(task.done() for task in tasks)
+        stats, = scheduler.get_statistics()
+        assert stats['scans'] == 0
+        assert stats['ticks'] >= 6
+        assert stats in get_scan_statistics()
+
+    asyncio.run(test())
+
+
+def test_scan_skipped_while_in_flight():
+    fast_calls = []
+    slow_calls = []
+
+    async def fast():
+        fast_calls.append(time.monotonic())
+
+    async def slow():
+        slow_calls.append(time.monotonic())
+        await asyncio.sleep(0.15)
+
+    async def test():
+        scheduler, tasks = _make_scheduler()
+        slow_entry = await scheduler.add(slow, 0.02)
+        fast_entry = await scheduler.add(fast, 0.02)
+        await asyncio.sleep(0.3)
+        slow_entry.cancel()
+        fast_entry.cancel()
+        await asyncio.gather(*tasks)
+        stats, = scheduler.get_statistics()
+        # The slow scan does not hold up the fast one of the same period...
+        assert len(fast_calls) >= stats['ticks'] - 1 >= 8
+        # ... and is not run again until its previous run is done
+        assert len(slow_calls) <= 3
+        assert stats['skipped'] == slow_entry.skipped >= stats['ticks'] - 3
+        assert fast_entry.skipped == 0
+        assert stats['max_jitter'] >= stats['mean_jitter'] >= 0
+
+    asyncio.run(test())
+
+
+def test_scan_overruns():
+    async def scan():
+        ...
+
+    async def test():
+        scheduler, tasks = _make_scheduler()
+        entry = await scheduler.add(scan, 0.02)
+        await asyncio.sleep(0.05)
+        # Block the event loop for several periods
+        time.sleep(0.1)
+        await asyncio.sleep(0.05)
+        entry.cancel()
+        await asyncio.gather(*tasks)
+        stats, = scheduler.get_statistics()
+        # The missed ticks are skipped, back on the grid
+        assert stats['overruns'] >= 3
+        assert stats['max_jitter'] < 0.02
+        assert stats['skipped'] == 0
+
+    asyncio.run(test())
+
+
+def test_scan_failure():
+    calls = []
+
+    async def failing():
+        calls.append(None)
+        raise RuntimeError('scan failure')
+
+    async def test():
+        scheduler, tasks = _make_scheduler()
+        entry = await scheduler.add(failing, 0.01)
+        await asyncio.gather(*tasks)
+        assert entry.period is None
+
+    asyncio.run(test())
+    assert len(calls) == 1
+
+
+@pytest.mark.parametrize('async_lib', ['asyncio', 'curio', 'trio'])
+def test_scan_field(request, prefix, async_lib):
+    pytest.importorskip(async_lib)
+    pv = f'{prefix}scanned'
+    run_example_ioc('caproto.ioc_examples.scan_rate', request=request,
+                    args=['--prefix', prefix, '--async-lib', async_lib],
+                    pv_to_check=pv)
+
+    write(f'{pv}.SCAN', '.1 second', notify=True)
+    time.sleep(0.5)
+    # The value is the time elapsed between scans
+    assert read(pv).data[0] == pytest.approx(0.1, abs=0.05)
+
+    write(f'{pv}.SCAN', 'Passive', notify=True)
+    time.sleep(0.2)
+    value = read(pv).data[0]
+    time.sleep(0.3)
+    assert read(pv).data[0] == value
@@ -0,0 +1,130 @@
+import time
+
+import pytest
+
+import caproto as ca
+from caproto.client import common
+from caproto.client.search_results import SearchCache, SearchResults
+from caproto.client.search_scheduler import SearchScheduler, TokenBucket
+
+server_a = ('10.0.0.1', 5064)
+server_b = ('10.0.0.2', 5064)
+
+
+def test_search_cache():
+    cache = SearchCache()
+    cache.mark_name_found('a', server_a)
+    cache.mark_name_found('b', server_a)
+    cache.mark_name_found('c', server_b)
+    assert len(cache) == 3
+    assert cache.get('a') == server_a
+
+    use_cached, needs_search = cache.split_cached_results(['a', 'c', 'd'])
+    assert use_cached == {server_a: ['a'], server_b: ['c']}
+    assert needs_search == ['d']
+
+    # Stale results are removed, unless there is a channel to them.
+    cache.mark_channel_created('b', server_a)
+    with pytest.raises(ca.CaprotoKeyError):
+        cache.get('a', threshold=0)
+    assert 'a' not in cache
+    assert cache.get('b', threshold=0) == server_a
+
+    # A new server for a name replaces the old one.
+    cache.mark_name_found('c', server_a)
+    assert cache.get('c') == server_a
+
+    # Channels keep results through a restart of the server.
+    cache.invalidate_server(server_a)
+    assert 'b' in cache
+    assert 'c' not in cache
+
+    cache.mark_channel_disconnected('b', server_a)
+    assert len(cache) == 0
+
+
+@pytest.mark.parametrize('restart', ['beacon_id', 'interval'])
+def test_search_results_invalidated_on_restart(restart):
+    results = SearchResults()
+    results.mark_server_alive(server_a, 10)
+    time.sleep(0.2)
+    results.mark_server_alive(server_a, 11)
+
+    results.mark_name_found('a', server_a)
+    results.mark_channel_created('b', server_a)
+    results.mark_name_found('c', server_b)
+
+    if restart == 'beacon_id':
+        time.sleep(0.2)
+        results.mark_server_alive(server_a, 0)
+    else:
+        # Beacons arriving much faster than before
+        time.sleep(0.01)
+        results.mark_server_alive(server_a, 12)
+
+    assert 'a' not in results
+    assert results['b'][server_a] is common.VALID_CHANNEL_MARKER
+    assert results.get_cached_search_result('c') == server_b
+
+
+def test_token_bucket():
+    bucket = TokenBucket(rate=10, capacity=2)
+    assert bucket.acquire(now=0)
+    assert bucket.acquire(now=0)
+    assert not bucket.acquire(now=0)
+    assert bucket.time_until_available(now=0) == pytest.approx(0.1)
+    assert bucket.acquire(now=0.1)
+
+    unlimited = TokenBucket(rate=0, capacity=1)
+    assert all(unlimited.acquire(now=0) for _ in range(10))
+
+
+def test_search_scheduler_backoff():
+    interval = common.MIN_RETRY_SEARCHES_INTERVAL
+    scheduler = SearchScheduler(datagram_rate=0)
+    scheduler.add('a', now=0)
+    assert scheduler.pop_due(now=0) == ['a']
+    scheduler.mark_sent(['a'], now=0)
+    assert scheduler.time_until_due(now=0) == pytest.approx(interval)
+
+    # A new search does not reset the backoff of the others
+    scheduler.add('b', now=interval / 2)
+    assert scheduler.pop_due(now=interval / 2) == ['b']
+    scheduler.mark_sent(['b'], now=interval / 2)
+
+    assert scheduler.pop_due(now=interval) == ['a']
+    scheduler.mark_sent(['a'], now=interval)
+    # ... the interval doubled
+    assert scheduler.pop_due(now=2 * interval) == ['b']
+    scheduler.mark_sent(['b'], now=2 * interval)
+    assert scheduler.pop_due(now=2.9 * interval) == []
+    assert scheduler.pop_due(now=3 * interval) == ['a']
+    scheduler.mark_sent(['a'], now=3 * interval)
+
+    # Past their retirement deadline, searches are retired
+    retired = common.SEARCH_RETIREMENT_AGE + 1
+    assert scheduler.pop_due(now=retired) == ['b', 'a']
+    scheduler.mark_sent(['a', 'b'], now=retired)
+    assert scheduler.time_until_due(now=retired) == pytest.approx(
+        common.RETRY_RETIRED_SEARCHES_INTERVAL)
+
+    # ... until a new server is found
+    scheduler.remove('a', answered=True)
+    scheduler.reset(now=retired + 1)
+    assert scheduler.pop_due(now=retired + 1) == ['b']
+    assert scheduler.statistics == dict(sent=7, answered=1, retired=2,
+                                        pending=1)
+
+
+def test_search_scheduler_rate_limit():
+    scheduler = SearchScheduler(datagram_rate=10, datagram_burst=1)
+    scheduler.add('a', 'b', now=0)
+    due = scheduler.pop_due(now=0)
+    assert scheduler.acquire_datagram(now=0)
+    scheduler.mark_sent(due[:1], now=0)
+    assert not scheduler.acquire_datagram(now=0)
+    scheduler.requeue(due[1:])
+
+    # The remaining search is due, but must wait for the rate limit
+    assert scheduler.time_until_due(now=0) == pytest.approx(0.1)
+    assert scheduler.pop_due(now=0) == due[1:]
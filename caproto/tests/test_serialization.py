@@ -27,6 +27,7 @@ parameter_values = {
     'data_count': [1],
     'data_type': [DBR_LONG.DBR_ID],
     'error_message': ['error msg'],
+    'flags': [ca.EventAddFlag.SHARED_MEMORY],
     'header': [9],
     'high': [27],
     'ioid': [3],
@@ -229,6 +230,11 @@ def test_reads(backends, circuit_pair, data_type, data_count, data, metadata):
             # tests store data in big endian. swap received data endian for
             # comparison.
             received_data.byteswap()
+        elif (ca.backend.backend_name == 'numpy_native' and
+              hasattr(received_data, 'dtype')):
+            # numpy_native delivers arrays in the byte order of this host
+            received_data = received_data.astype(
+                received_data.dtype.newbyteorder('>'))
 
         assert data == _np_hack(received_data)
     else:
@@ -280,6 +286,11 @@ def test_writes(backends, circuit_pair, data_type, data_count, data, metadata):
             # tests store data in big endian. swap received data endian for
             # comparison>
             received_data.byteswap()
+        elif (ca.backend.backend_name == 'numpy_native' and
+              hasattr(received_data, 'dtype')):
+            # numpy_native delivers arrays in the byte order of this host
+            received_data = received_data.astype(
+                received_data.dtype.newbyteorder('>'))
 
         assert data == _np_hack(received_data)
     else:
@@ -2,8 +2,10 @@ import ast
 import asyncio
 import copy
 import datetime
+import logging
 import sys
 import time
+import weakref
 
 import pytest
 
@@ -375,3 +377,228 @@ def test_process_field(request, prefix, async_lib):
     write(f'{prefix}record.PROC', [1], notify=True)
     write(f'{prefix}record.PROC', [1], notify=True)
     assert read(f'{prefix}count').data[0] == 2
+
+
+def test_context_name_index(monkeypatch):
+    from caproto.server import PVGroup, common, pvproperty
+
+    class Group(PVGroup):
+        value = pvproperty(value=1.0, record='ai')
+        text = pvproperty(value='abc')
+
+    group = Group(prefix='idx:')
+    pvdb = dict(group.pvdb)
+    ctx = common.Context(pvdb, interfaces=['127.0.0.1'])
+    value = pvdb['idx:value']
+    text = pvdb['idx:text']
+
+    assert ctx['idx:value'] is value
+    assert ctx['idx:value.'] is value
+    assert ctx['idx:value.VAL'] is value
+    assert ctx['idx:value.DESC'] is value.fields['DESC']
+    assert ctx['idx:value.DESC$'] is value.fields['DESC']
+    assert ctx['idx:value.{"dbnd":{"d":1}}'] is value
+    assert ctx['idx:value.EGU[0:2]'] is value.fields['EGU']
+    assert ctx['idx:text.$'] is text
+    assert 'idx:value.DESC' in ctx.pvdb_with_fields
+    # Lookups no longer add entries to the pvdb
+    assert set(pvdb) == set(group.pvdb)
+
+    for name in ('idx:unknown', 'idx:value.NOPE', 'idx:value.VAL$',
+                 'idx:unknown.{"dbnd":{"d":1}}'):
+        with pytest.raises(KeyError):
+            ctx[name]
+        assert name in ctx._unknown_names
+
+    # Misses are bounded
+    monkeypatch.setattr(common, 'UNKNOWN_PV_CACHE_SIZE', 2)
+    for idx in range(5):
+        with pytest.raises(KeyError):
+            ctx[f'idx:missing{idx}']
+    assert list(ctx._unknown_names) == ['idx:missing3', 'idx:missing4']
+
+    # PVs added after startup are picked up, including their fields
+    class Added(PVGroup):
+        missing4 = pvproperty(value=0, record='longin')
+
+    pvdb.update(Added(prefix='idx:').pvdb)
+    assert ctx['idx:missing4.DESC'] is pvdb['idx:missing4'].fields['DESC']
+    assert 'idx:missing4.DESC' in ctx.pvdb_with_fields
+    assert not ctx._unknown_names
+
+
+def test_search_filter():
+    from caproto.server.search_filter import (SearchFilter,
+                                              get_search_filter_statistics)
+
+    names = [f'filt:rec{idx}' for idx in range(2000)]
+    search_filter = SearchFilter(error_rate=0.01)
+    search_filter.rebuild(names)
+    # No false negatives, for records and anything else under them
+    assert all(search_filter.check(name) for name in names)
+    assert all(f'{name}.DESC' in search_filter for name in names)
+
+    foreign = [f'other:rec{idx}' for idx in range(10000)]
+    passed = sum(search_filter.check(name) for name in foreign)
+    for _ in range(passed):
+        search_filter.record_false_positive()
+    assert passed / len(foreign) < 0.02
+    assert search_filter.false_positive_rate == passed / len(foreign)
+    assert search_filter.expected_false_positive_rate < 0.01
+
+    stats = get_search_filter_statistics()
+    assert stats['rejected'] >= len(foreign) - passed
+
+    # Adding more names than the filter has room for marks it as full
+    search_filter.update(f'more:rec{idx}' for idx in range(5000))
+    assert search_filter.full
+
+
+def test_context_search_filter(monkeypatch):
+    from caproto.server import PVGroup, common, pvproperty
+
+    class Group(PVGroup):
+        value = pvproperty(value=1.0, record='ai')
+
+    monkeypatch.setattr(common, 'SEARCH_FILTER_ERROR_RATE', 0.01)
+    pvdb = dict(Group(prefix='filt:').pvdb)
+    ctx = common.Context(pvdb, interfaces=['127.0.0.1'])
+    search_filter = ctx.search_filter
+    assert search_filter is not None
+
+    assert ctx._is_hosted('filt:value')
+    assert ctx._is_hosted('filt:value.DESC')
+    assert ctx._is_hosted('filt:value.{"dbnd":{"d":1}}')
+    assert not ctx._is_hosted('filt:value.NOPE')
+    assert not ctx._is_hosted('other:value')
+    assert search_filter.checks == 5
+    # An unknown field of a hosted record is not a false positive
+    assert search_filter.false_positives == 0
+
+    # PVs added later are found, with the filter updated in place
+    pvdb['filt:added'] = ca.ChannelDouble(value=0.0)
+    assert ctx._is_hosted('filt:added')
+    assert ctx.search_filter is search_filter
+
+    # Removing PVs rebuilds the filter
+    del pvdb['filt:value']
+    ctx.rebuild_name_index()
+    assert not ctx._is_hosted('filt:value')
+    assert ctx._is_hosted('filt:added')
+
+    # Replacing an entry without a rebuild does not hide the new name
+    pvdb['filt:replaced'] = pvdb.pop('filt:added')
+    assert ctx._is_hosted('filt:replaced')
+    assert not ctx._is_hosted('filt:added')
+
+
+def test_write_many(server, prefix):
+    from caproto.server import PVGroup, pvproperty
+    from caproto.threading.client import Context
+
+    num_pvs = 20
+
+    class Trigger(PVGroup):
+        trigger = pvproperty(value=0)
+
+        @trigger.putter
+        async def trigger(self, instance, value):
+            await self.write_many(
+                {f'value{idx}': value + idx for idx in range(num_pvs)},
+                timestamp=1_700_000_000.5,
+            )
+
+    Group = type('Group', (Trigger, ), {
+        f'value{idx}': pvproperty(value=0.0, name=f'value{idx}')
+        for idx in range(num_pvs)
+    })
+    group = Group(prefix=prefix)
+
+    def client():
+        ctx = Context()
+        try:
+            pvs = ctx.get_pvs(
+                f'{prefix}trigger',
+                *(f'{prefix}value{idx}' for idx in range(num_pvs))
+            )
+            for pv in pvs:
+                pv.wait_for_connection(timeout=10)
+            trigger, *value_pvs = pvs
+
+            responses = []
+
+            def callback(sub, response):
+                responses.append((sub.pv.name, response))
+
+            subs = [pv.subscribe(data_type='time') for pv in value_pvs]
+            for sub in subs:
+                sub.add_callback(callback)
+
+            deadline = time.monotonic() + 10
+            while len(responses) < num_pvs and time.monotonic() < deadline:
+                time.sleep(0.05)
+
+            trigger.write(10, wait=True)
+            while len(responses) < 2 * num_pvs and time.monotonic() < deadline:
+                time.sleep(0.05)
+
+            updates = dict(responses[num_pvs:])
+            assert len(updates) == num_pvs
+            for idx in range(num_pvs):
+                response = updates[f'{prefix}value{idx}']
+                assert response.data[0] == 10 + idx
+                assert response.metadata.timestamp == 1_700_000_000.5
+        finally:
+            ctx.disconnect()
+
+    server(pvdb=group.pvdb, client=client, threaded_client=True)
+
+
+def test_subscription_batch_held_until_end():
+    from caproto.asyncio.server import VirtualCircuit
+    from caproto.server.common import BATCH_END, BATCH_START
+
+    class Update:
+        def __init__(self, subscriptionid):
+            self.subscriptionid = subscriptionid
+
+        def __len__(self):
+            return 16
+
+    class Circuit(VirtualCircuit):
+        def __init__(self):
+            self.subscription_queue = asyncio.Queue()
+            self.events_on = asyncio.Event()
+            self.subscriptions = {None: [Update(idx) for idx in range(3)]}
+            self.time_events_toggled = time.monotonic()
+            self.log = logging.getLogger('caproto.circ')
+            self.sent = []
+
+        async def send(self, *commands):
+            self.sent.append([command.subscriptionid for command in commands])
+
+    async def test():
+        circuit = Circuit()
+        task = asyncio.create_task(circuit.subscription_queue_loop())
+        updates = [Update(idx) for idx in range(3)]
+        await asyncio.sleep(0.01)
+        # The loop is waiting in low-latency mode; the first update of the
+        # batch is not sent on its own.
+        await circuit.subscription_queue.put(BATCH_START)
+        await circuit.subscription_queue.put(weakref.ref(updates[0]))
+        # ... nor once the high-load timeout has passed
+        await asyncio.sleep(0.05)
+        assert circuit.sent == []
+        for update in updates[1:]:
+            await circuit.subscription_queue.put(weakref.ref(update))
+        await circuit.subscription_queue.put(BATCH_END)
+        await asyncio.sleep(0.01)
+        assert circuit.sent == [[0, 1, 2]]
+
+        # Updates outside of a batch are sent right away
+        await circuit.subscription_queue.put(weakref.ref(updates[0]))
+        await asyncio.sleep(0.01)
+        assert circuit.sent == [[0, 1, 2], [0]]
+        task.cancel()
+
+    asyncio.run(test())
@@ -0,0 +1,173 @@
+import queue
+
+import pytest
+
+import caproto as ca
+from caproto._commands import extract_data
+from caproto._shared_memory import (SLOT_HEADER_SIZE, SharedMemoryReference,
+                                    SharedMemoryRing,
+                                    read_shared_memory_reference)
+
+from . import conftest
+from .conftest import assert_array_equal
+
+numpy = pytest.importorskip('numpy')
+
+
+@pytest.mark.parametrize(
+    'address, our_address, expected',
+    [(('127.0.0.1', 5064), None, True),
+     (('10.0.0.2', 5064), ('10.0.0.2', 5064), True),
+     (('10.0.0.2', 5064), ('10.0.0.1', 5064), False),
+     (('10.0.0.2', 5064), None, False),
+     (('unset', 0), ('unset', 0), False),
+     ]
+)
+def test_is_same_host(address, our_address, expected):
+    assert ca.is_same_host(address, our_address) == expected
+
+
+@pytest.mark.parametrize('data_type', [ca.ChannelType.DOUBLE,
+                                       ca.ChannelType.TIME_DOUBLE])
+@pytest.mark.parametrize('values', [numpy.arange(1000, dtype=float),
+                                    list(range(1000))])
+def test_shared_memory_round_trip(data_type, values):
+    ring = SharedMemoryRing(num_slots=2)
+    metadata = (ca.DBR_TYPES[data_type]()
+                if data_type != ca.ChannelType.DOUBLE else None)
+    try:
+        command = ca.EventAddResponse(
+            data=bytes(ring.write(values, data_type, len(values))),
+            data_type=data_type, data_count=len(values), status=1,
+            subscriptionid=0, metadata=metadata,
+        )
+        # Round-trip over the wire
+        payload = bytearray(b''.join(bytes(buf) for buf in command.buffers))
+        response = ca.EventAddResponse.from_wire(command.header, payload)
+        assert response.payload_size < 200
+        metadata, reference = response.buffers
+        assert_array_equal(
+            extract_data(read_shared_memory_reference(reference),
+                         data_type, len(values)),
+            values)
+
+        # Overwrite the slot by writing twice more.
+        ring.write(values, data_type, len(values))
+        ring.write(values, data_type, len(values))
+        with pytest.raises(ca.CaprotoRuntimeError):
+            read_shared_memory_reference(reference)
+    finally:
+        ring.close()
+
+
+def test_invalid_shared_memory_reference():
+    ring = SharedMemoryRing(num_slots=1)
+    try:
+        ref = ring.write(numpy.zeros(100), ca.ChannelType.DOUBLE, 100)
+        for offset, nbytes in [(0, 800), (ring.shm.size, 8),
+                               (SLOT_HEADER_SIZE, ring.shm.size)]:
+            bad = SharedMemoryReference.from_buffer_copy(ref)
+            bad.offset, bad.nbytes = offset, nbytes
+            with pytest.raises(ca.CaprotoRuntimeError):
+                read_shared_memory_reference(bytes(bad))
+
+        bad = SharedMemoryReference.from_buffer_copy(ref)
+        bad.name = b'not_caproto'
+        with pytest.raises(ca.CaprotoRuntimeError):
+            read_shared_memory_reference(bytes(bad))
+    finally:
+        ring.close()
+
+
+def test_shared_memory_reference_not_read_unless_requested():
+    ring = SharedMemoryRing(num_slots=1)
+    try:
+        values = numpy.arange(100, dtype=float)
+        data = bytes(ring.write(values, ca.ChannelType.DOUBLE, 100))
+    finally:
+        ring.close()
+
+    circuit = ca.VirtualCircuit(ca.CLIENT, ('127.0.0.1', 5064), 0)
+    circuit.our_address = ('127.0.0.1', 50000)
+    chan = ca.ClientChannel('pv', circuit, cid=1)
+    for command in (ca.VersionRequest(0, ca.DEFAULT_PROTOCOL_VERSION),
+                    ca.VersionResponse(ca.DEFAULT_PROTOCOL_VERSION),
+                    chan.create(),
+                    ca.CreateChanResponse(ca.ChannelType.DOUBLE, 100, 1, 2),
+                    ca.AccessRightsResponse(1, 3)):
+        circuit._process_command(
+            ca.CLIENT if command.DIRECTION is ca.REQUEST else ca.SERVER,
+            command)
+
+    circuit._process_command(ca.CLIENT, chan.subscribe(subscriptionid=5))
+    response = ca.EventAddResponse(data, ca.ChannelType.DOUBLE, 100, 1, 5)
+    circuit._process_command(ca.SERVER, response)
+    # The reference is left as-is, and the (removed) segment is not mapped
+    assert bytes(response.buffers[1]) == data
+
+
+def test_shared_memory_ring_resize():
+    ring = SharedMemoryRing(num_slots=2)
+    try:
+        ring.write(numpy.zeros(10), ca.ChannelType.DOUBLE, 10)
+        name = ring.shm.name
+        ring.write(numpy.zeros(20), ca.ChannelType.DOUBLE, 5)
+        assert ring.shm.name == name
+        ref = ring.write(numpy.zeros(1000), ca.ChannelType.DOUBLE, 1000)
+        assert ring.shm.name != name
+        assert ref.nbytes == 8000
+    finally:
+        ring.close()
+
+
+def test_is_shared_memory_reference():
+    ring = SharedMemoryRing(num_slots=1)
+    try:
+        ref = bytes(ring.write(numpy.zeros(100), ca.ChannelType.DOUBLE, 100))
+    finally:
+        ring.close()
+
+    assert ca.is_shared_memory_reference(ref, ca.ChannelType.DOUBLE, 100)
+    # Too short for a reference
+    assert not ca.is_shared_memory_reference(ref[:16], ca.ChannelType.DOUBLE,
+                                             100)
+    # Long enough to hold the values
+    assert not ca.is_shared_memory_reference(ref, ca.ChannelType.DOUBLE, 10)
+    # Values which happen to start like a reference
+    assert not ca.is_shared_memory_reference(ref, ca.ChannelType.CHAR,
+                                             len(ref))
+
+
+@pytest.mark.parametrize('shared_memory', [True, False])
+def test_subscription_shared_memory(prefix, shared_memory):
+    from caproto.threading.client import Context
+
+    length = 100_000
+    pvname = f'{prefix}waveform'
+    pvdb = {pvname: ca.ChannelDouble(value=numpy.arange(length, dtype=float),
+                                     max_length=length)}
+
+    def client():
+        ctx = Context()
+        try:
+            pv, = ctx.get_pvs(pvname)
+            pv.wait_for_connection(timeout=10)
+            responses = queue.Queue()
+
+            def callback(sub, response):
+                responses.put(response)
+
+            sub = pv.subscribe(data_type='time', shared_memory=shared_memory)
+            sub.add_callback(callback)
+            response = responses.get(timeout=10)
+            assert (response.payload_size < 1000) == shared_memory
+            assert_array_equal(response.data, numpy.arange(length))
+
+            pv.write(numpy.ones(length), wait=True)
+            response = responses.get(timeout=10)
+            assert (response.payload_size < 1000) == shared_memory
+            assert_array_equal(response.data, numpy.ones(length))
+        finally:
+            ctx.disconnect()
+
+    conftest.asyncio_runner(pvdb, client, threaded_client=True)
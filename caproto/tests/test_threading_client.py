@@ -799,3 +799,110 @@ def test_time_since_last_heard(context, ioc):
     assert address == pv.circuit_manager.circuit.address
     assert 0 < t < 10
     pv.time_since_last_heard() - t < 10  # wide tolerance here for slow CI
+
+
+def test_search_cache(context, ioc):
+    pv, = context.get_pvs(ioc.pvs['str'])
+    pv.wait_for_connection(timeout=10)
+    address = pv.circuit_manager.circuit.address
+    search_cache = context.broadcaster.search_cache
+    # Results with channels on live circuits are never stale
+    assert search_cache.get(pv.name, threshold=0) == address
+    # nor are they forgotten when the server may have restarted.
+    search_cache.invalidate_server(address)
+    assert search_cache.get(pv.name, threshold=0) == address
+
+    pv.circuit_manager.disconnect()
+    assert pv.name not in search_cache
+
+
+@pytest.mark.parametrize('policy', ['drop-oldest', 'latest', 'block'])
+def test_callback_overflow_policy(ioc, shared_broadcaster, policy):
+    context = Context(shared_broadcaster, callback_queue_size=2,
+                      callback_overflow_policy=policy)
+    pv, = context.get_pvs(ioc.pvs['int'])
+    pv.wait_for_connection(timeout=10)
+
+    monitor_values = []
+    in_callback = threading.Lock()
+
+    def callback(sub, response):
+        # Callbacks of one subscription never run concurrently.
+        assert in_callback.acquire(blocking=False)
+        monitor_values.append(response.data[0])
+        time.sleep(0.05)
+        in_callback.release()
+
+    sub = pv.subscribe()
+    sub.add_callback(callback)
+    wait_for(lambda: monitor_values, timeout=5)
+    for value in range(1, 11):
+        pv.write((value, ), wait=True)
+    wait_for(lambda: monitor_values[-1] == 10, timeout=5)
+    time.sleep(0.1)  # Wait for the last callback to return.
+
+    stats = sub.callback_statistics
+    assert stats['max_depth'] <= 2
+    assert stats['processed'] == len(monitor_values)
+    assert monitor_values[1:] == sorted(monitor_values[1:])
+    if policy == 'block':
+        assert monitor_values[1:] == list(range(1, 11))
+        assert stats['dropped'] == 0
+    else:
+        assert stats['dropped'] > 0
+        assert len(monitor_values) + stats['dropped'] == 11
+    sub.clear()
+    context.disconnect()
+
+
+def test_subscription_coalescing(ioc, shared_broadcaster):
+    context = Context(shared_broadcaster)
+    pv, = context.get_pvs(ioc.pvs['int'])
+    pv.wait_for_connection(timeout=10)
+
+    deliveries = []
+
+    def callback(sub, response):
+        deliveries.append((time.monotonic(), response.data[0]))
+
+    sub = pv.subscribe(coalesce_interval=0.2)
+    assert sub is not pv.subscribe()
+    sub.add_callback(callback)
+    wait_for(lambda: deliveries, timeout=5)
+    for value in range(1, 11):
+        pv.write((value, ), wait=True)
+    # Only the most recent value is handed over, once the interval is up.
+    wait_for(lambda: deliveries[-1][1] == 10, timeout=5)
+    time.sleep(0.3)
+
+    times = [delivered_at for delivered_at, _ in deliveries]
+    assert all(b - a >= 0.19 for a, b in zip(times, times[1:]))
+    assert sub.dropped_updates > 0
+    assert len(deliveries) + sub.dropped_updates == 11
+    assert sub.callback_statistics['processed'] == len(deliveries)
+    sub.clear()
+    context.disconnect()
+
+
+def test_callback_overflow_policy_validated():
+    with pytest.raises(ca.CaprotoValueError):
+        Context(callback_overflow_policy='oldest')
+
+
+def test_selector_shards(ioc, shared_broadcaster):
+    context = Context(shared_broadcaster, selector_shards=3)
+    assert len(context.selector.threads) == 3
+    pv, = context.get_pvs(ioc.pvs['int'])
+    pv.wait_for_connection(timeout=10)
+    pv.read()
+
+    stats = context.selector.statistics
+    assert [shard['shard'] for shard in stats] == [0, 1, 2]
+    assert sum(shard['sockets'] for shard in stats) == 1
+    busy, = [shard for shard in stats if shard['sockets']]
+    assert busy['receives'] > 0
+    assert busy['bytes_received'] > 0
+    assert 0 <= busy['utilization'] <= 1
+
+    context.disconnect()
+    assert not any(thread.is_alive() for thread in context.selector.threads)
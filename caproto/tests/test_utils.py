@@ -274,3 +274,112 @@ def test_timeout_fixture():
 
     with pytest.raises(RuntimeError):
         conftest.asyncio_runner({}, client, timeout=2.0)
+
+
+@pytest.mark.parametrize('use_numpy', [True, False])
+@pytest.mark.parametrize(
+    'filter_text, previous, new, sent',
+    [('{"dbnd": {"abs": 0.5}}', [1.0], [1.2], False),
+     ('{"dbnd": {"abs": 0.5}}', [1.0], [1.7], True),
+     ('{"dbnd": {"rel": 0.5}}', [2.0], [2.9], False),
+     ('{"dbnd": {"rel": 0.5}}', [2.0], [3.1], True),
+     ('{"dbnd": {"rel": 0.5}}', [0.0], [0.0], False),
+     ('{"dbnd": {"rel": 0.5}}', [0.0], [0.1], True),
+     ('{"dbnd": {"abs": 0.5}}', [1.0, 2.0, 3.0], [1.1, 2.1, 3.1], False),
+     ('{"dbnd": {"abs": 0.5}}', [1.0, 2.0, 3.0], [1.1, 2.1, 3.6], True),
+     ('{"dbnd": {"abs": 0.5}}', [1.0, 2.0, 3.0], [1.0, 2.0], True),
+     ('{"dbnd": {"rel": 0.5, "p": "max"}}', [1.0, 100.0], [2.0, 100.0],
+      False),
+     ('{"dbnd": {"rel": 0.5, "p": "any"}}', [1.0, 100.0], [2.0, 100.0],
+      True),
+     ('{"dbnd": {"m": "rel", "d": 0.5, "p": "any"}}', [1.0, 100.0],
+      [1.1, 100.0], False),
+     ('{"dbnd": {"abs": 0.5}}', [b'abc'], [b'abc'], False),
+     ('{"dbnd": {"abs": 0.5}}', [b'abc'], [b'abd'], True),
+     ]
+)
+def test_apply_deadband_filter(monkeypatch, use_numpy, filter_text, previous,
+                               new, sent):
+    from types import SimpleNamespace
+
+    from caproto import _utils
+
+    if use_numpy:
+        np = pytest.importorskip('numpy')
+        new = np.asarray(new)
+        if new.dtype.kind == 'f':
+            # Big-endian, as stored by the numpy backend
+            new = new.astype('>f8')
+    else:
+        monkeypatch.setattr(_utils, 'np', None)
+
+    sub = SimpleNamespace(
+        channel_filter=ca.parse_channel_filter(filter_text),
+        db_entry=SimpleNamespace(log_atol=0.0, value_atol=0.0),
+        mask=ca.SubscriptionType.DBE_VALUE,
+    )
+    tracked = _utils.apply_deadband_filter(
+        previous_value=None, new_value=previous, sub=sub, flags=0,
+        host_endian='<',
+    )
+    result = _utils.apply_deadband_filter(
+        previous_value=tracked, new_value=new, sub=sub, flags=0,
+        host_endian='<',
+    )
+    assert (result is not None) == sent
+    if sent:
+        assert list(result) == list(new)
+
+
+@pytest.mark.parametrize('filter_text',
+                         ['{"dbnd": {"abs": 1, "p": "median"}}',
+                          '{"dbnd": {"m": "both", "d": 1}}',
+                          '{"dbnd": {"m": "abs"}}',
+                          ])
+def test_bad_dbnd_filters(filter_text):
+    with pytest.raises(ca.CaprotoValueError):
+        ca.parse_channel_filter(filter_text)
+
+
+def test_coalesce_buffers():
+    big = memoryview(b'x' * 10)
+    buffers = [b'a', b'', b'bc', big, b'd', b'ef']
+    coalesced = ca.coalesce_buffers(buffers, threshold=10)
+    assert [bytes(buf) for buf in coalesced] == [b'abc', bytes(big), b'def']
+    # Large buffers are passed through without a copy
+    assert coalesced[1].obj is big.obj
+    assert ca.coalesce_buffers([]) == []
+
+
+@pytest.mark.parametrize('nbytes', range(8))
+def test_consume_buffers(nbytes):
+    buffers = [b'ab', memoryview(b'cde'), b'fg']
+    remaining = ca.consume_buffers(buffers, nbytes)
+    assert b''.join(remaining) == b'abcdefg'[nbytes:]
+
+
+def test_send_buffers():
+    import socket
+    import threading
+
+    buffers = [b'x' * 100, b'y' * 1_000_000, b'z' * 10] * 4
+    expected = b''.join(buffers)
+    received = bytearray()
+
+    sender, receiver = socket.socketpair()
+    # A non-blocking socket will require partial sends of the large buffers
+    sender.setblocking(False)
+
+    def recv():
+        while len(received) < len(expected):
+            received.extend(receiver.recv(65536))
+
+    thread = threading.Thread(target=recv, daemon=True)
+    thread.start()
+    try:
+        ca.send_buffers(sender, buffers)
+        thread.join(timeout=5)
+    finally:
+        sender.close()
+        receiver.close()
+    assert received == expected
@@ -5,7 +5,7 @@
 # - forever retrying search requests for disconnected PV
 # The Context has:
 # - process search results
-# - TCP socket SelectorThread
+# - TCP socket SelectorThread (one thread per shard of the circuits)
 # - restart subscriptions
 # The VirtualCircuit has:
 # - ThreadPoolExecutor for processing user callbacks on read, write, subscribe
@@ -14,7 +14,9 @@ import concurrent.futures
 import errno
 import functools
 import getpass
+import heapq
 import inspect
+import itertools
 import logging
 import random
 import selectors
@@ -30,12 +32,14 @@ import caproto as ca
 
 from .._constants import (MAX_ID, RESPONSIVENESS_TIMEOUT,
                           SEARCH_MAX_DATAGRAM_BYTES, STALE_SEARCH_EXPIRATION)
-from .._utils import (CaprotoError, CaprotoKeyError, CaprotoNetworkError,
-                      CaprotoRuntimeError, CaprotoTimeoutError,
-                      CaprotoTypeError, CaprotoValueError, ThreadsafeCounter,
-                      adapt_old_callback_signature, batch_requests,
-                      safe_getsockname, socket_bytes_available)
+from .._utils import (CaprotoError, CaprotoNetworkError, CaprotoRuntimeError,
+                      CaprotoTimeoutError, CaprotoTypeError, CaprotoValueError,
+                      ThreadsafeCounter, adapt_old_callback_signature,
+                      batch_requests, safe_getsockname, send_buffers,
+                      socket_bytes_available)
 from ..client import common
+from ..client.search_results import SearchCache
+from ..client.search_scheduler import SearchScheduler
 
 ch_logger = logging.getLogger('caproto.ch')
 search_logger = logging.getLogger('caproto.bcast.search')
@@ -142,14 +146,18 @@ class ContextDisconnectedError(ThreadingClientException):
     ...
 
 
-class SelectorThread:
+class _SelectorShard:
     """
-    This is used internally by the Context and the VirtualCircuitManager.
+    One selector, and the thread polling it, of a SelectorThread.
     """
-    def __init__(self, *, parent=None):
+    def __init__(self, owner, index, *, name='selector'):
+        self.index = index
+        self.name = name
         self.thread = None  # set by the `start` method
         self._close_event = threading.Event()
         self.selector = selectors.DefaultSelector()
+        # Removal goes through the owner, which maps sockets to shards.
+        self._remove_socket = owner.remove_socket
 
         self._register_event = threading.Event()
         self._socket_map_lock = threading.RLock()
@@ -160,16 +168,47 @@ class SelectorThread:
         self._unregister_sockets = set()
         self._object_id = 0
         self._socket_count = 0
+        # Datagrams are received into this buffer, which is reused.
+        self._datagram_buffer = bytearray(4096)
 
-        if parent is not None:
-            # Stop the selector if the parent goes out of scope
-            self._parent = weakref.ref(parent, lambda obj: self.stop())
+        # Statistics:
+        self.started_at = None
+        self.wakeups = 0
+        self.receives = 0
+        self.bytes_received = 0
+        self.busy_time = 0.0
 
     @property
     def running(self):
         '''Selector thread is running'''
         return not self._close_event.is_set()
 
+    @property
+    def statistics(self):
+        """
+        Load metrics for the shard.
+
+        Returns
+        -------
+        stats : dict
+            With keys ``shard``, ``sockets``, ``wakeups`` (polls which found
+            sockets ready to read), ``receives``, ``bytes_received``,
+            ``busy_time`` (seconds spent receiving and processing) and
+            ``utilization``, the fraction of the time since the start that
+            the thread was busy.
+        """
+        elapsed = (time.monotonic() - self.started_at
+                   if self.started_at is not None else 0.0)
+        return dict(
+            shard=self.index,
+            sockets=len(self.socket_to_id),
+            wakeups=self.wakeups,
+            receives=self.receives,
+            bytes_received=self.bytes_received,
+            busy_time=self.busy_time,
+            utilization=self.busy_time / elapsed if elapsed > 0 else 0.0,
+        )
+
     def stop(self):
         self._close_event.set()
 
@@ -179,16 +218,13 @@ class SelectorThread:
     def start(self):
         if self._close_event.is_set():
             raise CaprotoRuntimeError("Cannot be restarted once stopped.")
+        self.started_at = time.monotonic()
         self.thread = threading.Thread(target=self, daemon=True,
-                                       name='selector')
+                                       name=self.name)
         self.thread.start()
 
     def add_socket(self, sock, target_obj):
-        assert isinstance(sock, socket.socket)
         with self._socket_map_lock:
-            if sock in self.socket_to_id:
-                raise CaprotoValueError('Socket already added')
-
             sock.setblocking(False)
 
             # assumption: only one sock per object
@@ -196,8 +232,6 @@ class SelectorThread:
             self.objects[self._object_id] = target_obj
             self.socket_to_id[sock] = self._object_id
             self._register_sockets[sock] = self._object_id
-            weakref.finalize(target_obj,
-                             lambda sock=sock: self.remove_socket(sock))
             # self.log.debug('Socket %s was added (obj %s)', sock, target_obj)
 
     def remove_socket(self, sock):
@@ -241,6 +275,11 @@ class SelectorThread:
                 continue
 
             events = self.selector.select(timeout=0.1)
+            if not events:
+                continue
+
+            t0 = time.monotonic()
+            self.wakeups += 1
             with self._socket_map_lock:
                 if self._unregister_sockets:
                     # some sockets may be affected here; try again
@@ -253,11 +292,23 @@ class SelectorThread:
                 if sock in self._unregister_sockets:
                     continue
 
-                # TODO: consider thread pool for recv and command_loop
                 try:
                     bytes_available = socket_bytes_available(
                         sock, available_buffer=avail_buf)
-                    bytes_recv, address = sock.recvfrom(bytes_available)
+                    if sock.type == socket.SOCK_STREAM:
+                        # Receive directly into the circuit's buffer.
+                        recv_buffer = obj.get_recv_buffer(bytes_available)
+                        bytes_recv = recv_buffer[:sock.recv_into(recv_buffer)]
+                        address = None
+                    else:
+                        # Receive into the reused buffer of this shard; the
+                        # datagram is parsed (copied) before the next one.
+                        buf = self._datagram_buffer
+                        if len(buf) < bytes_available:
+                            buf = self._datagram_buffer = bytearray(
+                                bytes_available)
+                        nbytes, address = sock.recvfrom_into(buf)
+                        bytes_recv = memoryview(buf)[:nbytes]
                 except ConnectionResetError as ex:
                     if sock.type == socket.SOCK_DGRAM:
                         # Win32: "On a UDP-datagram socket this error indicates
@@ -273,21 +324,23 @@ class SelectorThread:
                         continue
 
                     obj.log.error("Removing %s due to %s (%s)", obj, ex, ex.errno)
-                    self.remove_socket(sock)
+                    self._remove_socket(sock)
                 except OSError as ex:
                     if ex.errno != errno.EAGAIN:
                         # register as a disconnection
                         obj.log.error('Removing %s due to %s (%s)', obj, ex,
                                       ex.errno)
-                        self.remove_socket(sock)
+                        self._remove_socket(sock)
                     continue
 
+                self.receives += 1
+                self.bytes_received += len(bytes_recv)
                 try:
                     # Let objects handle disconnection by return value
                     if obj.received(bytes_recv, address) is ca.DISCONNECTED:
                         obj.log.debug('Removing %s = %s after DISCONNECTED '
                                       'return value', sock, obj)
-                        self.remove_socket(sock)
+                        self._remove_socket(sock)
                         # TODO: consider adding specific DISCONNECTED instead
                         # of b'' sent to disconnected sockets
                 except Exception as ex:
@@ -299,7 +352,103 @@ class SelectorThread:
                         obj.log.exception(
                             'Removing %s due to an internal error on receipt of '
                             'new data: %s', obj, ex)
-                        self.remove_socket(sock)
+                        self._remove_socket(sock)
+
+            self.busy_time += time.monotonic() - t0
+
+
+class SelectorThread:
+    """
+    This is used internally by the Context and the VirtualCircuitManager.
+
+    Sockets are spread across one or more shards, each with a selector and a
+    thread of its own which receives from the sockets and hands the bytes to
+    their objects. The shard of a socket is picked by hashing the address of
+    its peer.
+
+    Parameters
+    ----------
+    parent : object, optional
+        Stop the selector threads when this object goes out of scope.
+    shards : int, optional
+        The number of selector threads.
+    """
+    def __init__(self, *, parent=None, shards=1):
+        if shards < 1:
+            raise CaprotoValueError(f'At least one shard is required, not '
+                                    f'{shards}')
+        self._socket_map_lock = threading.RLock()
+        self._socket_to_shard = {}
+        self.shards = [
+            _SelectorShard(self, index,
+                           name=f'selector-{index}' if shards > 1
+                           else 'selector')
+            for index in range(shards)
+        ]
+
+        if parent is not None:
+            # Stop the selector if the parent goes out of scope
+            self._parent = weakref.ref(parent, lambda obj: self.stop())
+
+    @property
+    def running(self):
+        '''Selector threads are running'''
+        return self.shards[0].running
+
+    @property
+    def thread(self):
+        '''The thread of the first shard'''
+        return self.shards[0].thread
+
+    @property
+    def threads(self):
+        '''The threads of all shards'''
+        return [shard.thread for shard in self.shards]
+
+    @property
+    def statistics(self):
+        '''Load metrics of each shard; see _SelectorShard.statistics'''
+        return [shard.statistics for shard in self.shards]
+
+    def stop(self):
+        for shard in self.shards:
+            shard.stop()
+
+    def start(self):
+        for shard in self.shards:
+            shard.start()
+
+    def join(self, timeout=None):
+        for shard in self.shards:
+            if shard.thread is not None:
+                shard.thread.join(timeout)
+
+    def _shard_for(self, sock):
+        if len(self.shards) == 1:
+            return self.shards[0]
+        try:
+            key = sock.getpeername()
+        except OSError:
+            # Not connected, as with UDP sockets
+            key = sock.fileno()
+        return self.shards[hash(key) % len(self.shards)]
+
+    def add_socket(self, sock, target_obj):
+        assert isinstance(sock, socket.socket)
+        with self._socket_map_lock:
+            if sock in self._socket_to_shard:
+                raise CaprotoValueError('Socket already added')
+
+            shard = self._socket_to_shard[sock] = self._shard_for(sock)
+            shard.add_socket(sock, target_obj)
+            weakref.finalize(target_obj,
+                             lambda sock=sock: self.remove_socket(sock))
+
+    def remove_socket(self, sock):
+        with self._socket_map_lock:
+            shard = self._socket_to_shard.pop(sock, None)
+            if shard is not None:
+                shard.remove_socket(sock)
 
 
 class SharedBroadcaster:
@@ -330,9 +479,12 @@ class SharedBroadcaster:
         # PVs (via Context.get_pvs).
         self._search_now = threading.Event()
 
-        self.search_results = {}  # map name to (time, address)
-        # map search id (cid) to [name, queue, last_search_time, retirement_deadline]
+        # map name to the address of the server found for it
+        self.search_cache = SearchCache()
+        # map search id (cid) to (name, queue)
         self.unanswered_searches = {}
+        # when to (re-)send each unanswered search, by search id
+        self.search_scheduler = SearchScheduler()
         self.server_protocol_versions = {}  # map address to protocol version
 
         self._id_counter = ThreadsafeCounter(
@@ -351,6 +503,7 @@ class SharedBroadcaster:
         self.command_bundle_queue = Queue()
         self.last_beacon = {}
         self.last_beacon_interval = {}
+        self.last_beacon_id = {}
 
         # an event to tear down and clean up the broadcaster
         self._close_event = threading.Event()
@@ -446,15 +599,14 @@ class SharedBroadcaster:
             self.udp_sock = None
 
         self._close_event.set()
-        with self._search_lock:
-            self.search_results.clear()
+        self.search_cache.clear()
         self._registration_last_sent = 0
         self._searching_enabled.clear()
         self.broadcaster.disconnect()
         self.selector.stop()
         if wait:
             self._command_thread.join()
-            self.selector.thread.join()
+            self.selector.join()
             self._retry_unanswered_searches_thread.join()
 
     def send(self, *commands):
@@ -484,30 +636,8 @@ class SharedBroadcaster:
     def get_cached_search_result(self, name, *,
                                  threshold=STALE_SEARCH_EXPIRATION):
         'Returns address if found, raises KeyError if missing or stale.'
-        with self._search_lock:
-            address, timestamp = self.search_results[name]
-        # this block of code is only to re-fresh the time found on
-        # any PVs.  If we can find any context which has any circuit which
-        # has any channel talking to this PV name then it is not stale so
-        # re-up the timestamp to now.
-        if time.monotonic() - timestamp > threshold:
-            # TODO this is very inefficient
-            for context in self.listeners:
-                for cm in context.circuit_managers.values():
-                    if cm.connected and name in cm.all_created_pvnames:
-                        # A valid connection exists in one of our clients, so
-                        # ignore the stale result status
-                        with self._search_lock:
-                            self.search_results[name] = (address, time.monotonic())
-                        # TODO verify that addr matches address
-                        return address
-
-            with self._search_lock:
-                # Clean up expired result.
-                self.search_results.pop(name, None)
-            raise CaprotoKeyError(f'{name!r}: stale search result')
-
-        return address
+        # Results for names with channels on live circuits do not go stale.
+        return self.search_cache.get(name, threshold=threshold)
 
     def search(self, results_queue, names, *, timeout=2):
         """
@@ -533,15 +663,9 @@ class SharedBroadcaster:
         with self._search_lock:
             # We have have already searched for these names recently.
             # Filter `pv_names` down to a subset, `needs_search`.
-            needs_search = []
-            use_cached_search = defaultdict(list)
-            for name in names:
-                try:
-                    address = self.get_cached_search_result(name)
-                except KeyError:
-                    needs_search.append(name)
-                else:
-                    use_cached_search[address].append(name)
+            use_cached_search, needs_search = (
+                self.search_cache.split_cached_results(names)
+            )
 
             for address, names in use_cached_search.items():
                 results_queue.put((address, names))
@@ -549,16 +673,11 @@ class SharedBroadcaster:
             # Generate search_ids and stash them on Context state so they can
             # be used to match SearchResponses with SearchRequests.
             search_ids = []
-            # Search requests that are past their retirement deadline with no
-            # results will be searched for less frequently.
-            retirement_deadline = time.monotonic() + common.SEARCH_RETIREMENT_AGE
             for name in needs_search:
                 search_id = new_id()
                 search_ids.append(search_id)
-                # The value is a list because we mutate it to update the
-                # retirement deadline sometimes.
-                unanswered_searches[search_id] = [name, results_queue,
-                                                  0, retirement_deadline]
+                unanswered_searches[search_id] = (name, results_queue)
+            self.search_scheduler.add(*search_ids)
         self._search_now.set()
 
     def cancel(self, *names):
@@ -577,6 +696,7 @@ class SharedBroadcaster:
             for search_id, item in list(self.unanswered_searches.items()):
                 if item[0] in names:
                     del self.unanswered_searches[search_id]
+                    self.search_scheduler.remove(search_id)
 
     def search_now(self):
         """
@@ -586,6 +706,7 @@ class SharedBroadcaster:
         intervals automatically. This method is intended primarily for
         debugging and should not be needed in normal use.
         """
+        self.search_scheduler.reset()
         self._search_now.set()
 
     def received(self, bytes_recv, address):
@@ -603,7 +724,7 @@ class SharedBroadcaster:
         # end of that queue is held by Context._process_search_results.
 
         # Save doing a 'self' lookup in the inner loop.
-        search_results = self.search_results
+        search_cache = self.search_cache
         server_protocol_versions = self.server_protocol_versions
         unanswered_searches = self.unanswered_searches
         queues = defaultdict(list)
@@ -642,20 +763,30 @@ class SharedBroadcaster:
                         self._new_server_found()
                     else:
                         interval = now - self.last_beacon[address]
-                        if interval < self.last_beacon_interval.get(address, 0) / 4:
+                        if command.beacon_id < self.last_beacon_id[address]:
+                            # Beacon IDs start over when a server restarts.
+                            self.broadcaster.log.info(
+                                "Beacon ID reset: %s:%d has restarted.",
+                                *address, extra=tags)
+                            search_cache.invalidate_server(address)
+                            self._new_server_found()
+                        elif interval < self.last_beacon_interval.get(address, 0) / 4:
                             # Beacons are arriving *faster*? The server at this
                             # address may have restarted.
                             self.broadcaster.log.info(
                                 "Beacon anomaly: %s:%d may have restarted.",
                                 *address, extra=tags)
+                            search_cache.invalidate_server(address)
                             self._new_server_found()
                         self.last_beacon_interval[address] = interval
                     self.last_beacon[address] = now
+                    self.last_beacon_id[address] = command.beacon_id
                 elif isinstance(command, ca.SearchResponse):
                     cid = command.cid
                     try:
                         with self._search_lock:
-                            name, queue, *_ = unanswered_searches.pop(cid)
+                            name, queue = unanswered_searches.pop(cid)
+                        self.search_scheduler.remove(cid, answered=True)
                     except KeyError:
                         # This is a redundant response, which the EPICS
                         # spec tells us to ignore. (The first responder
@@ -665,27 +796,29 @@ class SharedBroadcaster:
                         except StopIteration:
                             continue
                         else:
-                            with self._search_lock:
-                                if name in search_results:
-                                    accepted_address, _ = search_results[name]
-                                    new_address = ca.extract_address(command)
-                                    if new_address != accepted_address:
-                                        search_logger.warning(
-                                            "PV %s with cid %d found on multiple "
-                                            "servers. Accepted address is %s:%d. "
-                                            "Also found on %s:%d",
-                                            name, cid, *accepted_address, *new_address,
-                                            extra={'pv': name,
-                                                   'their_address': accepted_address,
-                                                   'our_address': self.broadcaster.client_address})
+                            try:
+                                accepted_address = search_cache.get(
+                                    name, threshold=None)
+                            except KeyError:
+                                ...
+                            else:
+                                new_address = ca.extract_address(command)
+                                if new_address != accepted_address:
+                                    search_logger.warning(
+                                        "PV %s with cid %d found on multiple "
+                                        "servers. Accepted address is %s:%d. "
+                                        "Also found on %s:%d",
+                                        name, cid, *accepted_address, *new_address,
+                                        extra={'pv': name,
+                                               'their_address': accepted_address,
+                                               'our_address': self.broadcaster.client_address})
                     else:
                         results_by_cid.append((cid, name))
                         address = ca.extract_address(command)
                         queues[queue].append(name)
                         # Cache this to save time on future searches.
                         # (Entries expire after STALE_SEARCH_EXPIRATION.)
-                        with self._search_lock:
-                            search_results[name] = (address, now)
+                        search_cache.mark_name_found(name, address)
                         server_protocol_versions[address] = command.version
             # Send the search results to the Contexts that asked for
             # them. This is probably more general than is has to be but
@@ -697,13 +830,10 @@ class SharedBroadcaster:
         self.log.debug('Broadcaster command loop has exited.')
 
     def _new_server_found(self):
-        # Bring all the unanswered seraches out of retirement
+        # Bring all the unanswered searches out of retirement
         # to see if we have a new match.
-        retirement_deadline = time.monotonic() + common.SEARCH_RETIREMENT_AGE
-        with self._search_lock:
-            for item in self.unanswered_searches.values():
-                # give new age-out deadline
-                item[-1] = retirement_deadline
+        self.search_scheduler.reset()
+        self._search_now.set()
 
     def time_since_last_heard(self):
         """
@@ -823,78 +953,60 @@ class SharedBroadcaster:
 
     def _retry_unanswered_searches(self):
         """
-        Periodically (re-)send a SearchRequest for all unanswered searches.
+        (Re-)send a SearchRequest for unanswered searches as they become due.
 
         """
-        # Each time new searches are added, the self._search_now Event is set,
-        # and we reissue *all* unanswered searches.
+        # Each search backs off on its own, as scheduled by
+        # self.search_scheduler: it is sent as soon as it is added, then
+        # retried from an interval of MIN_RETRY_SEARCHES_INTERVAL, doubling up
+        # to MAX_RETRY_SEARCHES_INTERVAL. Searches older than
+        # SEARCH_RETIREMENT_AGE are only resent every
+        # RETRY_RETIRED_SEARCHES_INTERVAL, to minimize network traffic, until
+        # a new server is found.
         #
-        # We then frequently retry the unanswered searches that are younger
-        # than SEARCH_RETIREMENT_AGE, backing off from an interval of
-        # MIN_RETRY_SEARCHES_INTERVAL to MAX_RETRY_SEARCHES_INTERVAL. The
-        # interval is reset to MIN_RETRY_SEARCHES_INTERVAL each time new
-        # searches are added.
-        #
-        # For the searches older than SEARCH_RETIREMENT_AGE, we adopt a slower
-        # period to minimize network traffic. We only resend every
-        # RETRY_RETIRED_SEARCHES_INTERVAL or, again, whenever new searches
-        # are added.
+        # The datagrams are limited to SEARCH_DATAGRAM_RATE per second; the
+        # searches which do not fit are sent as soon as the rate allows.
         self.log.debug('Broadcaster search-retry thread has started.')
-        time_to_check_on_retirees = time.monotonic() + common.RETRY_RETIRED_SEARCHES_INTERVAL
-        interval = common.MIN_RETRY_SEARCHES_INTERVAL
+        scheduler = self.search_scheduler
+        version_req = ca.VersionRequest(0, ca.DEFAULT_PROTOCOL_VERSION)
+        max_batch_bytes = SEARCH_MAX_DATAGRAM_BYTES - len(version_req)
         while not self._close_event.is_set():
-            try:
-                self._searching_enabled.wait(0.5)
-            except TimeoutError:
+            if not self._searching_enabled.wait(0.5):
                 # Here we go check on self._close_event before waiting again.
                 continue
 
             t = time.monotonic()
-
-            # filter to just things that need to go out
-            def _construct_search_requests(items):
-                for search_id, it in items:
-                    yield ca.SearchRequest(it[0], search_id,
-                                           ca.DEFAULT_PROTOCOL_VERSION)
-                    # reset the last time this was sent
-                    it[-2] = t
-
+            due = scheduler.pop_due(t)
             with self._search_lock:
-                if t >= time_to_check_on_retirees:
-                    items = list(self.unanswered_searches.items())
-                    time_to_check_on_retirees += common.RETRY_RETIRED_SEARCHES_INTERVAL
-                else:
-                    # Skip over searches that haven't gotten any results in
-                    # SEARCH_RETIREMENT_AGE.
-                    items = list((search_id, it)
-                                 for search_id, it in self.unanswered_searches.items()
-                                 if (it[-1] > t))
-
-            # only send requests who we last sent at least interval in the past
-            resend_deadline = t - interval
-            items = [(sid, it) for sid, it in items if it[-2] < resend_deadline]
-            requests = _construct_search_requests(items)
-
-            if not self._searching_enabled.is_set():
-                continue
-
-            if items:
-                self.search_log.debug('Sending %d SearchRequests', len(items))
-
-            version_req = ca.VersionRequest(0, ca.DEFAULT_PROTOCOL_VERSION)
-            for batch in batch_requests(requests,
-                                        SEARCH_MAX_DATAGRAM_BYTES - len(version_req)):
+                requests = [
+                    ca.SearchRequest(self.unanswered_searches[search_id][0],
+                                     search_id, ca.DEFAULT_PROTOCOL_VERSION)
+                    for search_id in due
+                    if search_id in self.unanswered_searches
+                ]
+
+            if requests:
+                self.search_log.debug('Sending %d SearchRequests',
+                                      len(requests))
+
+            unsent = []
+            for batch in batch_requests(requests, max_batch_bytes):
+                if (unsent or not self._searching_enabled.is_set() or
+                        not scheduler.acquire_datagram(t)):
+                    unsent.extend(req.cid for req in batch)
+                    continue
                 self.send(version_req, *batch)
+                scheduler.mark_sent([req.cid for req in batch], t)
 
-            wait_time = max(0, interval - (time.monotonic() - t))
-            # Double the interval for the next loop.
-            interval = min(2 * interval, common.MAX_RETRY_SEARCHES_INTERVAL)
+            if unsent:
+                scheduler.requeue(unsent)
+
+            wait_time = scheduler.time_until_due()
+            if wait_time is None or wait_time > 0.5:
+                # Check on self._close_event at least this often.
+                wait_time = 0.5
             if self._search_now.wait(wait_time):
-                # New searches have been requested. Reset the interval between
-                # subseqent searches and force a check on the "retirees".
-                time_to_check_on_retirees = t
-                interval = common.MIN_RETRY_SEARCHES_INTERVAL
-            self._search_now.clear()
+                self._search_now.clear()
 
         self.log.debug('Broadcaster search-retry thread has exited.')
 
@@ -925,20 +1037,41 @@ class Context:
         uses value of ``getpass.getuser()`` by default
     max_workers : integer, optional
         Number of worker threaders *per VirtualCircuit* for executing user
-        callbacks. Default is 1. For any number of workers, workers will
-        receive updates in the order which they are received from the server.
-        That is, work on each update will *begin* in sequential order.
-        Work-scheduling internal to the user callback is outside caproto's
-        control. If the number of workers is set to greater than 1, the work on
-        each update may not *finish* in a deterministic order. For example, if
-        workers are writing lines into a file, the only way to guarantee that
-        the lines are ordered properly is to use only one worker. If ordering
-        matters for your application, think carefully before increasing this
-        value from 1.
+        callbacks. Default is 1. The callbacks of each subscription receive
+        updates one at a time, in the order which they are received from the
+        server, regardless of the number of workers. With more than 1 worker,
+        the callbacks of different subscriptions may run concurrently, and
+        the work on updates of different subscriptions may not *finish* in a
+        deterministic order. If ordering across PVs matters for your
+        application, think carefully before increasing this value from 1.
+    callback_queue_size : integer, optional
+        The maximum number of updates of each subscription waiting for its
+        callbacks, or 0 for no limit. By default, this is set by
+        ``CAPROTO_CLIENT_CALLBACK_QUEUE_SIZE`` (1000).
+    callback_overflow_policy : {'drop-oldest', 'latest', 'block'}, optional
+        What to do with an update when ``callback_queue_size`` updates are
+        already waiting: drop the oldest waiting update, drop all waiting
+        updates but the new one, or block further messages from the server
+        until the callbacks catch up. By default, this is set by
+        ``CAPROTO_CLIENT_CALLBACK_OVERFLOW_POLICY`` ('drop-oldest').
+    selector_shards : integer, optional
+        Number of threads receiving from the circuits, each polling the
+        sockets of a share of the servers. Load metrics for each are given by
+        ``Context.selector.statistics``. By default, this is set by
+        ``CAPROTO_CLIENT_SELECTOR_SHARDS`` (1).
     """
     def __init__(self, broadcaster=None, *,
                  timeout=common.GLOBAL_DEFAULT_TIMEOUT,
-                 host_name=None, client_name=None, max_workers=1):
+                 host_name=None, client_name=None, max_workers=1,
+                 callback_queue_size=common.CALLBACK_QUEUE_SIZE,
+                 callback_overflow_policy=common.CALLBACK_OVERFLOW_POLICY,
+                 selector_shards=common.SELECTOR_SHARDS):
+        if callback_overflow_policy not in common.CALLBACK_OVERFLOW_POLICIES:
+            raise CaprotoValueError(
+                f'Unknown callback overflow policy '
+                f'{callback_overflow_policy!r}; expected one of '
+                f'{common.CALLBACK_OVERFLOW_POLICIES}'
+            )
         if broadcaster is None:
             broadcaster = SharedBroadcaster()
         self.broadcaster = broadcaster
@@ -949,6 +1082,8 @@ class Context:
         if client_name is None:
             client_name = getpass.getuser()
         self.max_workers = max_workers
+        self.callback_queue_size = callback_queue_size
+        self.callback_overflow_policy = callback_overflow_policy
         self.client_name = client_name
         self.log = logging.LoggerAdapter(
             logging.getLogger('caproto.ctx'), {'role': 'CLIENT'})
@@ -965,6 +1100,8 @@ class Context:
         self.subscriptions_lock = threading.RLock()
         self.subscriptions_to_activate = defaultdict(set)
         self.activate_subscriptions_now = threading.Event()
+        # Hands over coalesced subscription updates once they are due
+        self._delivery_timer = _DeliveryTimer()
 
         self._process_search_results_thread = threading.Thread(
             target=self._process_search_results_loop,
@@ -976,7 +1113,7 @@ class Context:
             daemon=True, name='activate_subscriptions')
         self._activate_subscriptions_thread.start()
 
-        self.selector = SelectorThread(parent=self)
+        self.selector = SelectorThread(parent=self, shards=selector_shards)
         self.selector.start()
         self._user_disconnected = False
 
@@ -1074,8 +1211,7 @@ class Context:
             name, _ = key
             names.append(name)
             # If there is a cached search result for this name, expire it.
-            with self.broadcaster._search_lock:
-                self.broadcaster.search_results.pop(name, None)
+            self.broadcaster.search_cache.discard(name)
             with self.pv_cache_lock:
                 self.pvs_needing_circuits[name].add(pv)
 
@@ -1233,13 +1369,15 @@ class Context:
             self.log.debug('Clearing circuit managers')
             self.circuit_managers.clear()
 
-            self.log.debug("Stopping SelectorThread of the context")
+            self.log.debug("Stopping SelectorThreads of the context")
             self.selector.stop()
+            self._delivery_timer.stop()
 
             if wait:
                 self._process_search_results_thread.join()
                 self._activate_subscriptions_thread.join()
-                self.selector.thread.join()
+                self.selector.join()
+                self._delivery_timer.join()
 
             self.log.debug('Context disconnection complete')
 
@@ -1263,7 +1401,7 @@ class VirtualCircuitManager:
     this is rarely necessary.
     """
     __slots__ = ('context', 'circuit', 'channels', 'ioids', '_ioid_counter',
-                 'subscriptions', '_ready', 'log',
+                 'subscriptions', '_ready', '_send_lock', 'log',
                  'socket', 'selector', 'pvs', 'all_created_pvnames',
                  'dead', 'process_queue', 'processing',
                  '_subscriptionid_counter', 'user_callback_executor',
@@ -1291,6 +1429,8 @@ class VirtualCircuitManager:
         self._ioid_counter = ThreadsafeCounter()
         self._subscriptionid_counter = ThreadsafeCounter()
         self._ready = threading.Event()
+        # Partial sends must not be interleaved between threads:
+        self._send_lock = threading.Lock()
 
         # Connect.
         if self.circuit.states[ca.SERVER] is ca.IDLE:
@@ -1338,15 +1478,26 @@ class VirtualCircuitManager:
         # be send, and convert them to buffers.
         sock = self.socket
         if sock is not None:
-            buffers_to_send = self.circuit.send(*commands, extra=extra)
-            sock.sendall(b"".join(buffers_to_send))
+            with self._send_lock:
+                buffers_to_send = self.circuit.send(*commands, extra=extra)
+                send_buffers(sock, buffers_to_send)
+
+    def get_recv_buffer(self, sizehint):
+        """Get the circuit buffer that the next bytes should be received into.
+
+        This will be run on the recv thread"""
+        return self.circuit.get_recv_buffer(sizehint)
 
     def received(self, bytes_recv, address):
         """Receive and process and next command from the virtual circuit.
 
+        ``bytes_recv`` is the portion of :meth:`get_recv_buffer` that was
+        written to, so the bytes are not copied again.
+
         This will be run on the recv thread"""
         self.last_tcp_receipt = time.monotonic()
-        commands, num_bytes_needed = self.circuit.recv(bytes_recv)
+        commands, num_bytes_needed = self.circuit.recv_buffer_updated(
+            len(bytes_recv))
 
         for c in commands:
             self._process_command(c)
@@ -1461,6 +1612,8 @@ class VirtualCircuitManager:
             pv = self.pvs[command.cid]
             chan = self.channels[command.cid]
             self.all_created_pvnames.append(pv.name)
+            self.context.broadcaster.search_cache.mark_channel_created(
+                pv.name, self.circuit.address)
             with pv.component_lock:
                 pv.channel = chan
                 pv.channel_ready.set()
@@ -1505,9 +1658,9 @@ class VirtualCircuitManager:
             if event is not None:
                 event.set()
 
-        with self.context.broadcaster._search_lock:
-            for n in self.all_created_pvnames:
-                self.context.broadcaster.search_results.pop(n, None)
+        search_cache = self.context.broadcaster.search_cache
+        for n in self.all_created_pvnames:
+            search_cache.mark_channel_disconnected(n, self.circuit.address)
 
         self.all_created_pvnames.clear()
         for pv in self.pvs.values():
@@ -1913,7 +2066,8 @@ class PV:
         return ioid_info['response']
 
     def subscribe(self, data_type=None, data_count=None,
-                  low=0.0, high=0.0, to=0.0, mask=None):
+                  low=0.0, high=0.0, to=0.0, mask=None, shared_memory=False,
+                  coalesce_interval=None):
         """
         Start a new subscription to which user callback may be added.
 
@@ -1929,6 +2083,19 @@ class PV:
             deprecated by Channel Access, not yet implemented by caproto
         mask :  SubscriptionType, optional
             Subscribe to selective updates.
+        shared_memory : bool, optional
+            If the server is on this host, request that large array values be
+            passed by way of shared memory instead of over TCP. The values
+            are copied out of shared memory as each update is received.
+            Servers which do not support this send values as usual.
+        coalesce_interval : float, optional
+            For consumers which only need the current value, such as
+            displays: seconds between updates handed to the callbacks. Only
+            the most recent update is kept, and handed over at most once per
+            interval, once the callbacks have returned from the previous one.
+            The others are dropped, and counted by
+            :attr:`Subscription.dropped_updates`. By default, all updates are
+            handed over.
 
         Returns
         -------
@@ -1955,14 +2122,16 @@ class PV:
         """
         # A Subscription is uniquely identified by the Signature created by its
         # args and kwargs.
-        bound = SUBSCRIBE_SIG.bind(data_type, data_count, low, high, to, mask)
+        bound = SUBSCRIBE_SIG.bind(data_type, data_count, low, high, to,
+                                   mask, shared_memory, coalesce_interval)
         key = tuple(bound.arguments.items())
         try:
             sub = self.subscriptions[key]
         except KeyError:
             sub = Subscription(self,
                                data_type, data_count,
-                               low, high, to, mask)
+                               low, high, to, mask, shared_memory,
+                               coalesce_interval)
             self.subscriptions[key] = sub
         # The actual EPICS messages will not be sent until the user adds
         # callbacks via sub.add_callback(user_func).
@@ -2006,14 +2175,255 @@ class PV:
     #     return id((self.context, self.circuit_manager, self.name))
 
 
+class _DeliveryTimer:
+    """
+    Hands coalesced updates to their CallbackLanes once they are due.
+
+    One thread, started on first use, serves all of the lanes of a Context.
+    """
+    def __init__(self, name='coalesce'):
+        self.name = name
+        self._queue = []  # heap of (due, count, lane)
+        self._counter = itertools.count()
+        self._condition = threading.Condition()
+        self._thread = None
+        self._stopped = False
+
+    def schedule(self, due, lane):
+        "Have ``lane`` deliver its update at ``due`` (by time.monotonic)."
+        with self._condition:
+            if self._stopped:
+                return
+            heapq.heappush(self._queue, (due, next(self._counter), lane))
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, daemon=True,
+                                                name=self.name)
+                self._thread.start()
+            self._condition.notify()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._stopped:
+                    timeout = (self._queue[0][0] - time.monotonic()
+                               if self._queue else None)
+                    if timeout is not None and timeout <= 0:
+                        break
+                    self._condition.wait(timeout)
+                if self._stopped:
+                    return
+                _, _, lane = heapq.heappop(self._queue)
+
+            lane._deliver()
+
+    def stop(self):
+        with self._condition:
+            self._stopped = True
+            self._queue.clear()
+            self._condition.notify()
+
+    def join(self, timeout=None):
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+
+class CallbackLane:
+    """
+    Runs the user callbacks of a CallbackHandler, one update at a time.
+
+    Updates are queued and handed to the circuit's ThreadPoolExecutor one at
+    a time, such that callbacks receive them in order and never concurrently.
+    At most one job per lane is submitted to the executor, so a slow callback
+    holds up only its own lane.
+
+    Parameters
+    ----------
+    handler : CallbackHandler
+    maxsize : int or None, optional
+        The maximum number of updates waiting for the callbacks. None or 0 for
+        no limit.
+    overflow_policy : {'drop-oldest', 'latest', 'block'}, optional
+        When ``maxsize`` updates are already waiting: drop the oldest update,
+        drop all but the most recent update, or block the thread queuing
+        updates (that is, stop reading from the circuit) until there is room.
+    coalesce_interval : float or None, optional
+        If given, keep only the most recent update, handing it to the
+        callbacks at most once per this many seconds, and only once they have
+        returned from the previous one. Takes precedence over ``maxsize``.
+    """
+    def __init__(self, handler, maxsize=None, overflow_policy='block',
+                 coalesce_interval=None):
+        if overflow_policy not in common.CALLBACK_OVERFLOW_POLICIES:
+            raise CaprotoValueError(
+                f'Unknown callback overflow policy {overflow_policy!r}; '
+                f'expected one of {common.CALLBACK_OVERFLOW_POLICIES}'
+            )
+        self.handler = handler
+        self.maxsize = maxsize or None
+        self.overflow_policy = overflow_policy
+        self.coalesce_interval = coalesce_interval
+        self._queue = deque()
+        self._condition = threading.Condition()
+        self._executor = None
+        self._running = False
+        # Coalescing: the time of the last delivery, and whether the next is
+        # waiting on the timer.
+        self._timer = None
+        self._last_delivery = None
+        self._scheduled = False
+        # Statistics:
+        self.processed = 0
+        self.dropped = 0
+        self.max_depth = 0
+        self.max_latency = 0.0
+        self.total_latency = 0.0
+
+    def __len__(self):
+        return len(self._queue)
+
+    @property
+    def statistics(self):
+        """
+        Statistics on the updates handled.
+
+        Returns
+        -------
+        stats : dict
+            With keys ``depth`` and ``max_depth``, the number of updates
+            waiting for the callbacks, ``processed``, ``dropped``, and
+            ``mean_latency`` and ``max_latency``, the time between an update
+            being queued and its callbacks returning, in seconds.
+        """
+        with self._condition:
+            return dict(
+                depth=len(self._queue),
+                max_depth=self.max_depth,
+                processed=self.processed,
+                dropped=self.dropped,
+                mean_latency=(self.total_latency / self.processed
+                              if self.processed else 0.0),
+                max_latency=self.max_latency,
+            )
+
+    def put(self, circuit_manager, args, kwargs):
+        """
+        Queue an update for the callbacks, subject to the overflow policy.
+
+        Raises RuntimeError if the executor of the circuit is shut down.
+        """
+        with self._condition:
+            queue = self._queue
+            if self.coalesce_interval is not None:
+                # Only the most recent update is kept.
+                self.dropped += len(queue)
+                queue.clear()
+            elif self.maxsize is not None and len(queue) >= self.maxsize:
+                if self.overflow_policy == 'latest':
+                    self.dropped += len(queue)
+                    queue.clear()
+                elif self.overflow_policy == 'drop-oldest':
+                    queue.popleft()
+                    self.dropped += 1
+                else:
+                    while (len(queue) >= self.maxsize and self._running and
+                           not circuit_manager.dead.is_set()):
+                        self._condition.wait(0.1)
+
+            queue.append((time.monotonic(), args, kwargs))
+            self.max_depth = max(self.max_depth, len(queue))
+            if self._running or self._scheduled:
+                return
+            self._executor = circuit_manager.user_callback_executor
+            self._timer = circuit_manager.context._delivery_timer
+            if not self._due():
+                return
+            self._running = True
+
+        self._submit()
+
+    def _due(self):
+        """
+        Whether the next update may be handed to the callbacks now. If not, as
+        it is being coalesced, it is scheduled with the timer.
+
+        Called with the condition held.
+        """
+        if self.coalesce_interval is None or self._last_delivery is None:
+            return True
+        due = self._last_delivery + self.coalesce_interval
+        if time.monotonic() >= due:
+            return True
+        self._scheduled = True
+        self._timer.schedule(due, self)
+        return False
+
+    def _deliver(self):
+        "Called by the _DeliveryTimer once a coalesced update is due"
+        with self._condition:
+            self._scheduled = False
+            if self._running or not self._queue:
+                return
+            self._running = True
+
+        try:
+            self._submit()
+        except RuntimeError:
+            # The circuit is shutting down.
+            pass
+
+    def _submit(self):
+        try:
+            self._executor.submit(self._run_next)
+        except RuntimeError:
+            with self._condition:
+                self._running = False
+                self.dropped += len(self._queue)
+                self._queue.clear()
+                self._condition.notify_all()
+            raise
+
+    def _run_next(self):
+        with self._condition:
+            queued_at, args, kwargs = self._queue.popleft()
+            self._last_delivery = time.monotonic()
+            self._condition.notify_all()
+
+        self.handler._run_callbacks(args, kwargs)
+
+        latency = time.monotonic() - queued_at
+        with self._condition:
+            self.processed += 1
+            self.total_latency += latency
+            self.max_latency = max(self.max_latency, latency)
+            if not self._queue or not self._due():
+                self._running = False
+                return
+
+        # Go to the back of the executor's queue, giving other lanes a turn.
+        try:
+            self._submit()
+        except RuntimeError:
+            # The circuit is shutting down.
+            pass
+
+
 class CallbackHandler:
-    def __init__(self, pv):
+    def __init__(self, pv, *, queue_size=None, overflow_policy='block',
+                 coalesce_interval=None):
         # NOTE: not a WeakValueDictionary or WeakSet as PV is unhashable...
         self.callbacks = {}
         self.pv = pv
         self._callback_id = 0
         self.callback_lock = threading.RLock()
         self._last_call_values = None
+        self._lane = CallbackLane(self, maxsize=queue_size,
+                                  overflow_policy=overflow_policy,
+                                  coalesce_interval=coalesce_interval)
+
+    @property
+    def callback_statistics(self):
+        "Statistics on updates queued for the callbacks; see CallbackLane"
+        return self._lane.statistics
 
     def add_callback(self, func, run=False):
 
@@ -2043,13 +2453,30 @@ class CallbackHandler:
 
     def process(self, *args, **kwargs):
         """
-        This is a fast operation that submits jobs to the Context's
-        ThreadPoolExecutor and then returns.
+        This is a fast operation that queues the update for the callbacks,
+        which are run in order by the circuit's ThreadPoolExecutor, and then
+        returns.
         """
+        with self.callback_lock:
+            self._last_call_values = (args, kwargs)
+
+        circuit_manager = self.pv.circuit_manager
+        try:
+            self._lane.put(circuit_manager, args, kwargs)
+        except RuntimeError:
+            if circuit_manager.dead.is_set():
+                # if the circuit is dead, so is the executor forgive
+                # and exit
+                return
+            # otherwise raise and let someone else deal with the
+            # mess
+            raise
+
+    def _run_callbacks(self, args, kwargs):
+        "Run all callbacks for one update, in the executor"
         to_remove = []
         with self.callback_lock:
             callbacks = list(self.callbacks.items())
-            self._last_call_values = (args, kwargs)
 
         for cb_id, ref in callbacks:
             callback = ref()
@@ -2057,16 +2484,11 @@ class CallbackHandler:
                 to_remove.append(cb_id)
                 continue
             try:
-                self.pv.circuit_manager.user_callback_executor.submit(
-                    callback, *args, **kwargs)
-            except RuntimeError:
-                if self.pv.circuit_manager.dead.is_set():
-                    # if the circuit is dead, so is the executor forgive
-                    # and exit
-                    return
-                # otherwise raise and let someone else deal with the
-                # mess
-                raise
+                callback(*args, **kwargs)
+            except Exception:
+                self.pv.log.exception('Exception raised in user callback %r',
+                                      callback)
+
         with self.callback_lock:
             for remove_id in to_remove:
                 self.callbacks.pop(remove_id, None)
@@ -2082,8 +2504,12 @@ class Subscription(CallbackHandler):
     This object should never be instantiated directly by user code; rather
     it should be made by calling the ``subscribe()`` method on a ``PV`` object.
     """
-    def __init__(self, pv, data_type, data_count, low, high, to, mask):
-        super().__init__(pv)
+    def __init__(self, pv, data_type, data_count, low, high, to, mask,
+                 shared_memory=False, coalesce_interval=None):
+        super().__init__(
+            pv, queue_size=pv.context.callback_queue_size,
+            overflow_policy=pv.context.callback_overflow_policy,
+            coalesce_interval=coalesce_interval)
         # Stash everything, but do not send any EPICS messages until the first
         # user callback is attached.
         self.data_type = data_type
@@ -2092,6 +2518,8 @@ class Subscription(CallbackHandler):
         self.high = high
         self.to = to
         self.mask = mask
+        self.shared_memory = shared_memory
+        self.coalesce_interval = coalesce_interval
         self.subscriptionid = None
         self.most_recent_response = None
         self.needs_reactivation = False
@@ -2103,6 +2531,11 @@ class Subscription(CallbackHandler):
     def log(self):
         return self.pv.log
 
+    @property
+    def dropped_updates(self):
+        "The number of updates dropped before reaching the callbacks"
+        return self._lane.dropped
+
     def __repr__(self):
         return f"<Subscription to {self.pv.name!r}, id={self.subscriptionid}>"
 
@@ -2136,6 +2569,7 @@ class Subscription(CallbackHandler):
                                      data_count=self.data_count, low=self.low,
                                      high=self.high, to=self.to,
                                      mask=self.mask,
+                                     shared_memory=self.shared_memory,
                                      subscriptionid=subscriptionid)
             subscriptionid = command.subscriptionid
             self.subscriptionid = subscriptionid
@@ -2176,10 +2610,9 @@ class Subscription(CallbackHandler):
                 self.pv.circuit_manager.send(command, extra={'pv': self.pv.name})
 
     def process(self, command):
-        # TODO here i think we can decouple PV update rates and callback
-        # handling rates, if desirable, to not bog down performance.
-        # As implemented below, updates are blocking further messages from
-        # the CA servers from processing. (-> ThreadPool, etc.)
+        # Updates are queued for the callbacks, bounded by the context's
+        # callback_queue_size. Only the 'block' overflow policy holds up
+        # further messages from the CA server.
         pv = self.pv
         super().process(self, command)
         self.log.debug("%r: %r", pv.name, command)
@@ -2376,4 +2809,8 @@ SUBSCRIBE_SIG = Signature([
     Parameter('low', Parameter.POSITIONAL_OR_KEYWORD, default=0),
     Parameter('high', Parameter.POSITIONAL_OR_KEYWORD, default=0),
     Parameter('to', Parameter.POSITIONAL_OR_KEYWORD, default=0),
-    Parameter('mask', Parameter.POSITIONAL_OR_KEYWORD, default=None)])
+    Parameter('mask', Parameter.POSITIONAL_OR_KEYWORD, default=None),
+    Parameter('shared_memory', Parameter.POSITIONAL_OR_KEYWORD,
+              default=False),
+    Parameter('coalesce_interval', Parameter.POSITIONAL_OR_KEYWORD,
+              default=None)])
@@ -14,7 +14,7 @@ from caproto import (AccessRights, CaprotoNotImplementedError,
                      field_types)
 
 from ..client.common import AUTOMONITOR_MAXLENGTH, STR_ENC
-from .client import Context, SharedBroadcaster
+from .client import Batch, Context, SharedBroadcaster
 
 __all__ = ('PV', 'get_pv', 'caget', 'caput')
 
@@ -157,6 +157,30 @@ def _pyepics_get_value(value, string_value, full_type, native_count, *,
     return value
 
 
+def _pyepics_put_data(value, full_type, enum_strings):
+    'Convert a value given to pyepics put() into data to write'
+    if full_type in ca.enum_types:
+        if isinstance(value, str):
+            try:
+                value = enum_strings.index(value)
+            except ValueError:
+                raise CaprotoValueError('{} is not in Enum ({}'.format(
+                    value, enum_strings))
+
+    if isinstance(value, str):
+        if full_type in ca.char_types:
+            # have to add a null-terminator char
+            value = value.encode(STR_ENC) + b'\0'
+        else:
+            value = (value, )
+    elif not isinstance(value, Iterable):
+        value = (value, )
+
+    if len(value) and isinstance(value[0], str):
+        value = tuple(v.encode(STR_ENC) for v in value)
+    return value
+
+
 DEFAULT_SUBSCRIPTION_MASK = (SubscriptionType.DBE_VALUE |
                              SubscriptionType.DBE_ALARM)
 
@@ -534,25 +558,9 @@ class PV:
         if not self._args['write_access']:
             raise AccessRightsException('Cannot put to PV according to write access')
 
-        if self._args['typefull'] in ca.enum_types:
-            if isinstance(value, str):
-                try:
-                    value = self.enum_strs.index(value)
-                except ValueError:
-                    raise CaprotoValueError('{} is not in Enum ({}'.format(
-                        value, self.enum_strs))
-
-        if isinstance(value, str):
-            if self.typefull in ca.char_types:
-                # have to add a null-terminator char
-                value = value.encode(STR_ENC) + b'\0'
-            else:
-                value = (value, )
-        elif not isinstance(value, Iterable):
-            value = (value, )
-
-        if len(value) and isinstance(value[0], str):
-            value = tuple(v.encode(STR_ENC) for v in value)
+        enum_strs = (self.enum_strs if isinstance(value, str) and
+                     self._args['typefull'] in ca.enum_types else None)
+        value = _pyepics_put_data(value, self._args['typefull'], enum_strs)
 
         notify = any((use_complete, callback is not None, wait))
 
@@ -1032,52 +1040,125 @@ def cainfo(pvname, print_out=True):
             return thispv.info
 
 
+def _wait_for_connections(pvs, timeout):
+    '''
+    Wait for PVs, whose searches are already underway, to connect.
+
+    Returns the (index, pv) of those which connected within the timeout.
+    '''
+    deadline = time.monotonic() + timeout if timeout is not None else None
+    connected = []
+    for index, pv in enumerate(pvs):
+        remaining = (max(deadline - time.monotonic(), 0)
+                     if deadline is not None else None)
+        try:
+            pv.wait_for_connection(timeout=remaining)
+        except CaprotoTimeoutError:
+            continue
+        connected.append((index, pv))
+    return connected
+
+
+def _batch_requests(indexed_pvs, request, timeout):
+    '''
+    Send one request per PV, in a single Batch, and wait for the responses.
+
+    Parameters
+    ----------
+    indexed_pvs : list of (index, PV)
+    request : callable
+        ``request(batch, index, pv, callback)`` adds the request for ``pv`` to
+        ``batch``. It returns False if no response is expected.
+    timeout : number or None
+        Seconds to wait for the responses.
+
+    Returns
+    -------
+    responses : dict
+        Map each index to the response received in time.
+    '''
+    responses = {}
+    received = threading.Condition()
+
+    def stash(index, response):
+        with received:
+            responses[index] = response
+            received.notify_all()
+
+    expected = 0
+    with Batch(timeout=timeout) as batch:
+        for index, pv in indexed_pvs:
+            try:
+                if request(batch, index, pv,
+                           functools.partial(stash, index)) is False:
+                    continue
+            except ca.CaprotoError:
+                # Disconnected since connecting; this will be reported as a
+                # failure.
+                continue
+            expected += 1
+
+    with received:
+        received.wait_for(lambda: len(responses) >= expected,
+                          timeout=timeout)
+        return dict(responses)
+
+
 def caget_many(pvlist, as_string=False, count=None, as_numpy=True, timeout=5.0,
                context=None, raises=False):
     """get values for a list of PVs
 
     This does not maintain PV objects, and works as fast
-    as possible to fetch many values.
+    as possible to fetch many values: the reads of all PVs are sent together,
+    in one batch per server.
+
+    The timeout applies to connecting, and then again to reading.
     """
     if context is None:
         context = PV._default_context
 
     pvs = context.get_pvs(*pvlist)
+    connected = _wait_for_connections(pvs, timeout)
+
+    if raises and len(connected) < len(pvs):
+        connected_indices = {index for index, _ in connected}
+        pv = next(pv for index, pv in enumerate(pvs)
+                  if index not in connected_indices)
+        raise CaprotoTimeoutError(f'{pv.name} failed to connect within '
+                                  f'{timeout} seconds '
+                                  f'(caproto={pv})')
+
+    def read(batch, index, pv, callback):
+        batch.read(pv, callback, data_type='control')
 
-    readings = {}
-    pending_pvs = list(pvs)
-    t = time.monotonic()
-    while pending_pvs and time.monotonic() - t < timeout:
-        for pv in list(pending_pvs):
-            if pv.connected:
-                readings[pv] = pv.read(data_type='control')
-                pending_pvs.remove(pv)
-        time.sleep(0.01)
-
-    if raises and pending_pvs:
-        raise CaprotoTimeoutError(f'{pending_pvs[0].name} failed to connect within '
+    # Use "DBR_CTRL_*" so that we can get enum strings, if necessary.
+    readings = _batch_requests(connected, read, timeout)
+
+    if raises and len(readings) < len(connected):
+        index, pv = next((index, pv) for index, pv in connected
+                         if index not in readings)
+        raise CaprotoTimeoutError(f'{pv.name} failed to respond within '
                                   f'{timeout} seconds '
-                                  f'(caproto={pending_pvs[0]})')
+                                  f'(caproto={pv})')
 
     get_kw = dict(as_string=as_string,
                   as_numpy=as_numpy,
                   requested_count=count,
                   )
 
-    def final_get(pv):
-        if pv in pending_pvs:
+    def final_get(index, pv):
+        if index not in readings:
             return None
 
-        # Use "DBR_CTRL_*" so that we can get enum strings, if necessary.
         full_type = field_types['control'][pv.channel.native_data_type]
-        enum_strings = getattr(readings[pv].metadata, "enum_strings", None)
+        enum_strings = getattr(readings[index].metadata, "enum_strings", None)
         if enum_strings:
             enum_strings = [
                 enum_str.decode(STR_ENC) for enum_str in enum_strings
             ]
         info = _read_response_to_pyepics(
             full_type=full_type,
-            command=readings[pv],
+            command=readings[index],
             enum_strings=enum_strings,
         )
         return _pyepics_get_value(value=info['raw_value'],
@@ -1086,21 +1167,20 @@ def caget_many(pvlist, as_string=False, count=None, as_numpy=True, timeout=5.0,
                                   native_count=pv.channel.native_data_count,
                                   enum_strings=enum_strings,
                                   **get_kw)
-    return [final_get(pv) for pv in pvs]
+    return [final_get(index, pv) for index, pv in enumerate(pvs)]
 
 
 def caput_many(pvlist, values, wait=False, connection_timeout=None,
-               put_timeout=60):
+               put_timeout=60, context=None):
     """put values to a list of PVs, as fast as possible
 
-    This does not maintain the PV objects it makes.
-
-    If wait is 'each', *each* put operation will block until
-    it is complete or until the put_timeout duration expires.
+    This does not maintain PV objects. The writes to all PVs are sent
+    together, in one batch per server.
 
-    If wait is 'all', this method will block until *all*
+    If wait is 'each' or 'all', this method will block until *all*
     put operations are complete, or until the put_timeout
-    duration expires.
+    duration expires. Each put operation is complete once the
+    server reports it so, regardless of the others.
 
     Note that the behavior of 'wait' only applies to the
     put timeout, not the connection timeout.
@@ -1112,32 +1192,57 @@ def caput_many(pvlist, values, wait=False, connection_timeout=None,
     if len(pvlist) != len(values):
         raise CaprotoValueError("List of PV names must be equal to list of values.")
 
-    # context = PV._default_context
-    # TODO: context.get_pvs(...)
+    if context is None:
+        context = PV._default_context
+    if connection_timeout is None:
+        connection_timeout = 1
 
-    out = []
-    pvs = [PV(name, auto_monitor=False, connection_timeout=connection_timeout)
-           for name in pvlist]
+    pvs = context.get_pvs(*pvlist)
+    connected = [
+        (index, pv) for index, pv in _wait_for_connections(pvs,
+                                                           connection_timeout)
+        if AccessRights.WRITE in pv.channel.access_rights
+    ]
+
+    # Enum strings are needed to write strings to enums.
+    needs_enum_strings = [
+        (index, pv) for index, pv in connected
+        if isinstance(values[index], str) and
+        pv.channel.native_data_type in ca.enum_types
+    ]
+    enum_strings = {}
+    if needs_enum_strings:
+        def read(batch, index, pv, callback):
+            batch.read(pv, callback, data_type='control')
+
+        for index, reading in _batch_requests(
+                needs_enum_strings, read, connection_timeout).items():
+            enum_strings[index] = [
+                enum_str.decode(STR_ENC)
+                for enum_str in reading.metadata.enum_strings
+            ]
 
-    wait_all = (wait == 'all')
-    wait_each = (wait == 'each')
-    for p, v in zip(pvs, values):
+    # Convert all values before sending any of them. A PV whose enum strings
+    # could not be read, or which has no such enum string, fails on its own.
+    data = {}
+    for index, pv in connected:
+        if (index, pv) in needs_enum_strings and index not in enum_strings:
+            continue
         try:
-            p.wait_for_connection(connection_timeout)
-            p.put(v, wait=wait_each, timeout=put_timeout,
-                  use_complete=wait_all)
-        except TimeoutError:
-            out.append(-1)
-        else:
-            out.append(1)
-
-    if not wait_all:
-        return [o if o == 1 else -1 for o in out]
-
-    start_time = time.time()
-    while not all([(p.connected and p.put_complete) for p in pvs]):
-        elapsed_time = time.time() - start_time
-        if elapsed_time > put_timeout:
-            break
-    return [1 if (p.connected and p.put_complete) else -1
-            for p in pvs]
+            data[index] = _pyepics_put_data(
+                values[index], pv.channel.native_data_type,
+                enum_strings.get(index))
+        except CaprotoValueError:
+            continue
+    connected = [(index, pv) for index, pv in connected if index in data]
+    wait = wait in ('each', 'all')
+    sent = set()
+
+    def write(batch, index, pv, callback):
+        batch.write(pv, data[index], callback=callback if wait else None)
+        sent.add(index)
+        return wait
+
+    responses = _batch_requests(connected, write, put_timeout)
+    succeeded = responses if wait else sent
+    return [1 if index in succeeded else -1 for index in range(len(pvs))]
@@ -6,7 +6,8 @@ from trio import socket
 
 import caproto as ca
 
-from .._utils import safe_getsockname
+from .._utils import (SENDMSG_MAX_BUFFERS, SENDMSG_SUPPORTED, coalesce_buffers,
+                      consume_buffers, safe_getsockname)
 from ..server import AsyncLibraryLayer
 from ..server.common import Context as _Context
 from ..server.common import DisconnectedCircuit, LoopExit
@@ -104,6 +105,9 @@ class TrioSocketStreamCompat:
     async def recv(self, max_bytes=None):
         return await self._stream.receive_some(max_bytes)
 
+    async def recv_into(self, buffer):
+        return await self._sock.recv_into(buffer)
+
     def close(self, *args, **kwargs):
         def _close():
             trio.from_thread.run(self._stream.aclose, trio_token=self._token)
@@ -120,6 +124,21 @@ class TrioSocketStreamCompat:
         except trio.BrokenResourceError:
             raise DisconnectedCircuit("Disconnected while sending to client")
 
+    async def send_buffers(self, buffers):
+        """Send a sequence of buffers, without joining them where possible."""
+        buffers = coalesce_buffers(buffers)
+        if not SENDMSG_SUPPORTED:
+            return await self.send_all(b''.join(buffers))
+
+        try:
+            async with self._send_lock:
+                while buffers:
+                    nbytes = await self._sock.sendmsg(
+                        buffers[:SENDMSG_MAX_BUFFERS])
+                    buffers = consume_buffers(buffers, nbytes)
+        except OSError:
+            raise DisconnectedCircuit("Disconnected while sending to client")
+
 
 class VirtualCircuit(_VirtualCircuit):
     "Wraps a caproto.VirtualCircuit with a trio client."
@@ -150,7 +169,7 @@ class VirtualCircuit(_VirtualCircuit):
 
     async def _send_buffers(self, *buffers):
         """Send ``buffers`` over the wire."""
-        await self.client.send_all(b"".join(buffers))
+        await self.client.send_buffers(buffers)
 
     async def command_queue_loop(self, task_status):
         self.write_event.set()
@@ -258,10 +277,8 @@ class Context(_Context):
         async with send:
             async with recv:
                 task_status.started()
-                async for item in recv:
-                    sub_specs, metadata, values, flags, sub = item
-                    await self._subscription_queue_iteration(
-                        sub_specs, metadata, values, flags, sub)
+                async for update in recv:
+                    await self._handle_subscription_update(update)
 
     async def broadcast_beacon_loop(self, task_status):
         task_status.started()
@@ -316,6 +333,11 @@ class Context(_Context):
 
                 async_lib = TrioAsyncLayer()
 
+                async def spawn(async_fn, *args):
+                    self.nursery.start_soon(async_fn, *args)
+
+                self._start_scan_scheduler(async_lib, spawn)
+
                 if startup_hook is not None:
                     self.log.debug('Calling startup hook %r',
                                    startup_hook.__name__)